@@ -2,173 +2,66 @@
 Escalations and Advanced Reporting API
 Endpoints for ICT Manager and GM oversight
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Response
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import func, and_, or_, case
 from typing import List, Optional
 from datetime import datetime, timedelta
-from app.database import get_db
+from app.database import get_db, get_read_db
 from app.models.user import User, UserRole
 from app.models.ticket import Ticket, TicketStatus, TicketPriority, SLAEscalation, SLAStatus
 from app.models.audit_log import AuditLog
 from app.utils.auth import get_current_active_user, require_role
-import json
+from app.utils.http_cache import make_etag, not_modified
+from app.services.audit_archive import audit_archiver
+from app.services.change_feed import ticket_changes
+from app.services.escalation_snapshot import escalation_snapshot
+from app.services.event_bus import event_bus, ESCALATION_ACKNOWLEDGED
 import csv
 import io
 
 router = APIRouter(prefix="/api", tags=["Escalations & Reports"])
 
 
+# Columns of the /reports/export CSV
+EXPORT_COLUMNS = (
+    Ticket.ticket_number,
+    Ticket.created_at,
+    Ticket.user_name,
+    Ticket.user_email,
+    Ticket.user_phone,
+    Ticket.problem_summary,
+    Ticket.priority,
+    Ticket.status,
+    Ticket.sla_status,
+    Ticket.resolved_at,
+    Ticket.sla_deadline,
+    Ticket.escalated,
+    User.name.label("assignee_name")
+)
+
+
 @router.get("/escalations")
 def get_escalations(
+    request: Request,
+    response: Response,
     status_filter: Optional[str] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(["ict_manager", "ict_gm", "admin"]))
 ):
     """Get all escalated tickets AND paused tickets (Waiting on User) - Manager and GM only"""
-    
-    # Query escalated tickets (SLA breached) - EXCLUDE resolved/closed tickets
-    escalated_query = db.query(Ticket).filter(
-        Ticket.escalated == 1,
-        Ticket.status.notin_([TicketStatus.RESOLVED, TicketStatus.CLOSED])  # Only show open escalations
+    # "N minutes ago" labels change with the clock, so the version includes the current minute
+    version = ticket_changes.version(db)
+    etag = make_etag(
+        "escalations", version, status_filter,
+        datetime.utcnow().strftime("%Y%m%d%H%M")
     )
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
     
-    if status_filter:
-        escalated_query = escalated_query.filter(Ticket.status == status_filter)
-    
-    escalated_tickets = escalated_query.order_by(Ticket.updated_at.desc()).all()
-    
-    # Query paused tickets (Waiting on User/Parts) - ONLY if no specific status filter or filter is "pending"
-    paused_tickets = []
-    if not status_filter or status_filter == "pending":
-        paused_tickets = db.query(Ticket).filter(
-            Ticket.status == TicketStatus.WAITING_ON_USER,
-            Ticket.escalated == 0  # Not already escalated
-        ).order_by(Ticket.updated_at.desc()).all()
-    
-    # Process escalated tickets
-    active_escalations = []
-    for ticket in escalated_tickets:
-        # Get latest escalation record
-        latest_escalation = db.query(SLAEscalation).filter(
-            SLAEscalation.ticket_id == ticket.id
-        ).order_by(SLAEscalation.escalated_at.desc()).first()
-        
-        # Calculate time since escalation
-        time_since = None
-        if latest_escalation:
-            diff = datetime.utcnow() - latest_escalation.escalated_at
-            hours = diff.total_seconds() / 3600
-            if hours < 1:
-                time_since = f"{int(diff.total_seconds() / 60)} minutes ago"
-            elif hours < 24:
-                time_since = f"{int(hours)} hours ago"
-            else:
-                time_since = f"{int(hours / 24)} days ago"
-        
-        # Get acknowledgment info
-        gm_acknowledged = bool(latest_escalation.gm_acknowledged) if latest_escalation else False
-        acknowledged_by_name = None
-        acknowledged_at = None
-        acknowledgment_note = None
-        
-        if latest_escalation and latest_escalation.gm_acknowledged:
-            if latest_escalation.acknowledged_by_id:
-                ack_user = db.query(User).filter(User.id == latest_escalation.acknowledged_by_id).first()
-                acknowledged_by_name = ack_user.name if ack_user else "Unknown"
-            acknowledged_at = latest_escalation.acknowledged_at_gm
-            acknowledgment_note = latest_escalation.acknowledgment_note
-        
-        active_escalations.append({
-            "id": ticket.id,
-            "ticket_id": ticket.id,
-            "ticket_number": ticket.ticket_number,
-            "title": ticket.problem_summary,
-            "problem_summary": ticket.problem_summary,
-            "priority": ticket.priority.value,
-            "status": ticket.status.value,
-            "category": "General Support",
-            "sla_status": ticket.sla_status.value if ticket.sla_status else "Unknown",
-            "requires_update": bool(ticket.requires_update),
-            "assignee_name": ticket.assignee.name if ticket.assignee else "Unassigned",
-            "assignee_id": ticket.assignee_id,
-            "reported_by_name": ticket.user_name,
-            "reported_by_email": ticket.user_email,
-            "user_name": ticket.user_name,
-            "user_email": ticket.user_email,
-            "escalation_reason": latest_escalation.escalation_reason if latest_escalation else "SLA breach",
-            "escalated_at": latest_escalation.escalated_at if latest_escalation else ticket.created_at,
-            "time_since_escalation": time_since,
-            "previous_priority": latest_escalation.previous_priority if latest_escalation else None,
-            "created_at": ticket.created_at,
-            "sla_deadline": ticket.sla_deadline,
-            "gm_acknowledged": gm_acknowledged,
-            "acknowledged_by": acknowledged_by_name,
-            "acknowledged_at": acknowledged_at,
-            "acknowledgment_note": acknowledgment_note,
-            "type": "escalation"  # Mark as escalation type
-        })
-    
-    # Process paused tickets (Waiting on User)
-    paused_escalations = []
-    for ticket in paused_tickets:
-        # Calculate how long it's been paused
-        diff = datetime.utcnow() - ticket.updated_at
-        hours = diff.total_seconds() / 3600
-        if hours < 1:
-            time_paused = f"{int(diff.total_seconds() / 60)} minutes"
-        elif hours < 24:
-            time_paused = f"{int(hours)} hours"
-        else:
-            time_paused = f"{int(hours / 24)} days"
-        
-        # Get the last update to show why it's paused
-        from app.models.ticket import TicketUpdate
-        last_update = db.query(TicketUpdate).filter(
-            TicketUpdate.ticket_id == ticket.id
-        ).order_by(TicketUpdate.created_at.desc()).first()
-        
-        waiting_reason = last_update.update_text if last_update else "Waiting for external response"
-        
-        paused_escalations.append({
-            "id": ticket.id,
-            "ticket_id": ticket.id,
-            "ticket_number": ticket.ticket_number,
-            "title": ticket.problem_summary,
-            "problem_summary": ticket.problem_summary,
-            "priority": ticket.priority.value,
-            "status": ticket.status.value,
-            "category": "General Support",
-            "sla_status": "Paused",  # Custom status for paused tickets
-            "requires_update": False,
-            "assignee_name": ticket.assignee.name if ticket.assignee else "Unassigned",
-            "assignee_id": ticket.assignee_id,
-            "reported_by_name": ticket.user_name,
-            "reported_by_email": ticket.user_email,
-            "user_name": ticket.user_name,
-            "user_email": ticket.user_email,
-            "escalation_reason": f"⏸️ SLA Paused - {waiting_reason}",
-            "escalated_at": ticket.updated_at,  # When it was paused
-            "time_since_escalation": f"Paused for {time_paused}",
-            "previous_priority": None,
-            "created_at": ticket.created_at,
-            "sla_deadline": ticket.sla_deadline,
-            "sla_paused_minutes": ticket.sla_paused_minutes,  # Show remaining time
-            "gm_acknowledged": False,  # Paused tickets don't need acknowledgment
-            "acknowledged_by": None,
-            "acknowledged_at": None,
-            "acknowledgment_note": None,
-            "type": "paused"  # Mark as paused type
-        })
-    
-    return {
-        "total": len(active_escalations) + len(paused_escalations),
-        "active_escalations": len(active_escalations),
-        "paused_tickets": len(paused_escalations),
-        "escalations": active_escalations,  # For backward compatibility
-        "active": active_escalations,  # SLA breached tickets
-        "paused": paused_escalations  # Waiting on User tickets
-    }
+    # Computed once per change and shared by every viewer; time labels are filled in per request
+    return escalation_snapshot.view(db, version, status_filter)
 
 
 @router.post("/escalations/{ticket_id}/acknowledge")
@@ -211,17 +104,20 @@ async def acknowledge_escalation(
         entity_id=ticket.id,
         action='escalation_acknowledged',
         performed_by_id=current_user.id,
-        details=json.dumps({
+        details={
             'ticket_number': ticket.ticket_number,
             'acknowledged_by': current_user.name,
             'acknowledgment_note': acknowledgment_note or 'No note provided',
             'acknowledged_at': datetime.now().isoformat(),
             'priority': ticket.priority.value,
             'status': ticket.status.value
-        })
+        }
     )
     db.add(audit_log)
     db.commit()
+    escalation_snapshot.invalidate()
+    
+    event_bus.publish_ticket(ESCALATION_ACKNOWLEDGED, ticket, acknowledged_by=current_user.name)
     
     return {
         "success": True,
@@ -235,12 +131,17 @@ async def acknowledge_escalation(
 
 @router.get("/reports/kpis")
 def get_kpis(
+    request: Request,
+    response: Response,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role(["ict_manager", "ict_gm", "admin"]))
 ):
     """Get KPIs for manager dashboard"""
+    cached = not_modified(request, response, make_etag("kpis", ticket_changes.version(db), date_from, date_to))
+    if cached:
+        return cached
     
     # Parse dates - if no dates provided, show ALL tickets (for ICT GM)
     if date_from and date_to:
@@ -364,13 +265,13 @@ def export_tickets_csv(
     priority_filter: Optional[str] = None,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role(["ict_manager", "ict_gm", "admin"]))
 ):
     """Export tickets to CSV"""
     
     # Build query
-    query = db.query(Ticket)
+    query = db.query(*EXPORT_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id)
     
     if status_filter:
         query = query.filter(Ticket.status == status_filter)
@@ -409,7 +310,7 @@ def export_tickets_csv(
             ticket.priority.value,
             ticket.status.value,
             ticket.sla_status.value if ticket.sla_status else 'Unknown',
-            ticket.assignee.name if ticket.assignee else 'Unassigned',
+            ticket.assignee_name or 'Unassigned',
             ticket.created_at.strftime('%Y-%m-%d %H:%M:%S'),
             ticket.resolved_at.strftime('%Y-%m-%d %H:%M:%S') if ticket.resolved_at else '',
             ticket.sla_deadline.strftime('%Y-%m-%d %H:%M:%S'),
@@ -432,35 +333,74 @@ def export_tickets_csv(
 def get_audit_logs(
     entity_type: Optional[str] = None,
     action: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    ticket_number: Optional[str] = None,
+    target: Optional[str] = None,
+    performed_by_id: Optional[int] = None,
+    detail_key: Optional[str] = None,
+    detail_value: Optional[str] = None,
+    include_archived: bool = False,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role(["ict_manager", "ict_gm", "admin"]))
 ):
-    """Get audit logs - Manager and GM only"""
-    
-    query = db.query(AuditLog)
-    
-    if entity_type:
-        query = query.filter(AuditLog.entity_type == entity_type)
+    """Get audit logs - Manager and GM only (spans monthly partitions and, optionally, archives)
+    
+    Filters run in SQL: target ("ticket:NDB-0001", "user:7" - what the action was done to;
+    ticket_number=X is short for target=ticket:X and includes the ticket's SLA escalations and
+    acknowledgements) and performer hit indexed columns, and detail_key/detail_value match a
+    single key inside the JSON details; a value that reads as JSON ("true", "42", "null") also
+    matches that JSON value.
+    """
+    
+    try:
+        start = datetime.fromisoformat(date_from) if date_from else None
+        end = datetime.fromisoformat(date_to) if date_to else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from and date_to must be ISO dates, e.g. 2025-01-31 or 2025-01-31T08:00:00"
+        )
     
-    if action:
-        query = query.filter(AuditLog.action == action)
+    logs = audit_archiver.query(
+        db,
+        entity_type=entity_type,
+        action=action,
+        date_from=start,
+        date_to=end,
+        limit=limit,
+        include_archived=include_archived,
+        entity_id=entity_id,
+        ticket_number=ticket_number,
+        target=target,
+        performed_by_id=performed_by_id,
+        detail_key=detail_key,
+        detail_value=detail_value
+    )
     
-    logs = query.order_by(AuditLog.created_at.desc()).limit(limit).all()
+    # Resolve performer names in one query
+    performer_ids = {log["performed_by_id"] for log in logs if log["performed_by_id"]}
+    performers = {}
+    if performer_ids:
+        performers = {
+            user.id: user.name
+            for user in db.query(User).filter(User.id.in_(performer_ids)).all()
+        }
     
     result = []
     for log in logs:
-        performed_by = db.query(User).filter(User.id == log.performed_by_id).first() if log.performed_by_id else None
-        
         result.append({
-            "id": log.id,
-            "entity_type": log.entity_type,
-            "entity_id": log.entity_id,
-            "action": log.action,
-            "performed_by": performed_by.name if performed_by else "System",
-            "performed_by_id": log.performed_by_id,
-            "details": json.loads(log.details) if log.details else {},
-            "created_at": log.created_at
+            "id": log["id"],
+            "entity_type": log["entity_type"],
+            "entity_id": log["entity_id"],
+            "action": log["action"],
+            "performed_by": performers.get(log["performed_by_id"], "System"),
+            "performed_by_id": log["performed_by_id"],
+            "details": log["details"],
+            "created_at": log["created_at"],
+            "archived": log["archived"]
         })
     
     return {
@@ -471,7 +411,7 @@ def get_audit_logs(
 
 @router.get("/technicians/workload")
 def get_technician_workload(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(require_role(["ict_manager", "ict_gm", "helpdesk_officer", "admin"]))
 ):
     """Get workload distribution across technicians"""
@@ -481,28 +421,30 @@ def get_technician_workload(
         User.is_active == 1
     ).all()
     
+    # Active, escalated and resolved-this-month counts for every technician in one grouped query
+    month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    active = Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS])
+    counts = {
+        row.assignee_id: row
+        for row in db.query(
+            Ticket.assignee_id,
+            func.sum(case((active, 1), else_=0)).label("active"),
+            func.sum(case((and_(active, Ticket.escalated == 1), 1), else_=0)).label("escalated"),
+            func.sum(case((and_(
+                Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]),
+                Ticket.resolved_at >= month_start
+            ), 1), else_=0)).label("resolved")
+        ).filter(
+            Ticket.assignee_id.in_([tech.id for tech in technicians])
+        ).group_by(Ticket.assignee_id)
+    }
+    
     result = []
     for tech in technicians:
-        # Count active tickets
-        active_tickets = db.query(Ticket).filter(
-            Ticket.assignee_id == tech.id,
-            Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS])
-        ).count()
-        
-        # Count escalated tickets
-        escalated_tickets = db.query(Ticket).filter(
-            Ticket.assignee_id == tech.id,
-            Ticket.escalated == 1,
-            Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS])
-        ).count()
-        
-        # Calculate total resolved this month
-        month_start = datetime.utcnow().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-        resolved_this_month = db.query(Ticket).filter(
-            Ticket.assignee_id == tech.id,
-            Ticket.status.in_([TicketStatus.RESOLVED, TicketStatus.CLOSED]),
-            Ticket.resolved_at >= month_start
-        ).count()
+        row = counts.get(tech.id)
+        active_tickets = row.active if row else 0
+        escalated_tickets = row.escalated if row else 0
+        resolved_this_month = row.resolved if row else 0
         
         result.append({
             "technician_id": tech.id,
@@ -0,0 +1,75 @@
+"""
+Live updates API
+Server-Sent Events stream of ticket and escalation events for the dashboards
+"""
+from fastapi import APIRouter, HTTPException, Request, Header, Query, status
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from app.database import SessionLocal
+from app.config import settings
+from app.utils.auth import get_user_from_token
+from app.services.event_bus import event_bus
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/events", tags=["Live Updates"])
+
+
+def format_sse(event: dict) -> str:
+    """Encode an event in the text/event-stream wire format"""
+    payload = {k: v for k, v in event.items() if k != "assignee_ids"}
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(payload)}\n\n"
+
+
+@router.get("/stream")
+async def stream_events(
+    request: Request,
+    token: Optional[str] = Query(None, description="Access token (EventSource cannot send headers)"),
+    authorization: Optional[str] = Header(None),
+    last_event_id: Optional[str] = Header(None)
+):
+    """Push ticket-created/updated/deleted/escalated and escalation-acknowledged events
+
+    Technicians receive events for tickets assigned to them; helpdesk officers,
+    ICT managers, GMs and admins receive every event. A `resync` event means
+    events were missed and the client should reload its data.
+    """
+    if not token and authorization and authorization.lower().startswith("bearer "):
+        token = authorization[7:]
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    # Authenticate with a short-lived session - the stream itself holds no DB connection
+    db = SessionLocal()
+    try:
+        user = get_user_from_token(token, db)
+        user_id, role = user.id, user.role
+    finally:
+        db.close()
+
+    resume_from = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    subscription = event_bus.subscribe(user_id, role, resume_from)
+    logger.info(f"Event stream opened for user {user_id} ({role}) - {event_bus.subscriber_count} connected")
+
+    async def event_stream():
+        try:
+            # Tell EventSource how long to wait before reconnecting
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                event = await subscription.next_event(settings.EVENT_STREAM_HEARTBEAT_SECONDS)
+                if event is None:
+                    # Comment line keeps proxies from closing an idle connection
+                    yield ": keep-alive\n\n"
+                else:
+                    yield format_sse(event)
+        finally:
+            event_bus.unsubscribe(subscription)
+            logger.info(f"Event stream closed for user {user_id}")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
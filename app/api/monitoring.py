@@ -0,0 +1,42 @@
+"""
+Monitoring API
+Prometheus metrics, the slow request log collected by the profiling middleware
+and the SLA monitor's recent runs
+"""
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import PlainTextResponse
+from app.models.user import User
+from app.utils.auth import require_role
+from app.services.request_metrics import request_metrics
+from app.services.sla_metrics import sla_metrics
+
+router = APIRouter(tags=["Monitoring"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def get_metrics():
+    """Request latency, DB usage, N+1 and SLA monitor metrics in Prometheus text format"""
+    return PlainTextResponse(
+        request_metrics.render_prometheus() + sla_metrics.render_prometheus(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/debug/slow-requests")
+def get_slow_requests(
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """Most recent slow or N+1-flagged requests, newest first, with their SQL"""
+    entries = request_metrics.recent_slow_requests(limit)
+    return {"count": len(entries), "requests": entries}
+
+
+@router.get("/debug/sla-cycles")
+def get_sla_cycles(
+    limit: int = Query(20, ge=1, le=60),
+    current_user: User = Depends(require_role(["admin"]))
+):
+    """Most recent SLA monitor runs, newest first - scan size, transitions, detection lag, notifications"""
+    cycles = sla_metrics.recent_cycles(limit)
+    return {"count": len(cycles), "cycles": cycles}
@@ -1,17 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, joinedload
 from typing import Optional
 from datetime import datetime
-import pandas as pd
 import io
-from app.database import get_db
+from app.database import get_read_db
 from app.models.user import User
-from app.models.ticket import Ticket, TicketStatus, TicketPriority
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus, TicketPriority
 from app.utils.auth import get_current_active_user
+from app.utils.http_cache import make_etag, not_modified
+from app.services.change_feed import ticket_changes
 
 router = APIRouter(prefix="/api/reports", tags=["Reports"])
 
+# Columns of the ticket CSV export, fetched as plain rows rather than Ticket/User instances
+EXPORT_COLUMNS = (
+    Ticket.ticket_number,
+    Ticket.created_at,
+    Ticket.user_name,
+    Ticket.user_email,
+    Ticket.user_phone,
+    Ticket.problem_summary,
+    Ticket.problem_description,
+    Ticket.priority,
+    Ticket.status,
+    Ticket.sla_deadline,
+    Ticket.resolved_at,
+    Ticket.escalated,
+    User.name.label("assignee_name"),
+    User.email.label("assignee_email")
+)
+
 
 @router.get("/tickets/export")
 def export_tickets_csv(
@@ -20,12 +40,19 @@ def export_tickets_csv(
     assignee_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Export tickets to CSV with optional filters"""
     
-    query = db.query(Ticket)
+    # Assignee and update count come back with each ticket rather than one query per row.
+    # Updates are counted in one grouped pass - ticket_updates.ticket_id has no index to serve a per-ticket count.
+    updates_count = select(
+        TicketUpdate.ticket_id, func.count(TicketUpdate.id).label("updates_count")
+    ).group_by(TicketUpdate.ticket_id).subquery()
+    query = db.query(
+        *EXPORT_COLUMNS, func.coalesce(updates_count.c.updates_count, 0).label("updates_count")
+    ).outerjoin(User, User.id == Ticket.assignee_id).outerjoin(updates_count, updates_count.c.ticket_id == Ticket.id)
     
     # Apply filters
     if status:
@@ -41,13 +68,14 @@ def export_tickets_csv(
         end_dt = datetime.fromisoformat(end_date)
         query = query.filter(Ticket.created_at <= end_dt)
     
-    tickets = query.order_by(Ticket.created_at.desc()).all()
+    rows = query.order_by(Ticket.created_at.desc()).all()
     
     # Prepare data for CSV
     data = []
-    for ticket in tickets:
-        assignee_name = ticket.assignee.name if ticket.assignee else "Unassigned"
-        assignee_email = ticket.assignee.email if ticket.assignee else ""
+    for ticket in rows:
+        has_assignee = ticket.assignee_name is not None
+        assignee_name = ticket.assignee_name if has_assignee else "Unassigned"
+        assignee_email = ticket.assignee_email if has_assignee else ""
         data.append({
             'Ticket ID': ticket.ticket_number,
             'Created Date': ticket.created_at.strftime('%Y-%m-%d %H:%M:%S'),
@@ -63,10 +91,11 @@ def export_tickets_csv(
             'SLA Deadline': ticket.sla_deadline.strftime('%Y-%m-%d %H:%M:%S'),
             'Resolved Date': ticket.resolved_at.strftime('%Y-%m-%d %H:%M:%S') if ticket.resolved_at else '',
             'Escalated': 'Yes' if ticket.escalated else 'No',
-            'Updates Count': len(ticket.updates)
+            'Updates Count': ticket.updates_count
         })
     
-    # Create DataFrame
+    # Create DataFrame (pandas is imported here - it is the slowest import in the app)
+    import pandas as pd
     df = pd.DataFrame(data)
     
     # Convert to CSV
@@ -85,14 +114,19 @@ def export_tickets_csv(
 
 @router.get("/statistics")
 def get_ticket_statistics(
+    request: Request,
+    response: Response,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Get ticket statistics and analytics"""
+    cached = not_modified(request, response, make_etag("statistics", ticket_changes.version(db), start_date, end_date))
+    if cached:
+        return cached
     
-    query = db.query(Ticket)
+    query = db.query(Ticket).options(joinedload(Ticket.assignee))
     
     # Apply date filters
     if start_date:
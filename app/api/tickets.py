@@ -1,42 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, UploadFile, File, Request, Response
+from fastapi.responses import ORJSONResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import or_, and_, insert, func, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, List, Optional, Union
 from datetime import datetime, timedelta
 from pydantic import BaseModel
+import codecs
 import logging
-from app.database import get_db
+import os
+from app import database
+from app.database import get_db, run_in_session
 from app.models.user import User
-from app.models.ticket import Ticket, TicketUpdate, TicketStatus, TicketPriority
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus, TicketPriority, SLAStatus, TicketDeparture
+from app.models.audit_log import AuditLog, ticket_target
 from app.utils.timezone import get_sa_time
 from app.schemas.ticket import (
     TicketCreate,
     TicketUpdate as TicketUpdateSchema,
     TicketResponse,
     TicketListResponse,
-    TicketUpdateResponse
+    TicketUpdateResponse,
+    TicketSearchResult,
+    TicketSearchResponse,
+    TicketMergeRequest,
+    TicketBulkRequest,
+    TicketBulkResponse,
+    TicketChangesResponse,
+    TicketTombstoneResponse,
+    TicketSummaryResponse,
+    DuplicateCandidate
 )
 from app.utils.auth import get_current_active_user, require_role
+from app.utils.http_cache import make_etag, not_modified
 from app.utils.ticket_helpers import generate_ticket_number, calculate_sla_deadline
 from app.services.email_service import EmailService
 from app.services.whatsapp_service import whatsapp_service
+from app.services.search_index import ticket_search
+from app.services.duplicate_detector import duplicate_detector
+from app.services.bulk_tickets import bulk_ticket_service
+from app.services.ticket_import import TicketImporter
+from app.services.change_feed import ticket_changes, parse_token
+from app.services.escalation_snapshot import escalation_snapshot
+from app.services.event_bus import event_bus, TICKET_CREATED, TICKET_UPDATED, TICKET_DELETED
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/tickets", tags=["Tickets"])
 
 
+async def get_write_db(db: Session = Depends(get_db)) -> AsyncIterator[Union[Session, AsyncSession]]:
+    """Session for the hot write routes: an AsyncSession on asyncpg, otherwise the request's sync Session
+
+    The sync Session is the one authentication already holds - a second would wait for a pool
+    connection on the event loop while the threadpool holds the rest. Route bodies take a sync
+    Session either way; call them through run_in_session.
+    """
+    if database.ASYNC_WRITE_SESSIONS:
+        async with database.AsyncSessionLocal() as async_db:
+            yield async_db
+    else:
+        yield db
+
+
 @router.post("", response_model=TicketResponse, status_code=status.HTTP_201_CREATED)
 async def create_ticket(
     ticket_data: TicketCreate,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: Union[Session, AsyncSession] = Depends(get_write_db),
     current_user: User = Depends(require_role(["helpdesk_officer", "technician", "admin"]))
 ):
     """Create a new support ticket - Helpdesk Officers, Technicians, and Admins can create tickets"""
+    return await run_in_session(db, lambda session: save_new_ticket(session, ticket_data, background_tasks, current_user))
+
+
+def save_new_ticket(db: Session, ticket_data: TicketCreate, background_tasks: BackgroundTasks, current_user: User) -> TicketResponse:
+    """Body of create_ticket, on a sync Session"""
     # Generate ticket number
-    last_ticket = db.query(Ticket).order_by(Ticket.id.desc()).first()
-    last_id = last_ticket.id if last_ticket else 0
+    last_id = db.execute(select(func.max(Ticket.id))).scalar() or 0
     ticket_number = generate_ticket_number(last_id)
     
     # Calculate SLA deadline
@@ -60,12 +101,20 @@ async def create_ticket(
     db.commit()
     db.refresh(new_ticket)
     
+    # Look for open tickets describing the same problem, then index this one
+    duplicates = duplicate_detector.find_similar(
+        db,
+        new_ticket.problem_summary,
+        new_ticket.problem_description,
+        exclude_id=new_ticket.id
+    )
+    duplicate_detector.index_ticket(db, new_ticket)
+    
     # Get assignee information FIRST
-    assignee = db.query(User).filter(User.id == ticket_data.assignee_id).first()
+    assignee = db.get(User, ticket_data.assignee_id)
     assignee_name = assignee.name if assignee else 'Unassigned'
     
     # Create initial ticket update for history tracking
-    from app.models.ticket import TicketUpdate
     initial_update = TicketUpdate(
         ticket_id=new_ticket.id,
         update_text=f"Ticket created and assigned to {assignee_name}",
@@ -77,6 +126,8 @@ async def create_ticket(
     db.add(initial_update)
     db.commit()
     
+    event_bus.publish_ticket(TICKET_CREATED, new_ticket)
+    
     # Prepare notification data
     notification_data = {
         'ticket_number': new_ticket.ticket_number,
@@ -115,24 +166,214 @@ async def create_ticket(
         sla_deadline=new_ticket.sla_deadline,
         requires_update=bool(new_ticket.requires_update),
         escalated=bool(new_ticket.escalated),
-        updates=[]
+        updates=[],
+        possible_duplicates=[
+            DuplicateCandidate(
+                id=ticket.id,
+                ticket_number=ticket.ticket_number,
+                problem_summary=ticket.problem_summary,
+                status=ticket.status,
+                assignee_id=ticket.assignee_id,
+                created_at=ticket.created_at,
+                similarity=round(score, 2)
+            )
+            for ticket, score in duplicates
+        ]
     )
     
     return response
 
 
+@router.post("/bulk", response_model=TicketBulkResponse)
+async def bulk_update_tickets(
+    bulk_data: TicketBulkRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["helpdesk_officer", "ict_manager", "admin"]))
+):
+    """Apply a status change, reassignment, priority change or close to many tickets at once"""
+    try:
+        result, digests = bulk_ticket_service.apply(db, bulk_data, current_user)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    # One notification per recipient rather than one per ticket
+    for digest in digests:
+        background_tasks.add_task(EmailService.send_ticket_digest, digest)
+        background_tasks.add_task(whatsapp_service.send_ticket_digest, digest)
+    
+    return result
+
+
+@router.post("/import", status_code=status.HTTP_200_OK)
+def import_tickets(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(csv|json|jsonl)$"),
+    notify: bool = False,
+    batch_size: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["helpdesk_officer", "admin"]))
+):
+    """Bulk import tickets from a CSV, JSON or JSON Lines upload (TicketCreate fields per row)
+    
+    Rows that fail to parse or validate are listed in the report's errors. If the file
+    becomes unreadable partway, stopped_at_row is the first row not imported; the rows
+    before it were.
+    """
+    fmt = format or os.path.splitext(file.filename or "")[1].lstrip(".").lower()
+    if fmt not in ("csv", "json", "jsonl"):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Could not determine file format - pass format=csv, json or jsonl"
+        )
+    
+    importer = TicketImporter(batch_size=batch_size)
+    stream = codecs.getreader("utf-8-sig")(file.file)
+    report, digests = importer.run(db, importer.read_rows(stream, fmt), current_user, notify=notify)
+    if report["stopped_at_row"] == 1:
+        # Not even the first row could be read, so nothing was imported
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=report["errors"][-1]["error"]
+        )
+    
+    for digest in digests:
+        background_tasks.add_task(EmailService.send_ticket_digest, digest)
+        background_tasks.add_task(whatsapp_service.send_ticket_digest, digest)
+    
+    return report
+
+
+def ticket_list_item(ticket: Ticket) -> TicketListResponse:
+    """List-view representation of a ticket"""
+    assignee_obj = None
+    if ticket.assignee:
+        assignee_obj = {
+            "id": ticket.assignee.id,
+            "name": ticket.assignee.name,
+            "email": ticket.assignee.email,
+            "role": ticket.assignee.role
+        }
+    
+    return TicketListResponse(
+        id=ticket.id,
+        ticket_number=ticket.ticket_number,
+        user_name=ticket.user_name,
+        user_email=ticket.user_email,
+        user_phone=ticket.user_phone,
+        problem_summary=ticket.problem_summary,
+        priority=ticket.priority,
+        status=ticket.status,
+        assignee_name=ticket.assignee.name if ticket.assignee else "Unassigned",
+        assignee=assignee_obj,
+        assignee_id=ticket.assignee_id,
+        created_at=ticket.created_at,
+        resolved_at=ticket.resolved_at,
+        sla_deadline=ticket.sla_deadline
+    )
+
+
+# Columns behind TicketListResponse, fetched as plain rows
+TICKET_LIST_COLUMNS = (
+    Ticket.id,
+    Ticket.ticket_number,
+    Ticket.user_name,
+    Ticket.user_email,
+    Ticket.user_phone,
+    Ticket.problem_summary,
+    Ticket.priority,
+    Ticket.status,
+    Ticket.assignee_id,
+    Ticket.created_at,
+    Ticket.resolved_at,
+    Ticket.sla_deadline,
+    User.name.label("assignee_name"),
+    User.email.label("assignee_email"),
+    User.role.label("assignee_role")
+)
+
+
+def ticket_list_row(row) -> dict:
+    """TicketListResponse-shaped dict from a TICKET_LIST_COLUMNS row"""
+    has_assignee = row.assignee_name is not None
+    return {
+        "id": row.id,
+        "ticket_number": row.ticket_number,
+        "user_name": row.user_name,
+        "user_email": row.user_email,
+        "user_phone": row.user_phone,
+        "problem_summary": row.problem_summary,
+        "priority": row.priority.value,
+        "status": row.status.value,
+        "assignee_name": row.assignee_name if has_assignee else "Unassigned",
+        "assignee": {
+            "id": row.assignee_id,
+            "name": row.assignee_name,
+            "email": row.assignee_email,
+            "role": row.assignee_role
+        } if has_assignee else None,
+        "assignee_id": row.assignee_id,
+        "created_at": row.created_at,
+        "resolved_at": row.resolved_at,
+        "sla_deadline": row.sla_deadline
+    }
+
+
+# Roles whose ticket views are limited to their own assignments
+ASSIGNEE_SCOPED_ROLES = ["technician"]
+
+CLOSED_STATUSES = (TicketStatus.RESOLVED, TicketStatus.CLOSED)
+
+
+def ticket_scope(current_user: User, scope: Optional[str]) -> str:
+    """Effective scope for a list/summary request - technicians are always limited to their own tickets"""
+    if current_user.role in ASSIGNEE_SCOPED_ROLES:
+        return "mine"
+    return scope or "all"
+
+
+def apply_ticket_scope(query, current_user: User, scope: str):
+    """Restrict a tickets query to the caller's scope in SQL"""
+    if scope == "mine":
+        query = query.filter(Ticket.assignee_id == current_user.id)
+    return query
+
+
 @router.get("", response_model=List[TicketListResponse])
 def get_all_tickets(
+    request: Request,
+    response: Response,
     status: Optional[TicketStatus] = None,
     priority: Optional[TicketPriority] = None,
     assignee_id: Optional[int] = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    scope: Optional[str] = Query(None, pattern="^(mine|all)$", description="mine = assigned to me; technicians always get mine"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all tickets with optional filters"""
-    query = db.query(Ticket)
+    """Get all tickets visible to the caller, with optional filters"""
+    scope = ticket_scope(current_user, scope)
+    
+    # Answer unchanged polls with 304 before loading anything
+    etag = make_etag(
+        "tickets", ticket_changes.version(db), current_user.id, scope,
+        status, priority, assignee_id, start_date, end_date
+    )
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    
+    # Read before the list, so polling /changes from it can only repeat changes, never miss one
+    response.headers["X-Change-Token"] = ticket_changes.current_token(db)
+    
+    # Plain column rows serialized straight to JSON - no ORM objects or per-row Pydantic models
+    query = db.query(*TICKET_LIST_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id)
+    query = apply_ticket_scope(query, current_user, scope)
     
     # Apply filters
     if status:
@@ -148,22 +389,143 @@ def get_all_tickets(
         end_dt = datetime.fromisoformat(end_date)
         query = query.filter(Ticket.created_at <= end_dt)
     
-    tickets = query.order_by(Ticket.created_at.desc()).all()
+    rows = query.order_by(Ticket.created_at.desc()).all()
     
-    # Prepare response
-    response = []
-    for ticket in tickets:
-        assignee_name = ticket.assignee.name if ticket.assignee else "Unassigned"
-        assignee_obj = None
-        if ticket.assignee:
-            assignee_obj = {
-                "id": ticket.assignee.id,
-                "name": ticket.assignee.name,
-                "email": ticket.assignee.email,
-                "role": ticket.assignee.role
-            }
-        
-        response.append(TicketListResponse(
+    return ORJSONResponse([ticket_list_row(row) for row in rows], headers=dict(response.headers))
+
+
+@router.get("/summary", response_model=TicketSummaryResponse)
+def get_ticket_summary(
+    request: Request,
+    response: Response,
+    scope: Optional[str] = Query(None, pattern="^(mine|all)$", description="mine = assigned to me; technicians always get mine"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Badge counts for the caller's tickets - one GROUP BY query, no ticket rows"""
+    scope = ticket_scope(current_user, scope)
+    today_start = get_sa_time().replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    # "Resolved today" moves at midnight, so the day is part of the version
+    etag = make_etag("summary", ticket_changes.version(db), current_user.id, scope, today_start.date())
+    cached = not_modified(request, response, etag)
+    if cached:
+        return cached
+    
+    is_active = Ticket.status.notin_(CLOSED_STATUSES)
+    
+    def count_if(*conditions):
+        return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+    
+    query = db.query(
+        Ticket.status,
+        Ticket.priority,
+        func.count(Ticket.id).label("total"),
+        count_if(is_active, Ticket.escalated == 1).label("escalated"),
+        count_if(is_active, Ticket.sla_status == SLAStatus.BREACHED).label("breached"),
+        count_if(is_active, Ticket.sla_status == SLAStatus.AT_RISK).label("at_risk"),
+        count_if(is_active, Ticket.requires_update == 1).label("requires_update"),
+        count_if(Ticket.status == TicketStatus.RESOLVED, Ticket.resolved_at >= today_start).label("resolved_today")
+    )
+    query = apply_ticket_scope(query, current_user, scope)
+    rows = query.group_by(Ticket.status, Ticket.priority).all()
+    
+    by_status = {s.value: 0 for s in TicketStatus}
+    by_priority = {p.value: 0 for p in TicketPriority}
+    summary = {"escalated": 0, "breached": 0, "at_risk": 0, "requires_update": 0, "resolved_today": 0}
+    for row in rows:
+        by_status[row.status.value] += row.total
+        if row.status not in CLOSED_STATUSES:
+            by_priority[row.priority.value] += row.total
+        for key in summary:
+            summary[key] += getattr(row, key)
+    
+    return TicketSummaryResponse(
+        scope=scope,
+        total=sum(by_status.values()),
+        active=sum(by_priority.values()),
+        by_status=by_status,
+        by_priority=by_priority,
+        **summary
+    )
+
+
+@router.get("/changes", response_model=TicketChangesResponse)
+def get_ticket_changes(
+    since: Optional[str] = Query(None, description="next_token from the previous call; omit for a full initial load"),
+    limit: int = Query(500, ge=1, le=2000),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Tickets created, updated or deleted since a token - for clients that poll instead of streaming
+    (technicians only see their own tickets, as on the list, and get tickets reassigned away from them as deleted)"""
+    token = parse_token(since)
+    if token is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid since token"
+        )
+    
+    scope = ticket_scope(current_user, None)
+    tickets, tombstones, next_token, has_more = ticket_changes.changes(
+        db, token, limit, assignee_id=current_user.id if scope == "mine" else None
+    )
+    
+    return TicketChangesResponse(
+        since=since or "0",
+        next_token=next_token,
+        has_more=has_more,
+        tickets=[ticket_list_item(ticket) for ticket in tickets],
+        deleted=[
+            TicketTombstoneResponse(
+                id=tombstone.ticket_id,
+                ticket_number=tombstone.ticket_number,
+                deleted_at=tombstone.departed_at if isinstance(tombstone, TicketDeparture) else tombstone.deleted_at
+            )
+            for tombstone in tombstones
+        ]
+    )
+
+
+@router.get("/search", response_model=TicketSearchResponse)
+def search_tickets(
+    q: str = Query(..., min_length=1),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Full-text search over ticket details and update history, best matches first
+    (technicians only find their own tickets, as on the list)"""
+    # Internal notes are only searchable by the roles that can read them
+    include_internal = current_user.role in ["helpdesk_officer", "ict_manager", "ict_gm", "admin"]
+    scope = ticket_scope(current_user, None)
+    
+    ranked, total = ticket_search.search(
+        db,
+        q,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+        include_internal=include_internal,
+        assignee_id=current_user.id if scope == "mine" else None
+    )
+    
+    tickets = {}
+    if ranked:
+        tickets = {
+            ticket.id: ticket
+            for ticket in db.query(Ticket)
+                .options(joinedload(Ticket.assignee))
+                .filter(Ticket.id.in_([ticket_id for ticket_id, _ in ranked]))
+                .all()
+        }
+    
+    results = []
+    for ticket_id, score in ranked:
+        ticket = tickets.get(ticket_id)
+        if not ticket:
+            continue
+        results.append(TicketSearchResult(
             id=ticket.id,
             ticket_number=ticket.ticket_number,
             user_name=ticket.user_name,
@@ -172,51 +534,67 @@ def get_all_tickets(
             problem_summary=ticket.problem_summary,
             priority=ticket.priority,
             status=ticket.status,
-            assignee_name=assignee_name,
-            assignee=assignee_obj,
+            assignee_name=ticket.assignee.name if ticket.assignee else "Unassigned",
             assignee_id=ticket.assignee_id,
             created_at=ticket.created_at,
             resolved_at=ticket.resolved_at,
-            sla_deadline=ticket.sla_deadline
+            sla_deadline=ticket.sla_deadline,
+            score=round(score, 4)
         ))
     
-    return response
+    return TicketSearchResponse(
+        query=q,
+        page=page,
+        page_size=page_size,
+        total=total,
+        results=results
+    )
 
 
-@router.get("/{ticket_number}", response_model=TicketResponse)
-def get_ticket(
-    ticket_number: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
-):
-    """Get a specific ticket by ticket number"""
-    ticket = db.query(Ticket).filter(Ticket.ticket_number == ticket_number).first()
-    
-    if not ticket:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Ticket {ticket_number} not found"
-        )
+# Updates embedded in the ticket detail; older history is paged from /updates
+DETAIL_UPDATES_LIMIT = 50
+
+
+def ticket_update_item(update: TicketUpdate) -> TicketUpdateResponse:
+    """Response model for one history entry (expects updated_by to be loaded)"""
+    return TicketUpdateResponse(
+        id=update.id,
+        ticket_id=update.ticket_id,
+        update_text=update.update_text,
+        updated_by_id=update.updated_by_id,
+        updated_by_name=update.updated_by.name,
+        created_at=update.created_at,
+        old_status=update.old_status,
+        new_status=update.new_status,
+        old_assignee_id=update.old_assignee_id,
+        new_assignee_id=update.new_assignee_id,
+        old_priority=update.old_priority,
+        new_priority=update.new_priority,
+        is_internal=bool(update.is_internal),
+        time_spent=update.time_spent,
+        reassign_reason=update.reassign_reason
+    )
+
+
+def ticket_update_page(db: Session, ticket_id: int, limit: int, before: Optional[int] = None):
+    """Newest `limit` updates older than `before`, returned oldest first, plus whether more exist"""
+    query = db.query(TicketUpdate).options(joinedload(TicketUpdate.updated_by)).filter(
+        TicketUpdate.ticket_id == ticket_id
+    )
+    if before is not None:
+        query = query.filter(TicketUpdate.id < before)
     
-    # Get updates with user info
-    updates = []
-    for update in ticket.updates:
-        updates.append(TicketUpdateResponse(
-            id=update.id,
-            ticket_id=update.ticket_id,
-            update_text=update.update_text,
-            updated_by_id=update.updated_by_id,
-            updated_by_name=update.updated_by.name,
-            created_at=update.created_at,
-            old_status=update.old_status,
-            new_status=update.new_status,
-            old_assignee_id=update.old_assignee_id,
-            new_assignee_id=update.new_assignee_id,
-            old_priority=update.old_priority,
-            new_priority=update.new_priority
-        ))
+    # One extra row tells us whether an older page exists without a COUNT
+    rows = query.order_by(TicketUpdate.id.desc()).limit(limit + 1).all()
+    has_more = len(rows) > limit
+    return [ticket_update_item(update) for update in reversed(rows[:limit])], has_more
+
+
+def ticket_detail(db: Session, ticket: Ticket, updates_limit: int = DETAIL_UPDATES_LIMIT) -> TicketResponse:
+    """Detail representation of a loaded ticket with its most recent updates"""
+    updates, more_updates = ticket_update_page(db, ticket.id, updates_limit)
     
-    response = TicketResponse(
+    return TicketResponse(
         id=ticket.id,
         ticket_number=ticket.ticket_number,
         user_name=ticket.user_name,
@@ -233,10 +611,39 @@ def get_ticket(
         sla_deadline=ticket.sla_deadline,
         requires_update=bool(ticket.requires_update),
         escalated=bool(ticket.escalated),
-        updates=updates
+        updates=updates,
+        more_updates=more_updates
     )
+
+
+@router.get("/{ticket_number}", response_model=TicketResponse)
+def get_ticket(
+    request: Request,
+    response: Response,
+    ticket_number: str,
+    updates_limit: int = Query(DETAIL_UPDATES_LIMIT, ge=0, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_active_user)
+):
+    """Get a specific ticket by ticket number, with its most recent updates"""
+    # The ticket's change_seq moves with every edit, new update or escalation
+    version = db.query(Ticket.id, Ticket.change_seq).filter(Ticket.ticket_number == ticket_number).first()
+    if version:
+        cached = not_modified(request, response, make_etag("ticket", version.id, version.change_seq, updates_limit))
+        if cached:
+            return cached
+    
+    ticket = db.query(Ticket).options(joinedload(Ticket.assignee)).filter(
+        Ticket.ticket_number == ticket_number
+    ).first()
     
-    return response
+    if not ticket:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ticket {ticket_number} not found"
+        )
+    
+    return ticket_detail(db, ticket, updates_limit)
 
 
 @router.patch("/{ticket_number}", response_model=TicketResponse)
@@ -244,10 +651,23 @@ async def update_ticket(
     ticket_number: str,
     update_data: TicketUpdateSchema,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: Union[Session, AsyncSession] = Depends(get_write_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Update a ticket (status, priority, assignee, or add update)"""
+    return await run_in_session(
+        db, lambda session: apply_ticket_update(session, ticket_number, update_data, background_tasks, current_user)
+    )
+
+
+def apply_ticket_update(
+    db: Session,
+    ticket_number: str,
+    update_data: TicketUpdateSchema,
+    background_tasks: BackgroundTasks,
+    current_user: User
+) -> TicketResponse:
+    """Body of update_ticket, on a sync Session"""
     ticket = db.query(Ticket).filter(Ticket.ticket_number == ticket_number).first()
     
     if not ticket:
@@ -339,6 +759,12 @@ async def update_ticket(
     db.commit()
     db.refresh(ticket)
     
+    # Status decides whether a ticket shows as escalated or paused on the GM/Manager view
+    if ticket.status.value != old_status:
+        escalation_snapshot.invalidate()
+    
+    event_bus.publish_ticket(TICKET_UPDATED, ticket, previous_assignee_id=old_assignee_id)
+    
     # Send notifications
     if update_data.update_text:
         notification_data = {
@@ -374,42 +800,28 @@ async def update_ticket(
         background_tasks.add_task(EmailService.send_ticket_resolved, resolved_data)
         background_tasks.add_task(whatsapp_service.send_ticket_resolved, resolved_data)
     
-    # Return updated ticket
-    return get_ticket(ticket_number, db, current_user)
+    # Build the response from the ticket already in this session
+    return ticket_detail(db, ticket)
 
 
 @router.get("/{ticket_number}/updates", response_model=List[TicketUpdateResponse])
 def get_ticket_updates(
     ticket_number: str,
+    before: Optional[int] = Query(None, description="Return updates older than this update id"),
+    limit: int = Query(100, ge=1, le=500),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user)
 ):
-    """Get all updates for a specific ticket"""
-    ticket = db.query(Ticket).filter(Ticket.ticket_number == ticket_number).first()
+    """Page of a ticket's update history, oldest first - pass before=<first id> for the previous page"""
+    ticket_id = db.query(Ticket.id).filter(Ticket.ticket_number == ticket_number).scalar()
     
-    if not ticket:
+    if not ticket_id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Ticket {ticket_number} not found"
         )
     
-    updates = []
-    for update in ticket.updates:
-        updates.append(TicketUpdateResponse(
-            id=update.id,
-            ticket_id=update.ticket_id,
-            update_text=update.update_text,
-            updated_by_id=update.updated_by_id,
-            updated_by_name=update.updated_by.name,
-            created_at=update.created_at,
-            old_status=update.old_status,
-            new_status=update.new_status,
-            old_assignee_id=update.old_assignee_id,
-            new_assignee_id=update.new_assignee_id,
-            old_priority=update.old_priority,
-            new_priority=update.new_priority
-        ))
-    
+    updates, _ = ticket_update_page(db, ticket_id, limit, before)
     return updates
 
 
@@ -496,24 +908,25 @@ async def submit_forced_update(
     
     # Create audit log
     from app.models.audit_log import AuditLog
-    import json
     audit_log = AuditLog(
         entity_type='ticket',
         entity_id=ticket.id,
         action='forced_update_submitted',
         performed_by_id=current_user.id,
-        details=json.dumps({
+        details={
             'ticket_number': ticket.ticket_number,
             'update_text': update_text,
             'time_spent': time_spent,
             'requires_update_cleared': True
-        })
+        }
     )
     db.add(audit_log)
     
     db.commit()
     db.refresh(ticket)
     
+    event_bus.publish_ticket(TICKET_UPDATED, ticket)
+    
     return {
         "success": True,
         "message": "Escalation update submitted successfully. You may now perform other actions.",
@@ -530,13 +943,18 @@ class ReassignRequest(BaseModel):
 async def reassign_ticket(
     ticket_id: int,
     reassign_data: ReassignRequest,
-    db: Session = Depends(get_db),
+    db: Union[Session, AsyncSession] = Depends(get_write_db),
     current_user: User = Depends(get_current_active_user)
 ):
     """Reassign ticket to another technician - requires reason"""
+    return await run_in_session(db, lambda session: apply_reassignment(session, ticket_id, reassign_data, current_user))
+
+
+def apply_reassignment(db: Session, ticket_id: int, reassign_data: ReassignRequest, current_user: User) -> dict:
+    """Body of reassign_ticket, on a sync Session"""
     new_assignee_id = reassign_data.new_assignee_id
     reassign_reason = reassign_data.reassign_reason
-    ticket = db.query(Ticket).filter(Ticket.id == ticket_id).first()
+    ticket = db.query(Ticket).options(joinedload(Ticket.assignee)).filter(Ticket.id == ticket_id).first()
     
     if not ticket:
         raise HTTPException(
@@ -563,7 +981,7 @@ async def reassign_ticket(
         )
     
     # Verify new assignee exists and is a technician
-    new_assignee = db.query(User).filter(User.id == new_assignee_id).first()
+    new_assignee = db.get(User, new_assignee_id)
     if not new_assignee or new_assignee.role != "technician":
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -590,14 +1008,12 @@ async def reassign_ticket(
     ticket.updated_at = datetime.utcnow()
     
     # Create audit log
-    from app.models.audit_log import AuditLog
-    import json
     audit_log = AuditLog(
         entity_type='ticket',
         entity_id=ticket.id,
         action='ticket_reassigned',
         performed_by_id=current_user.id,
-        details=json.dumps({
+        details={
             'ticket_number': ticket.ticket_number,
             'old_assignee_id': old_assignee_id,
             'old_assignee_name': old_assignee_name,
@@ -605,12 +1021,13 @@ async def reassign_ticket(
             'new_assignee_name': new_assignee.name,
             'reassign_reason': reassign_reason,
             'performed_by': current_user.name
-        })
+        }
     )
     db.add(audit_log)
     
     db.commit()
-    db.refresh(ticket)
+    
+    event_bus.publish_ticket(TICKET_UPDATED, ticket, previous_assignee_id=old_assignee_id)
     
     return {
         "success": True,
@@ -622,6 +1039,119 @@ async def reassign_ticket(
     }
 
 
+@router.post("/{ticket_number}/merge", status_code=status.HTTP_200_OK)
+async def merge_tickets(
+    ticket_number: str,
+    merge_data: TicketMergeRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(["helpdesk_officer", "ict_manager", "admin"]))
+):
+    """Merge duplicate tickets into a parent - duplicates are closed in one transaction"""
+    parent = db.query(Ticket).filter(Ticket.ticket_number == ticket_number).first()
+    
+    if not parent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Ticket {ticket_number} not found"
+        )
+    
+    if parent.merged_into_id or parent.status in [TicketStatus.RESOLVED, TicketStatus.CLOSED]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Duplicates can only be merged into an open ticket"
+        )
+    
+    requested = set(merge_data.duplicate_ticket_numbers) - {parent.ticket_number}
+    if not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No duplicate tickets provided"
+        )
+    
+    duplicates = db.query(Ticket.id, Ticket.ticket_number, Ticket.status, Ticket.priority, Ticket.assignee_id).filter(
+        Ticket.ticket_number.in_(requested),
+        Ticket.merged_into_id.is_(None)
+    ).all()
+    
+    missing = requested - {d.ticket_number for d in duplicates}
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Tickets not found or already merged: {', '.join(sorted(missing))}"
+        )
+    
+    duplicate_ids = [d.id for d in duplicates]
+    now = datetime.now()
+    note = merge_data.note or f"Merged as duplicate of {parent.ticket_number}"
+    
+    # Close the duplicates and re-point anything previously merged into them
+    db.query(Ticket).filter(Ticket.id.in_(duplicate_ids)).update({
+        Ticket.status: TicketStatus.CLOSED,
+        Ticket.merged_into_id: parent.id,
+        Ticket.resolved_at: now,
+        Ticket.requires_update: 0,
+        Ticket.updated_at: now
+    }, synchronize_session=False)
+    db.query(Ticket).filter(Ticket.merged_into_id.in_(duplicate_ids)).update({
+        Ticket.merged_into_id: parent.id
+    }, synchronize_session=False)
+    
+    merged_numbers = sorted(d.ticket_number for d in duplicates)
+    db.execute(insert(TicketUpdate), [
+        {
+            "ticket_id": d.id,
+            "update_text": f"[MERGED] {note}",
+            "updated_by_id": current_user.id,
+            "old_status": d.status.value,
+            "new_status": TicketStatus.CLOSED.value
+        }
+        for d in duplicates
+    ] + [{
+        "ticket_id": parent.id,
+        "update_text": f"Merged duplicate tickets: {', '.join(merged_numbers)}",
+        "updated_by_id": current_user.id
+    }])
+    db.execute(insert(AuditLog), [
+        {
+            "entity_type": "ticket",
+            "entity_id": d.id,
+            "action": "ticket_merged",
+            "performed_by_id": current_user.id,
+            "target": ticket_target(d.ticket_number),
+            "details": {
+                "ticket_number": d.ticket_number,
+                "merged_into": parent.ticket_number,
+                "note": note,
+                "performed_by": current_user.name
+            }
+        }
+        for d in duplicates
+    ])
+    
+    parent.updated_at = now
+    db.commit()
+    
+    for d in duplicates:
+        event_bus.publish(TICKET_UPDATED, {
+            "ticket_id": d.id,
+            "ticket_number": d.ticket_number,
+            "status": TicketStatus.CLOSED.value,
+            "priority": d.priority.value,
+            "assignee_id": d.assignee_id,
+            "merged_into": parent.ticket_number
+        }, assignee_ids=(d.assignee_id,))
+    event_bus.publish_ticket(TICKET_UPDATED, parent)
+    
+    logger.info(f"Merged {len(duplicate_ids)} duplicates into {parent.ticket_number}")
+    
+    return {
+        "success": True,
+        "message": f"Merged {len(duplicate_ids)} tickets into {parent.ticket_number}",
+        "ticket_number": parent.ticket_number,
+        "merged": merged_numbers
+    }
+
+
 @router.post("/{ticket_id}/internal-note", status_code=status.HTTP_201_CREATED)
 async def add_internal_note(
     ticket_id: int,
@@ -651,23 +1181,24 @@ async def add_internal_note(
     
     # Create audit log
     from app.models.audit_log import AuditLog
-    import json
     audit_log = AuditLog(
         entity_type='ticket',
         entity_id=ticket.id,
         action='internal_note_added',
         performed_by_id=current_user.id,
-        details=json.dumps({
+        details={
             'ticket_number': ticket.ticket_number,
             'note_preview': note_text[:100],
             'added_by': current_user.name,
             'is_internal': True
-        })
+        }
     )
     db.add(audit_log)
     
     db.commit()
     
+    event_bus.publish_ticket(TICKET_UPDATED, ticket)
+    
     return {
         "success": True,
         "message": "Internal note added successfully",
@@ -716,6 +1247,8 @@ async def add_time_tracking(
     
     db.commit()
     
+    event_bus.publish_ticket(TICKET_UPDATED, ticket)
+    
     return {
         "success": True,
         "message": "Update with time tracking added",
@@ -741,9 +1274,16 @@ async def delete_ticket(
         )
     
     # Delete the ticket (cascade will handle related records)
+    deleted = {
+        "ticket_id": ticket.id,
+        "ticket_number": ticket.ticket_number,
+        "assignee_id": ticket.assignee_id
+    }
     db.delete(ticket)
     db.commit()
     
+    event_bus.publish(TICKET_DELETED, deleted, assignee_ids=(deleted["assignee_id"],))
+    
     return {
         "success": True,
         "message": f"Ticket {ticket_number} deleted successfully"
@@ -788,6 +1328,8 @@ async def create_my_ticket(
     db.commit()
     db.refresh(new_ticket)
     
+    event_bus.publish_ticket(TICKET_CREATED, new_ticket)
+    
     logger.info(f"User {current_user.name} created ticket {ticket_number}")
     
     return new_ticket
@@ -5,6 +5,22 @@ from typing import Optional
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str
+    ASYNC_DATABASE_URL: Optional[str] = None  # Defaults to DATABASE_URL with its asyncio driver
+    DATABASE_READ_URL: Optional[str] = None  # Read replica for reports; unset = use the primary
+    
+    # Connection pool (server databases)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite pragmas, applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"  # Readers no longer block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # Safe with WAL; fsync at checkpoints only
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000  # Wait for the write lock instead of "database is locked"
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 MB; 0 disables memory-mapped reads
     
     # Application
     SECRET_KEY: str
@@ -37,6 +53,42 @@ class Settings(BaseSettings):
     SLA_NORMAL_MINUTES: int = 1440
     SLA_WARNING_MINUTES: int = 2
     
+    # SLA worker (python -m app.workers.sla)
+    SLA_SCAN_INTERVAL_SECONDS: int = 60
+    SLA_WORKER_HEALTH_PORT: int = 8001  # /health and /metrics of the worker; 0 disables
+    SLA_SHUTDOWN_TIMEOUT_SECONDS: int = 30  # Time to finish a running scan and send queued notifications
+    
+    # Audit Log Retention
+    AUDIT_LOG_RETENTION_DAYS: int = 365
+    AUDIT_LOG_ARCHIVE_DIR: str = "archives/audit_logs"
+    
+    # Live updates (Server-Sent Events)
+    EVENT_STREAM_HEARTBEAT_SECONDS: int = 15
+    EVENT_BUFFER_SIZE: int = 1000
+    EVENT_QUEUE_SIZE: int = 256
+    
+    # Response compression (bodies smaller than the threshold are sent as-is)
+    COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    
+    # Request profiling (/metrics, /debug/slow-requests)
+    PROFILING_ENABLED: bool = True
+    SLOW_REQUEST_MS: int = 500
+    SLOW_QUERY_MS: int = 100
+    N_PLUS_ONE_THRESHOLD: int = 10  # Same statement this many times in one request
+    SLOW_REQUEST_BUFFER_SIZE: int = 100
+    
+    # Warm-up at startup (dashboard reads, templates); /health/ready answers 503 until it finishes
+    WARMUP_ENABLED: bool = True
+    
+    # Multi-process deployment (run_server.py --workers N sets both for its workers)
+    RUN_SCHEDULER: bool = True  # SLA monitor and audit archiving in this process; False when the SLA worker runs them
+    CLUSTER_CHANNEL_ENABLED: bool = False  # Share live events and cache invalidations between processes
+    CLUSTER_CHANNEL_POLL_SECONDS: float = 0.5
+    CLUSTER_CHANNEL_RETENTION_SECONDS: int = 3600
+    WEB_WORKERS: int = 1
+    
     class Config:
         env_file = ".env"
         case_sensitive = True
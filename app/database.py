@@ -1,7 +1,65 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from typing import AsyncIterator, Callable, TypeVar, Union
 from app.config import settings
+from app.utils.profiling import instrument_engine
+
+T = TypeVar("T")
+
+# asyncio drivers for the request path, keyed by the DATABASE_URL dialect
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+
+def async_database_url(url: str) -> str:
+    """The same database addressed through its asyncio driver"""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {dialect} databases")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+def engine_options(url: str) -> dict:
+    """Engine keyword arguments for a database URL, from Settings"""
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> list:
+    """PRAGMA statements run on every new SQLite connection"""
+    return [
+        f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}",  # Negative = size in KiB
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+    ]
+
+
+def apply_sqlite_pragmas(sync_engine, extra: list = ()):
+    """Run sqlite_pragmas() (plus any extra statements) whenever the pool opens a connection"""
+    pragmas = sqlite_pragmas() + list(extra)
+
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
 
 # Check if using SQLite
 if settings.DATABASE_URL.startswith("sqlite"):
@@ -9,15 +67,42 @@ if settings.DATABASE_URL.startswith("sqlite"):
         settings.DATABASE_URL,
         connect_args={"check_same_thread": False}
     )
+    apply_sqlite_pragmas(engine)
 else:
-    engine = create_engine(
-        settings.DATABASE_URL,
-        pool_pre_ping=True,
-        pool_size=10,
-        max_overflow=20
+    engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+# Optional read replica for reports and dashboards; without one, reads use the primary
+if settings.DATABASE_READ_URL and settings.DATABASE_READ_URL.startswith("sqlite"):
+    read_engine = create_engine(
+        settings.DATABASE_READ_URL,
+        connect_args={"check_same_thread": False}
+    )
+    apply_sqlite_pragmas(read_engine, ["PRAGMA query_only=ON"])
+elif settings.DATABASE_READ_URL:
+    # A write routed here by mistake fails instead of diverging from the primary
+    read_engine = create_engine(
+        settings.DATABASE_READ_URL,
+        connect_args={"options": "-c default_transaction_read_only=on"},
+        **engine_options(settings.DATABASE_READ_URL)
     )
+else:
+    read_engine = engine
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    apply_sqlite_pragmas(async_engine.sync_engine)
+
+# Per-request query counts and timings for /metrics
+for profiled_engine in {engine, read_engine, async_engine.sync_engine}:
+    instrument_engine(profiled_engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Objects stay usable after commit - an expired attribute would need IO to reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 Base = declarative_base()
 
@@ -31,7 +116,49 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """Dependency for read-only report/dashboard queries - the replica when DATABASE_READ_URL is set
+
+    Replicas lag the primary, so paths that must see a write the caller just
+    made (ticket detail after an update, the escalation list after an
+    acknowledgement) keep using get_db.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency for an asyncio database session (async def routes)
+
+    Queries await the driver instead of blocking the event loop. Code that
+    only takes a sync Session can still be reused via `await db.run_sync(fn)`.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# aiosqlite only moves each statement to a thread and SQLite still serializes writers: on
+# SQLite the async session cost write throughput (113 -> 73 req/s at concurrency 1, see
+# load_test_async.py), so only a natively async driver gets it on the write routes (get_write_db
+# in app.api.tickets)
+ASYNC_WRITE_SESSIONS = async_engine.dialect.driver == "asyncpg"
+
+
+async def run_in_session(db: Union[Session, AsyncSession], fn: Callable[[Session], T]) -> T:
+    """Call fn with a sync Session - through run_sync (awaiting the driver) for an AsyncSession"""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    return fn(db)
+
+
 def init_db():
     """Initialize database tables"""
-    from app.models import user, ticket, audit_log
+    from app.models import user, ticket, audit_log, cluster
+    from app.services.search_index import ticket_search
+    from app.services.change_feed import ticket_changes
     Base.metadata.create_all(bind=engine)
+    ticket_search.install(engine)
+    ticket_changes.install(engine)
@@ -1,12 +1,20 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, status
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import RedirectResponse
+from fastapi.responses import RedirectResponse, ORJSONResponse
+from sqlalchemy import text
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import logging
 
-from app.api import auth, tickets, reports, escalations
+from app.api import auth, tickets, reports, escalations, events, monitoring
 from app.services.sla_monitor import sla_monitor
+from app.services.audit_archive import audit_archiver
+from app.services.cluster_channel import cluster_channel
+from app.services.warmup import startup_warmer
+from app.config import settings
+from app.utils.compression import CompressionMiddleware
+from app.utils.profiling import ProfilingMiddleware
+from app.database import async_engine, engine
 
 # Configure logging
 logging.basicConfig(
@@ -22,15 +30,24 @@ async def lifespan(app: FastAPI):
     """Startup and shutdown events"""
     # Startup
     logger.info("Starting Ndabase IT Helpdesk System...")
-    sla_monitor.start()
-    logger.info("SLA Monitor started")
+    cluster_channel.start()
+    if settings.RUN_SCHEDULER:
+        audit_archiver.schedule(sla_monitor.scheduler)
+        sla_monitor.start()
+        logger.info("SLA Monitor started")
+    else:
+        logger.info("SLA Monitor runs in the SLA worker (python -m app.workers.sla)")
+    startup_warmer.start(app)
     
     yield
     
     # Shutdown
     logger.info("Shutting down...")
-    sla_monitor.stop()
-    logger.info("SLA Monitor stopped")
+    await startup_warmer.stop()
+    if settings.RUN_SCHEDULER:
+        await sla_monitor.shutdown()  # Sends notifications still queued
+    cluster_channel.stop()
+    await async_engine.dispose()
 
 
 # Create FastAPI app
@@ -38,7 +55,8 @@ app = FastAPI(
     title="Ndabase IT Helpdesk",
     description="Internal Helpdesk Ticketing System for Ndabase Printing Solutions",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -48,13 +66,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Change-Token"],  # Where live ticket lists resume /api/tickets/changes from
 )
 
+# Compress large JSON/text bodies (gzip, or Brotli when available)
+app.add_middleware(CompressionMiddleware)
+
+# Time every request and count its DB statements (outermost, so compression is included)
+app.add_middleware(ProfilingMiddleware)
+
 # Include routers
 app.include_router(auth.router)
 app.include_router(tickets.router)
 app.include_router(reports.router)
 app.include_router(escalations.router)
+app.include_router(events.router)
+app.include_router(monitoring.router)
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -72,6 +99,29 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/health/live")
+def liveness_check():
+    """The process is up and serving requests"""
+    return {"status": "live"}
+
+
+@app.get("/health/ready")
+def readiness_check():
+    """Warm-up has finished and the database answers - 503 until then"""
+    warmup = startup_warmer.status()
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+        database = "ok"
+    except Exception as e:
+        database = str(e)
+    ready = startup_warmer.ready and database == "ok"
+    return ORJSONResponse(
+        {"status": "ready" if ready else "not ready", "database": database, "warmup": warmup},
+        status_code=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -1,7 +1,27 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, JSON, Index, DDL, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import relationship, validates
 from app.database import Base
 from app.utils.timezone import get_sa_time
+from typing import Optional
+import json
+
+
+def ticket_target(ticket_number: str) -> str:
+    return f"ticket:{ticket_number}"
+
+
+def audit_target(entity_type: Optional[str], entity_id: Optional[int], details) -> Optional[str]:
+    """What an action was done to, as one indexable key - "ticket:NDB-0001", "user:7", "escalation:3"
+
+    The ticket when the action concerns one (ticket edits, SLA escalations and their
+    acknowledgements all name it in details), otherwise the entity itself.
+    """
+    if isinstance(details, dict) and details.get("ticket_number"):
+        return ticket_target(details["ticket_number"])
+    if entity_type and entity_id is not None:
+        return f"{entity_type}:{entity_id}"
+    return None
 
 
 class AuditLog(Base):
@@ -11,12 +31,43 @@ class AuditLog(Base):
     entity_type = Column(String, nullable=False)  # 'ticket', 'user', 'sla_escalation'
     entity_id = Column(Integer, nullable=False)  # ID of the entity
     action = Column(String, nullable=False)  # 'created', 'updated', 'assigned', 'escalated'
-    performed_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)  # Null for system actions
-    details = Column(Text, nullable=True)  # JSON string with additional details
+    performed_by_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)  # Null for system actions
+    details = Column(JSON().with_variant(JSONB(), "postgresql"), nullable=True)  # Structured details (JSONB on Postgres, JSON1 on SQLite)
     created_at = Column(DateTime, default=get_sa_time, nullable=False)
     
+    # Action target (see audit_target), so "everything that happened to X" is an index lookup
+    target = Column(String, nullable=True, index=True)
+    
+    __table_args__ = (
+        Index("ix_audit_logs_created_at", "created_at"),
+        Index("ix_audit_logs_entity", "entity_type", "entity_id"),
+        Index("ix_audit_logs_action", "action", "created_at"),
+    )
+    
     # Relationship
     performed_by = relationship("User", foreign_keys=[performed_by_id])
     
+    @validates("details")
+    def _parse_details(self, key, value):
+        """Accept legacy JSON strings"""
+        if isinstance(value, str):
+            value = json.loads(value)
+        return value
+    
     def __repr__(self):
         return f"<AuditLog {self.action} on {self.entity_type}#{self.entity_id}>"
+
+
+# GIN index so Postgres can answer containment filters on details (details @> '{...}')
+event.listen(
+    AuditLog.__table__,
+    "after_create",
+    DDL("CREATE INDEX IF NOT EXISTS ix_audit_logs_details ON audit_logs USING gin (details)").execute_if(dialect="postgresql")
+)
+
+
+@event.listens_for(AuditLog, "before_insert")
+def _set_target(mapper, connection, audit_log):
+    # Bulk inserts through insert(AuditLog) skip this and pass target themselves
+    if audit_log.target is None:
+        audit_log.target = audit_target(audit_log.entity_type, audit_log.entity_id, audit_log.details)
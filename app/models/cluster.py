@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from app.database import Base
+from app.utils.timezone import get_sa_time
+
+
+class ClusterMessage(Base):
+    """A message for every app process - live events and cache invalidations (see app.services.cluster_channel)"""
+    __tablename__ = "cluster_messages"
+
+    id = Column(Integer, primary_key=True)  # Delivery order; doubles as the SSE event id in cluster mode
+    topic = Column(String(64), nullable=False)
+    origin = Column(String(128), nullable=False)  # Process that published it
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime, default=get_sa_time, nullable=False)
+
+    __table_args__ = (
+        Index("ix_cluster_messages_created_at", "created_at"),
+    )
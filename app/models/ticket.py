@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum as SQLEnum
+from sqlalchemy import Column, Integer, BigInteger, String, Text, DateTime, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from app.database import Base
 from app.utils.timezone import get_sa_time
@@ -57,10 +57,23 @@ class Ticket(Base):
     requires_update = Column(Integer, default=0)  # 1 if compulsory update needed
     escalated = Column(Integer, default=0)  # 1 if escalated
     
+    # Duplicate handling
+    merged_into_id = Column(Integer, ForeignKey("tickets.id"), nullable=True, index=True)  # Parent ticket when merged as a duplicate
+    
+    # Delta sync - assigned by database triggers on every insert/update (see app/services/change_feed.py)
+    change_seq = Column(Integer, nullable=True, index=True)
+    change_xid = Column(BigInteger, nullable=True)  # Writing transaction (Postgres only)
+    
+    __table_args__ = (
+        Index("ix_tickets_change_xid_seq", "change_xid", "change_seq"),
+    )
+    
     # Relationships
     assignee = relationship("User", back_populates="assigned_tickets", foreign_keys=[assignee_id])
     updates = relationship("TicketUpdate", back_populates="ticket", cascade="all, delete-orphan")
     escalations = relationship("SLAEscalation", back_populates="ticket", cascade="all, delete-orphan")
+    signature = relationship("TicketSignature", uselist=False, cascade="all, delete-orphan")
+    signature_bands = relationship("TicketSignatureBand", cascade="all, delete-orphan")
 
 
 class TicketUpdate(Base):
@@ -109,3 +122,52 @@ class SLAEscalation(Base):
     # Relationships
     ticket = relationship("Ticket", back_populates="escalations")
     acknowledged_by = relationship("User", foreign_keys=[acknowledged_by_id])
+
+
+class TicketSignature(Base):
+    """MinHash signature of a ticket's text, used for duplicate detection"""
+    __tablename__ = "ticket_signatures"
+    
+    ticket_id = Column(Integer, ForeignKey("tickets.id"), primary_key=True)
+    signature = Column(Text, nullable=False)  # Space-separated MinHash values
+
+
+class TicketSignatureBand(Base):
+    """LSH band keys - tickets sharing any band key are duplicate candidates"""
+    __tablename__ = "ticket_signature_bands"
+    
+    id = Column(Integer, primary_key=True)
+    ticket_id = Column(Integer, ForeignKey("tickets.id"), nullable=False, index=True)
+    band_key = Column(String(16), nullable=False, index=True)
+
+
+class TicketTombstone(Base):
+    """Record of a deleted ticket so delta-sync clients can drop it (written by trigger)"""
+    __tablename__ = "ticket_tombstones"
+    
+    ticket_id = Column(Integer, primary_key=True)
+    ticket_number = Column(String, nullable=False)
+    assignee_id = Column(Integer, nullable=True)
+    change_seq = Column(Integer, nullable=False, index=True)
+    change_xid = Column(BigInteger, nullable=True)  # Writing transaction (Postgres only)
+    deleted_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_ticket_tombstones_change_xid_seq", "change_xid", "change_seq"),
+    )
+
+
+class TicketDeparture(Base):
+    """Record of a ticket reassigned away from someone, so their scoped delta-sync feed drops it (written by trigger)"""
+    __tablename__ = "ticket_departures"
+    
+    ticket_id = Column(Integer, primary_key=True)
+    assignee_id = Column(Integer, primary_key=True)  # The previous assignee
+    ticket_number = Column(String, nullable=False)
+    change_seq = Column(Integer, nullable=False, index=True)
+    change_xid = Column(BigInteger, nullable=True)  # Writing transaction (Postgres only)
+    departed_at = Column(DateTime, nullable=False)
+    
+    __table_args__ = (
+        Index("ix_ticket_departures_change_xid_seq", "change_xid", "change_seq"),
+    )
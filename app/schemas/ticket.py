@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr
-from typing import Optional, List
+from pydantic import BaseModel, EmailStr, Field
+from typing import Optional, List, Literal, Dict
 from datetime import datetime
 from app.models.ticket import TicketPriority, TicketStatus
 
@@ -49,6 +49,16 @@ class TicketUpdateResponse(BaseModel):
         from_attributes = True
 
 
+class DuplicateCandidate(BaseModel):
+    id: int
+    ticket_number: str
+    problem_summary: str
+    status: TicketStatus
+    assignee_id: Optional[int] = None
+    created_at: datetime
+    similarity: float
+
+
 class TicketResponse(BaseModel):
     id: int
     ticket_number: str
@@ -66,7 +76,9 @@ class TicketResponse(BaseModel):
     sla_deadline: datetime
     requires_update: bool
     escalated: bool
-    updates: List[TicketUpdateResponse] = []
+    updates: List[TicketUpdateResponse] = []  # Most recent page, oldest first
+    more_updates: bool = False  # Older history via /updates?before=<updates[0].id>
+    possible_duplicates: List[DuplicateCandidate] = []
     
     class Config:
         from_attributes = True
@@ -92,6 +104,69 @@ class TicketListResponse(BaseModel):
         from_attributes = True
 
 
+class TicketTombstoneResponse(BaseModel):
+    id: int
+    ticket_number: str
+    deleted_at: datetime
+
+
+class TicketChangesResponse(BaseModel):
+    since: str
+    next_token: str  # Pass as ?since= on the next poll
+    has_more: bool  # More changes are waiting - poll again immediately
+    tickets: List[TicketListResponse]  # Created or updated since the token
+    deleted: List[TicketTombstoneResponse]  # Deleted, or left a technician's scope; apply before tickets (ids can be reused)
+
+
+class TicketSummaryResponse(BaseModel):
+    scope: str  # "mine" or "all"
+    total: int
+    active: int  # Not Resolved or Closed
+    by_status: Dict[str, int]
+    by_priority: Dict[str, int]  # Active tickets only
+    escalated: int
+    breached: int
+    at_risk: int
+    requires_update: int
+    resolved_today: int
+
+
+class TicketMergeRequest(BaseModel):
+    duplicate_ticket_numbers: List[str]
+    note: Optional[str] = None
+
+
+class TicketBulkRequest(BaseModel):
+    ticket_ids: List[int] = Field(..., min_length=1, max_length=5000)
+    operation: Literal["status", "reassign", "priority", "close"]
+    status: Optional[TicketStatus] = None
+    priority: Optional[TicketPriority] = None
+    assignee_id: Optional[int] = None
+    reason: Optional[str] = None  # Required for reassign
+    update_text: Optional[str] = None
+    notify: bool = True
+
+
+class TicketBulkResponse(BaseModel):
+    operation: str
+    requested: int
+    updated: int
+    ticket_numbers: List[str]
+    skipped: List[dict] = []
+
+
+class TicketSearchResult(TicketListResponse):
+    score: float
+
+
+class TicketSearchResponse(BaseModel):
+    query: str
+    page: int
+    page_size: int
+    total: int
+    results: List[TicketSearchResult]
+
+
 class SLAEscalationResponse(BaseModel):
     id: int
     ticket_id: int
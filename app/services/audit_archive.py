@@ -0,0 +1,468 @@
+"""
+Audit log partitioning, retention and archiving
+
+Audit rows are kept in monthly partitions named audit_logs_YYYY_MM.
+- Postgres with a natively partitioned audit_logs table (see
+  migrate_audit_log_partitions.py): partitions are attached to the parent.
+- SQLite (and non-partitioned Postgres): audit_logs is the "hot" table and
+  completed months are rolled over into standalone monthly tables.
+
+Partitions older than the retention window are written to gzip-compressed
+JSONL files and dropped. AuditLogArchiver.query() reads hot, rolled-over and
+(optionally) archived rows as one newest-first stream.
+"""
+from sqlalchemy import inspect, text, table, column, select, func, null, false, and_, or_
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Dict, FrozenSet, List, Optional
+from app.database import SessionLocal
+from app.models.audit_log import AuditLog, audit_target, ticket_target
+from app.config import settings
+from app.services.cluster_channel import cluster_channel
+import gzip
+import json
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "audit_logs_"
+PARTITION_PATTERN = re.compile(r"^audit_logs_(\d{4})_(\d{2})$")
+AUDIT_COLUMNS = [c.name for c in AuditLog.__table__.columns]
+LAYOUT_CACHE_NAME = "audit_partitions"
+
+
+def partition_table(name: str):
+    """Lightweight typed table construct for a monthly partition"""
+    return table(name, *[column(c.name, c.type) for c in AuditLog.__table__.columns])
+
+
+def month_start(dt: datetime) -> datetime:
+    """First instant of the month containing dt"""
+    return dt.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(dt: datetime) -> datetime:
+    """First instant of the month after dt"""
+    start = month_start(dt)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(dt: datetime) -> str:
+    """Partition table name for the month containing dt"""
+    return f"{PARTITION_PREFIX}{dt.year:04d}_{dt.month:02d}"
+
+
+def partition_month(name: str) -> Optional[datetime]:
+    """Month start encoded in a partition or archive name, or None"""
+    match = PARTITION_PATTERN.match(name)
+    if not match:
+        return None
+    return datetime(int(match.group(1)), int(match.group(2)), 1)
+
+
+class AuditLogArchiver:
+    """Rolls audit logs into monthly partitions and archives expired months"""
+
+    def __init__(self, archive_dir: str = None, retention_days: int = None):
+        self.archive_dir = archive_dir or settings.AUDIT_LOG_ARCHIVE_DIR
+        self.retention_days = retention_days if retention_days is not None else settings.AUDIT_LOG_RETENTION_DAYS
+        self._layouts: Dict[str, dict] = {}  # Database URL -> layout(), until clear()
+
+    # ---------- Partition discovery ----------
+
+    def layout(self, db: Session) -> dict:
+        """Whether audit_logs is natively partitioned, and each partition's columns (newest first)
+
+        Reflecting the schema costs a catalog query per table, so query() reuses
+        this until invalidate() - called whenever a partition is created or dropped.
+        """
+        key = str(db.bind.url)
+        layout = self._layouts.get(key)
+        if layout is None:
+            inspector = inspect(db.bind)
+            names = sorted((n for n in inspector.get_table_names() if partition_month(n)), reverse=True)
+            partitions: Dict[str, FrozenSet[str]] = {
+                name: frozenset(c["name"] for c in inspector.get_columns(name)) for name in names
+            }
+            layout = self._layouts[key] = {"native": self.is_native(db), "partitions": partitions}
+        return layout
+
+    def invalidate(self):
+        """Forget the partition layout here and in every other process"""
+        self.clear()
+        cluster_channel.invalidate(LAYOUT_CACHE_NAME)
+
+    def clear(self):
+        self._layouts = {}
+
+    def is_native(self, db: Session) -> bool:
+        """True when audit_logs is a natively partitioned Postgres table"""
+        if db.bind.dialect.name != "postgresql":
+            return False
+        relkind = db.execute(
+            text("SELECT relkind FROM pg_class WHERE relname = 'audit_logs'")
+        ).scalar()
+        return relkind == "p"
+
+    def list_partitions(self, db: Session) -> List[str]:
+        """Monthly partition tables, newest first (reflected now - query() uses layout())"""
+        names = [n for n in inspect(db.bind).get_table_names() if partition_month(n)]
+        return sorted(names, reverse=True)
+
+    def list_archives(self) -> List[str]:
+        """Archived partition names (without extension), newest first"""
+        if not os.path.isdir(self.archive_dir):
+            return []
+        names = []
+        for filename in os.listdir(self.archive_dir):
+            if filename.endswith(".jsonl.gz"):
+                name = filename[:-len(".jsonl.gz")]
+                if partition_month(name):
+                    names.append(name)
+        return sorted(names, reverse=True)
+
+    def archive_path(self, name: str) -> str:
+        return os.path.join(self.archive_dir, f"{name}.jsonl.gz")
+
+    # ---------- Rollover ----------
+
+    def rollover(self, db: Session, now: datetime = None) -> List[str]:
+        """Move completed months out of the hot table; returns partitions touched"""
+        now = now or datetime.now()
+
+        if self.is_native(db):
+            # Postgres routes rows itself - just make sure upcoming months have a home
+            created = []
+            for start in (month_start(now), next_month(now)):
+                name = partition_name(start)
+                db.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF audit_logs "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+                ))
+                created.append(name)
+            db.commit()
+            self.invalidate()
+            return created
+
+        # Core queries keep the archiver usable from scripts without the full ORM mapper set
+        hot = AuditLog.__table__
+        oldest = db.execute(select(func.min(hot.c.created_at))).scalar()
+        if not oldest:
+            return []
+
+        touched, created = [], False
+        current = month_start(now)
+        start = month_start(oldest)
+        existing = set(self.list_partitions(db))
+
+        while start < current:
+            end = next_month(start)
+            has_rows = db.execute(
+                select(hot.c.id).where(hot.c.created_at >= start, hot.c.created_at < end).limit(1)
+            ).first()
+
+            if has_rows:
+                name = partition_name(start)
+                if name not in existing:
+                    db.execute(text(f"CREATE TABLE {name} AS SELECT * FROM audit_logs WHERE 1 = 0"))
+                    db.execute(text(f"CREATE INDEX ix_{name}_created_at ON {name} (created_at)"))
+                    existing.add(name)
+                    created = True
+
+                # Copy only the columns the partition has, so older partitions survive schema changes
+                part_columns = [c["name"] for c in inspect(db.bind).get_columns(name)]
+                shared = ", ".join(c for c in AUDIT_COLUMNS if c in part_columns)
+                params = {"start": start, "end": end}
+                db.execute(text(
+                    f"INSERT INTO {name} ({shared}) SELECT {shared} FROM audit_logs "
+                    f"WHERE created_at >= :start AND created_at < :end"
+                ), params)
+                db.execute(text(
+                    "DELETE FROM audit_logs WHERE created_at >= :start AND created_at < :end"
+                ), params)
+                db.commit()
+                touched.append(name)
+                logger.info(f"Rolled audit logs for {start.strftime('%Y-%m')} into {name}")
+
+            start = end
+
+        if created:
+            self.invalidate()
+        return touched
+
+    # ---------- Retention ----------
+
+    def archive_expired(self, db: Session, now: datetime = None) -> List[str]:
+        """Write partitions past the retention window to JSONL.gz and drop them"""
+        now = now or datetime.now()
+        cutoff = now - timedelta(days=self.retention_days)
+        native = self.is_native(db)
+        archived = []
+
+        for name in self.list_partitions(db):
+            # Only archive a month once every row in it is past retention
+            if next_month(partition_month(name)) > cutoff:
+                continue
+
+            if native:
+                db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+                db.commit()
+
+            os.makedirs(self.archive_dir, exist_ok=True)
+            path = self.archive_path(name)
+            tmp_path = f"{path}.tmp"
+            part = partition_table(name)
+            part_columns = [c["name"] for c in inspect(db.bind).get_columns(name)]
+            rows = db.execute(
+                select(*[part.c[c] for c in AUDIT_COLUMNS if c in part_columns]).order_by(part.c.created_at)
+            ).mappings()
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as fh:
+                for row in rows:
+                    fh.write(json.dumps(dict(row), default=_json_default) + "\n")
+
+            # Merge with an existing archive for the same month rather than overwrite it
+            if os.path.exists(path):
+                with gzip.open(path, "rt", encoding="utf-8") as old, gzip.open(tmp_path, "at", encoding="utf-8") as new:
+                    for line in old:
+                        new.write(line)
+            os.replace(tmp_path, path)
+
+            db.execute(text(f"DROP TABLE {name}"))
+            db.commit()
+            archived.append(name)
+            logger.info(f"Archived audit partition {name} to {path}")
+
+        if archived:
+            self.invalidate()
+        return archived
+
+    def run(self):
+        """Scheduled job: roll over the hot table, then archive expired partitions"""
+        db = SessionLocal()
+        try:
+            self.rollover(db)
+            self.archive_expired(db)
+        except Exception as e:
+            logger.error(f"Error in audit log archiving: {str(e)}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def schedule(self, scheduler):
+        """Register the nightly rollover/archive job on an APScheduler instance"""
+        scheduler.add_job(
+            self.run,
+            'cron',
+            hour=2,
+            minute=30,
+            id='audit_log_archiver',
+            replace_existing=True
+        )
+
+    # ---------- Query layer ----------
+
+    def query(
+        self,
+        db: Session,
+        entity_type: Optional[str] = None,
+        action: Optional[str] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        limit: int = 100,
+        include_archived: bool = False,
+        entity_id: Optional[int] = None,
+        ticket_number: Optional[str] = None,
+        target: Optional[str] = None,
+        performed_by_id: Optional[int] = None,
+        detail_key: Optional[str] = None,
+        detail_value: Optional[str] = None
+    ) -> List[dict]:
+        """Newest-first audit rows spanning the hot table, partitions and archives
+
+        target matches the action target (see audit_target); ticket_number is
+        shorthand for target="ticket:<number>".
+        """
+        results = []
+        targets = [t for t in (target, ticket_target(ticket_number) if ticket_number else None) if t]
+
+        def in_range(month: datetime) -> bool:
+            if date_from and next_month(month) <= date_from:
+                return False
+            if date_to and month > date_to:
+                return False
+            return True
+
+        # Hot table (covers every partition when Postgres partitions natively), with the columns each has
+        layout = self.layout(db)
+        sources = [(AuditLog.__table__, set(AUDIT_COLUMNS))]
+        if not layout["native"]:
+            for name, columns in layout["partitions"].items():
+                if in_range(partition_month(name)):
+                    sources.append((partition_table(name), columns))
+
+        # Partitions are month-disjoint and ordered newest first, so stop once full
+        for source, present in sources:
+            remaining = limit - len(results)
+            if remaining <= 0:
+                return results
+
+            # Partitions created before a column was added lack it - select NULL in its place
+            stmt = select(*[source.c[c] if c in present else null().label(c) for c in AUDIT_COLUMNS])
+            if entity_type:
+                stmt = stmt.where(source.c.entity_type == entity_type)
+            if action:
+                stmt = stmt.where(source.c.action == action)
+            if entity_id is not None:
+                stmt = stmt.where(source.c.entity_id == entity_id)
+            for wanted in targets:
+                if "target" in present:
+                    stmt = stmt.where(source.c.target == wanted)
+                else:
+                    stmt = stmt.where(self._target_equals(db, source, wanted))
+            if performed_by_id is not None:
+                stmt = stmt.where(source.c.performed_by_id == performed_by_id)
+            if detail_key and detail_value is not None:
+                stmt = stmt.where(self._detail_equals(db, source, detail_key, detail_value))
+            if date_from:
+                stmt = stmt.where(source.c.created_at >= date_from)
+            if date_to:
+                stmt = stmt.where(source.c.created_at <= date_to)
+            stmt = stmt.order_by(source.c.created_at.desc()).limit(remaining)
+
+            for row in db.execute(stmt).mappings():
+                results.append({**dict(row), "details": _details(row["details"]), "archived": False})
+
+        if not include_archived:
+            return results
+
+        for name in self.list_archives():
+            if len(results) >= limit:
+                break
+            if not in_range(partition_month(name)):
+                continue
+
+            rows = []
+            with gzip.open(self.archive_path(name), "rt", encoding="utf-8") as fh:
+                for line in fh:
+                    row = json.loads(line)
+                    row["created_at"] = datetime.fromisoformat(row["created_at"])
+                    row["details"] = _details(row.get("details"))
+                    if entity_type and row.get("entity_type") != entity_type:
+                        continue
+                    if action and row.get("action") != action:
+                        continue
+                    if entity_id is not None and row.get("entity_id") != entity_id:
+                        continue
+                    row_target = row.get("target") or audit_target(row.get("entity_type"), row.get("entity_id"), row["details"])
+                    if any(row_target != wanted for wanted in targets):
+                        continue
+                    if performed_by_id is not None and row.get("performed_by_id") != performed_by_id:
+                        continue
+                    if detail_key and detail_value is not None and not detail_matches(row["details"], detail_key, detail_value):
+                        continue
+                    if date_from and row["created_at"] < date_from:
+                        continue
+                    if date_to and row["created_at"] > date_to:
+                        continue
+                    rows.append({**{c: row.get(c) for c in AUDIT_COLUMNS}, "archived": True})
+
+            rows.sort(key=lambda r: r["created_at"], reverse=True)
+            results.extend(rows[:limit - len(results)])
+
+        return results
+
+    @classmethod
+    def _target_equals(cls, db: Session, source, target: str):
+        """SQL condition: audit_target(row) == target, for partitions created before the target column"""
+        kind, _, key = target.partition(":")
+        conditions = []
+        if kind == "ticket":
+            conditions.append(cls._detail_equals(db, source, "ticket_number", key))
+        if key.isdigit():
+            # Rows that name a ticket target it instead of their own entity
+            named_ticket = source.c.details["ticket_number"].as_string()
+            conditions.append(and_(
+                source.c.entity_type == kind,
+                source.c.entity_id == int(key),
+                or_(named_ticket.is_(None), named_ticket == "")
+            ))
+        return or_(*conditions) if conditions else false()
+
+    @staticmethod
+    def _detail_equals(db: Session, source, key: str, value: str):
+        """SQL condition: details[key] matches the filter value (see detail_candidates)"""
+        candidates = detail_candidates(value)
+        if db.bind.dialect.name == "postgresql":
+            # Containment is served by the GIN index on details
+            return or_(*[source.c.details.contains({key: candidate}) for candidate in candidates])
+
+        path = json.dumps(key)  # Quoted, so keys with dots or spaces stay one path step
+        json_type = func.json_type(source.c.details, f"$.{path}")
+        json_value = func.json_extract(source.c.details, f"$.{path}")
+        conditions = []
+        for candidate in candidates:
+            if candidate is None:
+                conditions.append(json_type == "null")
+            elif isinstance(candidate, bool):
+                conditions.append(json_type == ("true" if candidate else "false"))
+            elif isinstance(candidate, (int, float)):
+                conditions.append(and_(json_type.in_(["integer", "real"]), json_value == candidate))
+            else:
+                conditions.append(and_(json_type == "text", json_value == candidate))
+        return or_(*conditions)
+
+
+def detail_candidates(value: str) -> list:
+    """What a detail filter value matches: the string itself and, when it parses as a JSON
+    scalar, that value too - so "true" finds True, "42" finds 42 and "42", "NDB-0001" a string"""
+    candidates = [value]
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        return candidates
+    if parsed != value and (parsed is None or isinstance(parsed, (bool, int, float, str))):
+        candidates.append(parsed)
+    return candidates
+
+
+def detail_matches(details: dict, key: str, value: str) -> bool:
+    """detail_candidates matching for archived rows, with JSON's types (true is not 1)"""
+    if key not in details:
+        return False
+    stored = details[key]
+    for candidate in detail_candidates(value):
+        if isinstance(stored, bool) or isinstance(candidate, bool) or stored is None or candidate is None:
+            if stored is candidate:
+                return True
+        elif type(stored) in (int, float) and type(candidate) in (int, float):
+            if stored == candidate:
+                return True
+        elif type(stored) is type(candidate) and stored == candidate:
+            return True
+    return False
+
+
+def _details(value) -> dict:
+    """Normalize details from JSON columns, legacy text rows and archives"""
+    if not value:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value)
+    return value
+
+
+def _json_default(value):
+    """JSON encoder fallback for datetimes in archived rows"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+# Singleton instance
+audit_archiver = AuditLogArchiver()
+
+cluster_channel.on_invalidate(LAYOUT_CACHE_NAME, audit_archiver.clear)
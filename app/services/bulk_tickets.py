@@ -0,0 +1,307 @@
+"""
+Bulk ticket operations
+
+Applies one operation (status change, reassign, priority change, close) to
+many tickets in a single transaction:
+- uniform changes run as one set-based UPDATE ... WHERE id IN (...)
+- per-ticket values (SLA pause/resume, recalculated deadlines) run as one
+  executemany UPDATE keyed by primary key
+- TicketUpdate and AuditLog rows are bulk inserted
+Notifications are grouped into one digest per recipient.
+"""
+from sqlalchemy import insert, update, func
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus
+from app.models.audit_log import AuditLog, ticket_target
+from app.models.user import User
+from app.utils.ticket_helpers import calculate_sla_deadline
+from app.services.email_service import EmailService
+from app.services.event_bus import event_bus, TICKET_UPDATED
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Stay well under SQLite's bound-parameter limit for IN (...) lists
+CHUNK_SIZE = 500
+
+
+def chunked(items: list, size: int = CHUNK_SIZE):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class BulkTicketService:
+    """Set-based ticket updates with batched history, audit and notifications"""
+
+    def load(self, db: Session, ticket_ids: List[int]) -> List:
+        """Fetch just the columns bulk operations need"""
+        rows = []
+        for chunk in chunked(ticket_ids):
+            rows.extend(db.query(
+                Ticket.id,
+                Ticket.ticket_number,
+                Ticket.status,
+                Ticket.priority,
+                Ticket.assignee_id,
+                Ticket.requires_update,
+                Ticket.created_at,
+                Ticket.sla_deadline,
+                Ticket.sla_paused_minutes,
+                Ticket.user_name,
+                Ticket.user_email,
+                Ticket.problem_summary
+            ).filter(Ticket.id.in_(chunk)).all())
+        return rows
+
+    def apply(self, db: Session, request, current_user: User) -> Tuple[dict, List[dict]]:
+        """Run a bulk operation; returns (result summary, notification digests)
+
+        Raises ValueError for invalid requests. Tickets that are blocked by a
+        forced update, or already in the requested state, are skipped.
+        """
+        operation = request.operation
+        ticket_ids = list(dict.fromkeys(request.ticket_ids))
+
+        new_assignee = None
+        if operation == "reassign":
+            if not request.assignee_id:
+                raise ValueError("assignee_id is required for reassign")
+            if not request.reason or len(request.reason.strip()) < 10:
+                raise ValueError("Reassign reason must be at least 10 characters")
+            new_assignee = db.query(User).filter(User.id == request.assignee_id).first()
+            if not new_assignee or new_assignee.role != "technician":
+                raise ValueError("Invalid assignee - must be an active technician")
+        elif operation == "status" and not request.status:
+            raise ValueError("status is required for a status change")
+        elif operation == "priority" and not request.priority:
+            raise ValueError("priority is required for a priority change")
+
+        target_status = TicketStatus.CLOSED if operation == "close" else request.status
+
+        rows = self.load(db, ticket_ids)
+        found = {row.id for row in rows}
+        skipped = [{"ticket_id": tid, "reason": "not found"} for tid in ticket_ids if tid not in found]
+
+        selected = []
+        for row in rows:
+            if row.requires_update:
+                skipped.append({"ticket_id": row.id, "reason": "forced update required"})
+            elif operation == "reassign" and row.assignee_id == new_assignee.id:
+                skipped.append({"ticket_id": row.id, "reason": "already assigned"})
+            elif operation in ("status", "close") and row.status == target_status:
+                skipped.append({"ticket_id": row.id, "reason": f"already {target_status.value}"})
+            elif operation == "priority" and row.priority == request.priority:
+                skipped.append({"ticket_id": row.id, "reason": f"already {request.priority.value}"})
+            else:
+                selected.append(row)
+
+        if not selected:
+            return self._result(operation, ticket_ids, [], skipped), []
+
+        now = datetime.now()
+        selected_ids = [row.id for row in selected]
+        update_text = request.update_text
+
+        if operation == "reassign":
+            for chunk in chunked(selected_ids):
+                db.execute(
+                    update(Ticket).where(Ticket.id.in_(chunk)).values(assignee_id=new_assignee.id, updated_at=now),
+                    execution_options={"synchronize_session": False}
+                )
+            assignee_names = self._user_names(db, {row.assignee_id for row in selected})
+            history = [{
+                "ticket_id": row.id,
+                "update_text": update_text or f"Ticket reassigned from {assignee_names.get(row.assignee_id, 'Unassigned')} to {new_assignee.name}",
+                "updated_by_id": current_user.id,
+                "old_assignee_id": row.assignee_id,
+                "new_assignee_id": new_assignee.id,
+                "reassign_reason": request.reason
+            } for row in selected]
+            audit_details = {row.id: {
+                "old_assignee_id": row.assignee_id,
+                "new_assignee_id": new_assignee.id,
+                "new_assignee_name": new_assignee.name,
+                "reassign_reason": request.reason
+            } for row in selected}
+            action = "ticket_reassigned"
+
+        elif operation == "close":
+            for chunk in chunked(selected_ids):
+                db.execute(
+                    update(Ticket).where(Ticket.id.in_(chunk)).values(
+                        status=TicketStatus.CLOSED,
+                        resolved_at=func.coalesce(Ticket.resolved_at, now),
+                        sla_paused_minutes=0,
+                        updated_at=now
+                    ),
+                    execution_options={"synchronize_session": False}
+                )
+            history = [{
+                "ticket_id": row.id,
+                "update_text": update_text or "Ticket closed",
+                "updated_by_id": current_user.id,
+                "old_status": row.status.value,
+                "new_status": TicketStatus.CLOSED.value
+            } for row in selected]
+            audit_details = {row.id: {"old_status": row.status.value, "new_status": TicketStatus.CLOSED.value} for row in selected}
+            action = "ticket_closed"
+
+        elif operation == "priority":
+            # Deadlines depend on each ticket's created_at, so update by primary key
+            db.execute(
+                update(Ticket),
+                [{
+                    "id": row.id,
+                    "priority": request.priority,
+                    "sla_deadline": calculate_sla_deadline(request.priority, row.created_at),
+                    "updated_at": now
+                } for row in selected]
+            )
+            history = [{
+                "ticket_id": row.id,
+                "update_text": update_text or f"Priority changed from {row.priority.value} to {request.priority.value}",
+                "updated_by_id": current_user.id,
+                "old_priority": row.priority.value,
+                "new_priority": request.priority.value
+            } for row in selected]
+            audit_details = {row.id: {"old_priority": row.priority.value, "new_priority": request.priority.value} for row in selected}
+            action = "priority_changed"
+
+        else:  # status
+            db.execute(update(Ticket), [self._status_values(row, target_status, now) for row in selected])
+            history = [{
+                "ticket_id": row.id,
+                "update_text": update_text or f"Status changed from {row.status.value} to {target_status.value}",
+                "updated_by_id": current_user.id,
+                "old_status": row.status.value,
+                "new_status": target_status.value
+            } for row in selected]
+            audit_details = {row.id: {"old_status": row.status.value, "new_status": target_status.value} for row in selected}
+            action = "status_changed"
+
+        db.execute(insert(TicketUpdate), history)
+        db.execute(insert(AuditLog), [{
+            "entity_type": "ticket",
+            "entity_id": row.id,
+            "action": action,
+            "performed_by_id": current_user.id,
+            "target": ticket_target(row.ticket_number),
+            "details": {
+                "ticket_number": row.ticket_number,
+                "bulk": True,
+                "performed_by": current_user.name,
+                **audit_details[row.id]
+            }
+        } for row in selected])
+
+        db.commit()
+        logger.info(f"Bulk {operation} applied to {len(selected)} tickets by {current_user.name}")
+
+        for row in selected:
+            assignee_id = new_assignee.id if new_assignee else row.assignee_id
+            event_bus.publish(TICKET_UPDATED, {
+                "ticket_id": row.id,
+                "ticket_number": row.ticket_number,
+                "status": (target_status if operation in ("status", "close") else row.status).value,
+                "priority": (request.priority if operation == "priority" else row.priority).value,
+                "assignee_id": assignee_id
+            }, assignee_ids=(row.assignee_id, assignee_id))
+
+        digests = self._digests(db, operation, selected, target_status, new_assignee, request) if request.notify else []
+        return self._result(operation, ticket_ids, selected, skipped), digests
+
+    @staticmethod
+    def _status_values(row, target_status: TicketStatus, now: datetime) -> dict:
+        """Per-ticket column values for a status change, including SLA pause/resume"""
+        values = {"id": row.id, "status": target_status, "updated_at": now}
+
+        if target_status == TicketStatus.RESOLVED:
+            values["resolved_at"] = now
+
+        was_waiting = row.status == TicketStatus.WAITING_ON_USER
+        will_be_waiting = target_status == TicketStatus.WAITING_ON_USER
+
+        if will_be_waiting and not was_waiting:
+            remaining = (row.sla_deadline - now).total_seconds() / 60
+            values["sla_paused_minutes"] = int(max(0, remaining))
+        elif was_waiting and not will_be_waiting:
+            if row.sla_paused_minutes and row.sla_paused_minutes > 0:
+                values["sla_deadline"] = now + timedelta(minutes=row.sla_paused_minutes)
+            else:
+                values["sla_deadline"] = calculate_sla_deadline(row.priority, now)
+            values["sla_paused_minutes"] = 0
+
+        return values
+
+    @staticmethod
+    def _user_names(db: Session, user_ids: set) -> Dict[int, str]:
+        user_ids = {uid for uid in user_ids if uid}
+        if not user_ids:
+            return {}
+        return {u.id: u.name for u in db.query(User.id, User.name).filter(User.id.in_(user_ids)).all()}
+
+    def _digests(self, db: Session, operation: str, selected: list, target_status, new_assignee, request) -> List[dict]:
+        """Group affected tickets into one notification per recipient"""
+        def ticket_entry(row, status_value):
+            return {
+                "ticket_number": row.ticket_number,
+                "problem_summary": row.problem_summary,
+                "status": status_value,
+                "ticket_url": EmailService.get_ticket_url(row.ticket_number)
+            }
+
+        if operation == "reassign":
+            return [{
+                "recipient_email": new_assignee.email,
+                "recipient_name": new_assignee.name,
+                "recipient_whatsapp": new_assignee.phone,
+                "heading": "Tickets Assigned To You",
+                "intro": f"The following tickets have been reassigned to you. Reason: {request.reason}",
+                "tickets": [ticket_entry(row, row.status.value) for row in selected]
+            }]
+
+        if operation == "priority":
+            # Tell each assignee about their tickets
+            by_assignee = {}
+            for row in selected:
+                by_assignee.setdefault(row.assignee_id, []).append(row)
+            assignees = {
+                u.id: u for u in db.query(User).filter(User.id.in_([aid for aid in by_assignee if aid])).all()
+            }
+            return [{
+                "recipient_email": assignees[aid].email,
+                "recipient_name": assignees[aid].name,
+                "recipient_whatsapp": assignees[aid].phone,
+                "heading": f"Ticket Priority Changed to {request.priority.value}",
+                "intro": "The priority and SLA deadline of the following tickets have changed.",
+                "tickets": [ticket_entry(row, row.status.value) for row in rows]
+            } for aid, rows in by_assignee.items() if aid in assignees]
+
+        # Status changes and closures go to the people who reported the tickets
+        by_reporter = {}
+        for row in selected:
+            by_reporter.setdefault(row.user_email, []).append(row)
+        return [{
+            "recipient_email": email,
+            "recipient_name": rows[0].user_name,
+            "recipient_whatsapp": None,
+            "heading": f"Tickets {target_status.value}",
+            "intro": f"The status of your tickets has changed to {target_status.value}.",
+            "tickets": [ticket_entry(row, target_status.value) for row in rows]
+        } for email, rows in by_reporter.items()]
+
+    @staticmethod
+    def _result(operation: str, ticket_ids: list, selected: list, skipped: list) -> dict:
+        return {
+            "operation": operation,
+            "requested": len(ticket_ids),
+            "updated": len(selected),
+            "ticket_numbers": [row.ticket_number for row in selected],
+            "skipped": skipped
+        }
+
+
+# Singleton instance
+bulk_ticket_service = BulkTicketService()
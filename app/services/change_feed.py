@@ -0,0 +1,305 @@
+"""
+Ticket change feed for delta sync
+
+Every insert or update of a ticket stamps tickets.change_seq with the next
+value of a single monotonic counter, and every delete writes a tombstone
+carrying its own counter value. Every reassignment also writes a departure
+for the previous assignee, so a feed scoped to them can drop the ticket.
+New ticket updates, escalation changes and renamed assignees "touch" the
+affected tickets so they are re-stamped too.
+All of this is done by database triggers, so ORM writes, bulk UPDATEs,
+imports, merges and the SLA monitor are covered without extra code. A
+client keeps the last token it received and asks for rows changed after
+it; the indexed range scan costs O(changes) rather than O(tickets). The
+highest stamped value doubles as a cheap data version for HTTP validators
+(ETags).
+
+SQLite serializes writers, so a counter row is enough and change_seq
+becomes visible in commit order. On Postgres the trigger just calls
+nextval(), so concurrent writers can commit out of sequence order. There
+each row also records the transaction that wrote it (change_xid), and the
+feed pages through (change_xid, change_seq) but only below the oldest
+transaction still in flight (the snapshot xmin). Every row under that
+horizon has settled, and later writes always land above it, so a write that
+commits late is never skipped. A long-running writer holds the feed back
+until it finishes.
+"""
+from sqlalchemy import text, select, func, and_, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, joinedload
+from typing import List, Optional, Tuple, Union
+from app.models.ticket import Ticket, TicketTombstone, TicketDeparture
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Oldest transaction id still in flight; every row with a lower change_xid has committed (or rolled back).
+# The txid_* functions keep Postgres 12 working (pg_snapshot_xmin(pg_current_snapshot()) from 13 on).
+POSTGRES_HORIZON = "SELECT txid_snapshot_xmin(txid_current_snapshot())"
+
+SQLITE_NOW = "datetime('now', '+2 hours')"  # SAST, matching get_sa_time()
+
+SQLITE_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS ticket_change_counter (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        value INTEGER NOT NULL
+    )
+    """,
+    "INSERT OR IGNORE INTO ticket_change_counter (id, value) SELECT 1, coalesce(MAX(change_seq), 0) FROM tickets",
+    # SQLite can hand a deleted ticket's id to a new ticket. Its tombstone stays, since a
+    # client scoped to the old assignee may never see the new ticket; earlier versions dropped it.
+    "DROP TRIGGER IF EXISTS tickets_change_seq_ai",
+    """
+    CREATE TRIGGER tickets_change_seq_ai AFTER INSERT ON tickets BEGIN
+        UPDATE ticket_change_counter SET value = value + 1 WHERE id = 1;
+        UPDATE tickets SET change_seq = (SELECT value FROM ticket_change_counter WHERE id = 1) WHERE id = new.id;
+    END
+    """,
+    # The inner UPDATE changes change_seq, so the WHEN clause stops it re-firing
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_change_seq_au AFTER UPDATE ON tickets
+    WHEN new.change_seq IS old.change_seq BEGIN
+        UPDATE ticket_change_counter SET value = value + 1 WHERE id = 1;
+        UPDATE tickets SET change_seq = (SELECT value FROM ticket_change_counter WHERE id = 1) WHERE id = new.id;
+    END
+    """,
+    # A reassignment also leaves a departure for the previous assignee, with its own counter value
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_departure_au AFTER UPDATE OF assignee_id ON tickets
+    WHEN old.assignee_id IS NOT NULL AND new.assignee_id IS NOT old.assignee_id BEGIN
+        UPDATE ticket_change_counter SET value = value + 1 WHERE id = 1;
+        INSERT OR REPLACE INTO ticket_departures (ticket_id, assignee_id, ticket_number, change_seq, departed_at)
+        VALUES (old.id, old.assignee_id, new.ticket_number,
+                (SELECT value FROM ticket_change_counter WHERE id = 1), {SQLITE_NOW});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tickets_change_seq_ad AFTER DELETE ON tickets BEGIN
+        UPDATE ticket_change_counter SET value = value + 1 WHERE id = 1;
+        INSERT OR REPLACE INTO ticket_tombstones (ticket_id, ticket_number, assignee_id, change_seq, deleted_at)
+        VALUES (old.id, old.ticket_number, old.assignee_id,
+                (SELECT value FROM ticket_change_counter WHERE id = 1), {SQLITE_NOW});
+    END
+    """,
+]
+
+POSTGRES_DDL = [
+    "CREATE SEQUENCE IF NOT EXISTS ticket_change_seq",
+    """
+    CREATE OR REPLACE FUNCTION ticket_change_seq_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            INSERT INTO ticket_tombstones (ticket_id, ticket_number, assignee_id, change_seq, change_xid, deleted_at)
+            VALUES (OLD.id, OLD.ticket_number, OLD.assignee_id, nextval('ticket_change_seq'),
+                    txid_current(), (now() AT TIME ZONE 'UTC') + interval '2 hours')
+            ON CONFLICT (ticket_id) DO UPDATE SET
+                ticket_number = EXCLUDED.ticket_number,
+                assignee_id = EXCLUDED.assignee_id,
+                change_seq = EXCLUDED.change_seq,
+                change_xid = EXCLUDED.change_xid,
+                deleted_at = EXCLUDED.deleted_at;
+            RETURN OLD;
+        END IF;
+        IF TG_OP = 'UPDATE' AND OLD.assignee_id IS NOT NULL AND NEW.assignee_id IS DISTINCT FROM OLD.assignee_id THEN
+            INSERT INTO ticket_departures (ticket_id, assignee_id, ticket_number, change_seq, change_xid, departed_at)
+            VALUES (OLD.id, OLD.assignee_id, NEW.ticket_number, nextval('ticket_change_seq'),
+                    txid_current(), (now() AT TIME ZONE 'UTC') + interval '2 hours')
+            ON CONFLICT (ticket_id, assignee_id) DO UPDATE SET
+                ticket_number = EXCLUDED.ticket_number,
+                change_seq = EXCLUDED.change_seq,
+                change_xid = EXCLUDED.change_xid,
+                departed_at = EXCLUDED.departed_at;
+        END IF;
+        NEW.change_seq := nextval('ticket_change_seq');
+        NEW.change_xid := txid_current();
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS tickets_change_seq_sync ON tickets",
+    """
+    CREATE TRIGGER tickets_change_seq_sync
+    BEFORE INSERT OR UPDATE OR DELETE ON tickets
+    FOR EACH ROW EXECUTE FUNCTION ticket_change_seq_sync()
+    """,
+]
+
+
+# Re-stamp tickets whose detail/list representation depends on other tables.
+# Setting change_seq to itself fires the per-row stamping trigger above.
+TOUCH_DDL = {
+    "ticket_updates_touch_ticket": (
+        "AFTER INSERT ON ticket_updates",
+        "UPDATE tickets SET change_seq = change_seq WHERE id = {row}.ticket_id"
+    ),
+    "sla_escalations_touch_ticket_ai": (
+        "AFTER INSERT ON sla_escalations",
+        "UPDATE tickets SET change_seq = change_seq WHERE id = {row}.ticket_id"
+    ),
+    "sla_escalations_touch_ticket_au": (
+        "AFTER UPDATE ON sla_escalations",
+        "UPDATE tickets SET change_seq = change_seq WHERE id = {row}.ticket_id"
+    ),
+    "users_touch_tickets": (
+        "AFTER UPDATE OF name, email, role ON users",
+        "UPDATE tickets SET change_seq = change_seq WHERE assignee_id = {row}.id"
+    ),
+}
+
+SQLITE_DDL += [
+    f"CREATE TRIGGER IF NOT EXISTS {name} {timing} BEGIN {statement.format(row='new')}; END"
+    for name, (timing, statement) in TOUCH_DDL.items()
+]
+
+POSTGRES_DDL += [
+    ddl
+    for name, (timing, statement) in TOUCH_DDL.items()
+    for ddl in (
+        f"""
+        CREATE OR REPLACE FUNCTION {name}() RETURNS trigger AS $$
+        BEGIN
+            {statement.format(row='NEW')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+        """,
+        f"DROP TRIGGER IF EXISTS {name} ON {timing.split(' ON ')[1]}",
+        f"CREATE TRIGGER {name} {timing} FOR EACH ROW EXECUTE FUNCTION {name}()",
+    )
+]
+
+
+class TicketChangeFeed:
+    """Trigger-maintained change sequence and tombstones for tickets"""
+
+    def install(self, engine: Engine):
+        """Create the counter and triggers (idempotent; tables come from the models)"""
+        statements = POSTGRES_DDL if engine.dialect.name == "postgresql" else SQLITE_DDL
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        logger.info("Ticket change feed installed")
+
+    def backfill(self, engine: Engine) -> int:
+        """Give tickets created before the triggers existed a change_seq; returns rows stamped"""
+        with engine.begin() as conn:
+            if engine.dialect.name == "postgresql":
+                # The BEFORE UPDATE trigger assigns the real values; tombstones only need to count as settled
+                conn.execute(text("UPDATE ticket_tombstones SET change_xid = 0 WHERE change_xid IS NULL"))
+                return conn.execute(text(
+                    "UPDATE tickets SET change_seq = 0 WHERE change_seq IS NULL OR change_xid IS NULL"
+                )).rowcount
+
+            start = conn.execute(text("SELECT value FROM ticket_change_counter WHERE id = 1")).scalar() or 0
+            ids = conn.execute(text(
+                "SELECT id FROM tickets WHERE change_seq IS NULL ORDER BY updated_at, id"
+            )).scalars().all()
+            if ids:
+                conn.execute(
+                    text("UPDATE tickets SET change_seq = :seq WHERE id = :id"),
+                    [{"seq": start + offset, "id": ticket_id} for offset, ticket_id in enumerate(ids, start=1)]
+                )
+                conn.execute(text("UPDATE ticket_change_counter SET value = :value WHERE id = 1"), {"value": start + len(ids)})
+            return len(ids)
+
+    def version(self, db: Session) -> int:
+        """Highest committed change position - moves whenever any ticket (or its history) changes"""
+        if db.bind.dialect.name == "postgresql":
+            # change_seq can commit out of order there; every write that settles lands above
+            # the previous horizon, so the highest settled change_xid moves instead
+            horizon = db.execute(text(POSTGRES_HORIZON)).scalar()
+            latest = [
+                select(func.max(model.change_xid)).where(model.change_xid < horizon)
+                for model in (Ticket, TicketTombstone)
+            ]
+        else:
+            latest = [select(func.max(model.change_seq)) for model in (Ticket, TicketTombstone)]
+        # Two index lookups; committed data only, unlike reading the sequence itself
+        tickets, tombstones = db.execute(select(*(query.scalar_subquery() for query in latest))).one()
+        return max(tickets or 0, tombstones or 0)
+
+    def current_token(self, db: Session) -> str:
+        """A token to poll /changes with after reading the ticket list in this session"""
+        if db.bind.dialect.name == "postgresql":
+            # Everything below the horizon is already visible; rows at or above it are still to come
+            return format_token(db.execute(text(POSTGRES_HORIZON)).scalar(), 0)
+        return format_token(self.version(db))
+
+    def changes(
+        self,
+        db: Session,
+        since: Tuple[int, int],
+        limit: int = 500,
+        assignee_id: Optional[int] = None
+    ) -> Tuple[List[Ticket], List[Union[TicketTombstone, TicketDeparture]], str, bool]:
+        """Tickets and removals changed after a parsed token, oldest change first
+
+        Returns (tickets, removed, next_token, has_more). Rows are merged by
+        change position before the limit is applied, so next_token is always
+        a position the client has fully seen. removed holds tombstones; with
+        assignee_id only that user's tickets are returned, and removed also
+        holds departures of tickets reassigned away from them, which leave
+        their view without being deleted.
+        """
+        # Rows (or their columns) ordered by change position: (change_xid, change_seq) on Postgres
+        if db.bind.dialect.name == "postgresql":
+            horizon = db.execute(text(POSTGRES_HORIZON)).scalar()
+            since_key = since
+
+            def key(row):
+                return (row.change_xid, row.change_seq)
+
+            def changed(model):
+                # Settled rows only - nothing can commit below the horizon any more
+                return and_(model.change_xid < horizon, tuple_(*key(model)) > tuple_(*since_key))
+        else:
+            since_key = since[1:]
+
+            def key(row):
+                return (row.change_seq,)
+
+            def changed(model):
+                return model.change_seq > since_key[0]
+
+        # Departures only matter to the assignee a ticket left; everyone else still sees it
+        models = [Ticket, TicketTombstone] + ([TicketDeparture] if assignee_id is not None else [])
+        merged = []
+        for model in models:
+            query = db.query(model).filter(changed(model))
+            if model is Ticket:
+                query = query.options(joinedload(Ticket.assignee))
+            if assignee_id is not None:
+                query = query.filter(model.assignee_id == assignee_id)
+            merged += query.order_by(*key(model)).limit(limit + 1).all()
+        merged.sort(key=key)
+
+        has_more = len(merged) > limit
+        page = merged[:limit]
+
+        next_token = format_token(*(key(page[-1]) if page else since_key))
+        return (
+            [row for row in page if isinstance(row, Ticket)],
+            [row for row in page if not isinstance(row, Ticket)],
+            next_token,
+            has_more
+        )
+
+
+def parse_token(token: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Tokens are opaque to clients; today they are the decimal change position,
+    prefixed on Postgres with the writing transaction ("xid.position")"""
+    if token is None or token == "":
+        return (0, 0)
+    xid, dot, position = token.rpartition(".")
+    if not position.isdigit() or (dot and not xid.isdigit()):
+        return None
+    return (int(xid or 0), int(position))
+
+
+def format_token(*key: int) -> str:
+    return ".".join(str(part) for part in key)
+
+
+# Singleton instance
+ticket_changes = TicketChangeFeed()
@@ -0,0 +1,185 @@
+"""
+Cross-process message channel for multi-worker deployments
+
+With several web workers (and the scheduler in its own process), anything a
+process keeps in memory - live-event fan-out, cached snapshots - only sees
+the writes that process made. ClusterChannel carries small messages between
+processes through the cluster_messages table:
+
+- publish(topic, payload) queues a message; a background thread inserts it,
+  so request handlers never wait on the write.
+- Every process polls for rows past the last id it has seen (immediately
+  after its own publishes, otherwise every CLUSTER_CHANNEL_POLL_SECONDS) and
+  calls the handlers subscribed to each topic. A process receives its own
+  messages the same way, so every process sees one order.
+- invalidate(name) / on_invalidate(name, handler) drop a named in-process
+  cache in every process.
+
+Row ids are the delivery order. SQLite serializes writers; on Postgres the
+insert takes a transaction-level advisory lock (as the change feed does), so
+ids become visible in commit order and a poller never skips one. Rows older
+than CLUSTER_CHANNEL_RETENTION_SECONDS are pruned.
+
+When the channel is disabled (single-process mode, the default) publish()
+calls the local handlers directly and the table is never used.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from typing import Callable, Optional
+from sqlalchemy import delete, func, insert, select, text
+from app.config import settings
+from app.database import engine
+from app.models.cluster import ClusterMessage
+from app.utils.timezone import get_sa_time
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant identifying the channel's insert lock
+ADVISORY_LOCK_KEY = 7302
+
+POLL_BATCH = 500
+PRUNE_INTERVAL_SECONDS = 60
+
+
+class ClusterChannel:
+    """Database-backed pub/sub between app processes"""
+
+    def __init__(self, enabled: bool = None, poll_seconds: float = None):
+        self.enabled = settings.CLUSTER_CHANNEL_ENABLED if enabled is None else enabled
+        self.poll_seconds = poll_seconds or settings.CLUSTER_CHANNEL_POLL_SECONDS
+        self.origin = f"{socket.gethostname()}:{os.getpid()}"
+        self.last_id: Optional[int] = None  # Highest message id delivered to this process
+        self._handlers = defaultdict(list)  # topic -> [handler(payload, message_id)]
+        self._outbox = []
+        self._outbox_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_prune = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def subscribe(self, topic: str, handler: Callable):
+        """Call handler(payload, message_id) for every message on topic (message_id is None when disabled)"""
+        self._handlers[topic].append(handler)
+
+    def publish(self, topic: str, payload: dict):
+        """Deliver payload to the topic's handlers in every process (callable from any thread)"""
+        if not self.enabled:
+            self._dispatch(topic, payload, None)
+            return
+        with self._outbox_lock:
+            self._outbox.append({"topic": topic, "origin": self.origin, "payload": payload})
+        if self.running:
+            self._wake.set()
+        else:
+            # Scripts and one-off commands: write now, there is no poller to pick it up
+            self.flush()
+
+    def on_invalidate(self, name: str, handler: Callable[[], None]):
+        """Run handler in every process whenever invalidate(name) is called anywhere"""
+        self.subscribe(f"invalidate:{name}", lambda payload, message_id: handler())
+
+    def invalidate(self, name: str):
+        self.publish(f"invalidate:{name}", {})
+
+    # ---------- Process lifecycle ----------
+
+    def start(self):
+        """Start delivering messages published from now on (no-op when disabled)"""
+        if not self.enabled or self.running:
+            return
+        ClusterMessage.__table__.create(engine, checkfirst=True)  # Databases created before the channel existed
+        with engine.connect() as conn:
+            self.last_id = conn.execute(select(func.max(ClusterMessage.id))).scalar() or 0
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="cluster-channel", daemon=True)
+        self._thread.start()
+        logger.info(f"Cluster channel started for {self.origin} at message {self.last_id}")
+
+    def stop(self):
+        if not self.running:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._thread = None
+        self.flush()  # Anything published during shutdown
+        logger.info("Cluster channel stopped")
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+                while self.poll() == POLL_BATCH:
+                    pass
+                self.prune()
+            except Exception as e:
+                logger.error(f"Cluster channel error: {str(e)}")
+                self._stopping.wait(self.poll_seconds)
+
+    # ---------- Database ----------
+
+    def flush(self) -> int:
+        """Write queued messages; returns how many were written"""
+        with self._outbox_lock:
+            messages, self._outbox = self._outbox, []
+        if not messages:
+            return 0
+        created_at = get_sa_time()
+        try:
+            with engine.begin() as conn:
+                if engine.dialect.name == "postgresql":
+                    conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": ADVISORY_LOCK_KEY})
+                conn.execute(insert(ClusterMessage.__table__), [
+                    {**message, "created_at": created_at} for message in messages
+                ])
+        except Exception:
+            # Keep them for the next attempt, ahead of anything queued meanwhile
+            with self._outbox_lock:
+                self._outbox[:0] = messages
+            raise
+        return len(messages)
+
+    def poll(self) -> int:
+        """Deliver messages newer than last_id; returns how many were read"""
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(ClusterMessage.id, ClusterMessage.topic, ClusterMessage.payload)
+                .where(ClusterMessage.id > self.last_id)
+                .order_by(ClusterMessage.id)
+                .limit(POLL_BATCH)
+            ).all()
+        for row in rows:
+            self.last_id = row.id
+            self._dispatch(row.topic, row.payload, row.id)
+        return len(rows)
+
+    def prune(self, force: bool = False) -> int:
+        """Delete messages older than the retention window (at most once a minute unless forced)"""
+        if not force and time.monotonic() - self._last_prune < PRUNE_INTERVAL_SECONDS:
+            return 0
+        self._last_prune = time.monotonic()
+        cutoff = get_sa_time() - timedelta(seconds=settings.CLUSTER_CHANNEL_RETENTION_SECONDS)
+        with engine.begin() as conn:
+            return conn.execute(delete(ClusterMessage).where(ClusterMessage.created_at < cutoff)).rowcount
+
+    def _dispatch(self, topic: str, payload: dict, message_id: Optional[int]):
+        for handler in self._handlers.get(topic, ()):
+            try:
+                handler(payload, message_id)
+            except Exception as e:
+                logger.error(f"Cluster channel handler for {topic} failed: {str(e)}")
+
+
+# Singleton instance
+cluster_channel = ClusterChannel()
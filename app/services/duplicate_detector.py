@@ -0,0 +1,146 @@
+"""
+Duplicate ticket detection using MinHash signatures and LSH banding
+
+Each ticket's summary and description are reduced to a set of word and
+word-pair shingles, then to a fixed-size MinHash signature. The signature is
+split into bands; tickets sharing any band key are candidates, and candidates
+are scored by the fraction of matching signature slots (an estimate of the
+Jaccard similarity of their shingle sets). Only indexed band lookups and a
+handful of signature comparisons happen per new ticket.
+"""
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Tuple
+from app.models.ticket import Ticket, TicketStatus, TicketSignature, TicketSignatureBand
+import random
+import re
+import zlib
+
+NUM_HASHES = 32
+BANDS = 16
+ROWS_PER_BAND = NUM_HASHES // BANDS
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+# What signature() used to store for text without shingles - removed by migrate_duplicate_detection.py
+EMPTY_SIGNATURE = " ".join([str(MAX_HASH)] * NUM_HASHES)
+
+# Fixed seed so signatures stay comparable across restarts and processes
+_rng = random.Random(20251015)
+HASH_PARAMS = [(_rng.randrange(1, MERSENNE_PRIME), _rng.randrange(0, MERSENNE_PRIME)) for _ in range(NUM_HASHES)]
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "but", "by", "for", "from", "has", "have",
+    "i", "in", "is", "it", "its", "my", "of", "on", "or", "our", "the", "this", "to",
+    "was", "we", "with", "not", "no", "can", "cannot", "please"
+}
+
+OPEN_STATUSES = [TicketStatus.OPEN, TicketStatus.IN_PROGRESS, TicketStatus.WAITING_ON_USER]
+
+
+class DuplicateDetector:
+    """Finds open tickets similar to a new ticket's text"""
+
+    def __init__(self, threshold: float = 0.4):
+        self.threshold = threshold
+
+    @staticmethod
+    def shingles(summary: str, description: Optional[str] = None) -> set:
+        """Word and adjacent word-pair shingles of the ticket text"""
+        text = f"{summary or ''} {description or ''}".lower()
+        words = [w for w in TOKEN_PATTERN.findall(text) if w not in STOP_WORDS and not w.isdigit()]
+        shingles = set(words)
+        shingles.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+        return shingles
+
+    def signature(self, summary: str, description: Optional[str] = None) -> Optional[List[int]]:
+        """MinHash signature (NUM_HASHES values) of the ticket text, or None when it has no usable shingles.
+
+        Text that is only stop words, digits or nothing at all says nothing about the problem; giving it
+        a signature would make every such ticket a perfect match for every other one.
+        """
+        hashes = [zlib.crc32(s.encode("utf-8")) for s in self.shingles(summary, description)]
+        if not hashes:
+            return None
+        return [
+            min(((a * h + b) % MERSENNE_PRIME) & MAX_HASH for h in hashes)
+            for a, b in HASH_PARAMS
+        ]
+
+    @staticmethod
+    def band_keys(signature: List[int]) -> List[str]:
+        """One LSH key per band; the band number is part of the key"""
+        keys = []
+        for band in range(BANDS):
+            rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+            digest = zlib.crc32(",".join(str(v) for v in rows).encode("utf-8"))
+            keys.append(f"{band:02d}{digest:08x}")
+        return keys
+
+    @staticmethod
+    def similarity(sig_a: List[int], sig_b: List[int]) -> float:
+        """Estimated Jaccard similarity from two signatures"""
+        return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / NUM_HASHES
+
+    def index_tickets(self, db: Session, tickets: Iterable[Tuple[int, str, Optional[str]]]) -> int:
+        """Store signatures and band keys for (ticket_id, summary, description) rows - no commit.
+        Tickets without usable text are not indexed; returns how many were."""
+        signatures = []
+        bands = []
+        for ticket_id, summary, description in tickets:
+            sig = self.signature(summary, description)
+            if sig is None:
+                continue
+            signatures.append({"ticket_id": ticket_id, "signature": " ".join(str(v) for v in sig)})
+            bands.extend({"ticket_id": ticket_id, "band_key": key} for key in self.band_keys(sig))
+
+        if signatures:
+            # Core inserts: no ORM primary-key bookkeeping for the (many) band rows
+            db.execute(insert(TicketSignature.__table__), signatures)
+            db.execute(insert(TicketSignatureBand.__table__), bands)
+        return len(signatures)
+
+    def index_ticket(self, db: Session, ticket: Ticket):
+        """Index a single ticket - no commit"""
+        self.index_tickets(db, [(ticket.id, ticket.problem_summary, ticket.problem_description)])
+
+    def find_similar(
+        self,
+        db: Session,
+        summary: str,
+        description: Optional[str] = None,
+        exclude_id: Optional[int] = None,
+        limit: int = 5
+    ) -> List[Tuple[Ticket, float]]:
+        """Open tickets whose text looks like a duplicate, most similar first"""
+        sig = self.signature(summary, description)
+        if sig is None:
+            return []
+
+        candidate_ids = db.query(TicketSignatureBand.ticket_id).filter(
+            TicketSignatureBand.band_key.in_(self.band_keys(sig))
+        ).distinct()
+
+        query = db.query(Ticket, TicketSignature.signature).join(
+            TicketSignature, TicketSignature.ticket_id == Ticket.id
+        ).filter(
+            Ticket.id.in_(candidate_ids),
+            Ticket.status.in_(OPEN_STATUSES),
+            Ticket.merged_into_id.is_(None)
+        )
+        if exclude_id:
+            query = query.filter(Ticket.id != exclude_id)
+
+        matches = []
+        for ticket, stored in query.all():
+            score = self.similarity(sig, [int(v) for v in stored.split()])
+            if score >= self.threshold:
+                matches.append((ticket, score))
+
+        matches.sort(key=lambda m: (m[1], m[0].id), reverse=True)
+        return matches[:limit]
+
+
+# Singleton instance
+duplicate_detector = DuplicateDetector()
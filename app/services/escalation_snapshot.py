@@ -0,0 +1,287 @@
+"""
+Shared snapshot of the escalation view
+
+The GM and ICT Manager dashboards poll GET /api/escalations on timers, and
+every viewer used to recompute the same result. EscalationSnapshot builds
+the view once - escalated tickets with their latest escalation record, and
+paused (Waiting on User) tickets with their last update - and serves it from
+memory to every viewer until it is invalidated:
+
+- when the SLA monitor escalates tickets (once the scan has committed),
+- when the GM acknowledges an escalation,
+- when a ticket's status changes through PATCH /api/tickets/{number}.
+
+invalidate() drops the snapshot in every process through the cluster
+channel. The snapshot also records the ticket change version it was built
+at, so any other ticket write (reassignments, bulk edits, imports) makes the
+next request rebuild it rather than serve stale rows.
+
+Nothing time-dependent is stored: the "N minutes ago" / "Paused for N hours"
+labels and the status filter are applied to a copy on every request.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+from app.models.user import User
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus, SLAEscalation
+from app.services.cluster_channel import cluster_channel
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_NAME = "escalations"
+
+# Columns the escalation view reads, fetched as plain rows - no Ticket instances in the identity map
+ESCALATION_TICKET_COLUMNS = (
+    Ticket.id,
+    Ticket.ticket_number,
+    Ticket.problem_summary,
+    Ticket.priority,
+    Ticket.status,
+    Ticket.sla_status,
+    Ticket.requires_update,
+    Ticket.assignee_id,
+    Ticket.user_name,
+    Ticket.user_email,
+    Ticket.created_at,
+    Ticket.updated_at,
+    Ticket.sla_deadline,
+    Ticket.sla_paused_minutes,
+    User.name.label("assignee_name")
+)
+
+ESCALATION_RECORD_COLUMNS = (
+    SLAEscalation.ticket_id,
+    SLAEscalation.escalation_reason,
+    SLAEscalation.escalated_at,
+    SLAEscalation.previous_priority,
+    SLAEscalation.gm_acknowledged,
+    SLAEscalation.acknowledged_by_id,
+    SLAEscalation.acknowledged_at_gm,
+    SLAEscalation.acknowledgment_note,
+    User.name.label("acknowledged_by_name")
+)
+
+
+def elapsed_label(since: datetime, now: datetime) -> str:
+    """'N minutes' / 'N hours' / 'N days' between since and now"""
+    diff = now - since
+    hours = diff.total_seconds() / 3600
+    if hours < 1:
+        return f"{int(diff.total_seconds() / 60)} minutes"
+    elif hours < 24:
+        return f"{int(hours)} hours"
+    return f"{int(hours / 24)} days"
+
+
+def status_matching(status_filter: str) -> Optional[TicketStatus]:
+    """The status a ?status_filter= value selects - by value or name, as the database filter accepted it"""
+    for ticket_status in TicketStatus:
+        if status_filter in (ticket_status.value, ticket_status.name):
+            return ticket_status
+    return None
+
+
+class EscalationSnapshot:
+    """Escalation view computed once and shared by every viewer in this process"""
+
+    def __init__(self):
+        self.snapshot: Optional[dict] = None
+        self.builds = 0
+        self._generation = 0  # Bumped by clear(), so a build that overlaps an invalidation is not kept
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        """Drop the snapshot here and in every other process"""
+        self.clear()
+        cluster_channel.invalidate(SNAPSHOT_NAME)
+
+    def clear(self):
+        self._generation += 1
+        self.snapshot = None
+
+    def view(self, db: Session, version: int, status_filter: Optional[str] = None) -> dict:
+        """The GET /api/escalations response, from the snapshot for this change version"""
+        snapshot = self.get(db, version)
+        now = datetime.utcnow()
+
+        active_escalations = []
+        if status_filter:
+            wanted = status_matching(status_filter)
+            escalated = [item for item in snapshot["active"] if item[0]["status"] == wanted]
+        else:
+            escalated = snapshot["active"]
+        for entry, escalated_at in escalated:
+            active_escalations.append({
+                **entry,
+                "status": entry["status"].value,
+                "time_since_escalation": f"{elapsed_label(escalated_at, now)} ago" if escalated_at else None
+            })
+
+        # Paused tickets only show without a specific status filter or with "pending"
+        paused_escalations = []
+        if not status_filter or status_filter == "pending":
+            for entry, paused_at in snapshot["paused"]:
+                paused_escalations.append({
+                    **entry,
+                    "status": entry["status"].value,
+                    "time_since_escalation": f"Paused for {elapsed_label(paused_at, now)}"
+                })
+
+        return {
+            "total": len(active_escalations) + len(paused_escalations),
+            "active_escalations": len(active_escalations),
+            "paused_tickets": len(paused_escalations),
+            "escalations": active_escalations,  # For backward compatibility
+            "active": active_escalations,  # SLA breached tickets
+            "paused": paused_escalations  # Waiting on User tickets
+        }
+
+    def get(self, db: Session, version: int) -> dict:
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot["version"] == version:
+            return snapshot
+        # One build per change - viewers arriving meanwhile wait for it instead of running the same queries
+        with self._lock:
+            snapshot = self.snapshot
+            if snapshot is not None and snapshot["version"] == version:
+                return snapshot
+            generation = self._generation
+            snapshot = self.build(db, version)
+            if generation == self._generation:
+                self.snapshot = snapshot
+            return snapshot
+
+    def build(self, db: Session, version: int) -> dict:
+        """Query the escalation view; entries hold the status as a TicketStatus and no time labels"""
+        self.builds += 1
+
+        # Escalated tickets (SLA breached) - EXCLUDE resolved/closed tickets
+        escalated_tickets = db.query(*ESCALATION_TICKET_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id).filter(
+            Ticket.escalated == 1,
+            Ticket.status.notin_([TicketStatus.RESOLVED, TicketStatus.CLOSED])  # Only show open escalations
+        ).order_by(Ticket.updated_at.desc()).all()
+
+        # Paused tickets (Waiting on User/Parts)
+        paused_tickets = db.query(*ESCALATION_TICKET_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id).filter(
+            Ticket.status == TicketStatus.WAITING_ON_USER,
+            Ticket.escalated == 0  # Not already escalated
+        ).order_by(Ticket.updated_at.desc()).all()
+
+        # Latest escalation record per ticket, with the acknowledging user, in one query
+        latest_escalations = {}
+        if escalated_tickets:
+            escalation_rows = db.query(*ESCALATION_RECORD_COLUMNS).outerjoin(
+                User, User.id == SLAEscalation.acknowledged_by_id
+            ).filter(
+                SLAEscalation.ticket_id.in_([ticket.id for ticket in escalated_tickets])
+            ).order_by(SLAEscalation.escalated_at).all()
+            for escalation in escalation_rows:
+                latest_escalations[escalation.ticket_id] = escalation  # Later rows replace earlier ones
+
+        # (entry, escalated_at) - escalated_at is None without an escalation record, so no "time since"
+        active = []
+        for ticket in escalated_tickets:
+            latest_escalation = latest_escalations.get(ticket.id)
+
+            # Get acknowledgment info
+            gm_acknowledged = bool(latest_escalation.gm_acknowledged) if latest_escalation else False
+            acknowledged_by_name = None
+            acknowledged_at = None
+            acknowledgment_note = None
+
+            if latest_escalation and latest_escalation.gm_acknowledged:
+                if latest_escalation.acknowledged_by_id:
+                    acknowledged_by_name = latest_escalation.acknowledged_by_name or "Unknown"
+                acknowledged_at = latest_escalation.acknowledged_at_gm
+                acknowledgment_note = latest_escalation.acknowledgment_note
+
+            active.append(({
+                "id": ticket.id,
+                "ticket_id": ticket.id,
+                "ticket_number": ticket.ticket_number,
+                "title": ticket.problem_summary,
+                "problem_summary": ticket.problem_summary,
+                "priority": ticket.priority.value,
+                "status": ticket.status,
+                "category": "General Support",
+                "sla_status": ticket.sla_status.value if ticket.sla_status else "Unknown",
+                "requires_update": bool(ticket.requires_update),
+                "assignee_name": ticket.assignee_name or "Unassigned",
+                "assignee_id": ticket.assignee_id,
+                "reported_by_name": ticket.user_name,
+                "reported_by_email": ticket.user_email,
+                "user_name": ticket.user_name,
+                "user_email": ticket.user_email,
+                "escalation_reason": latest_escalation.escalation_reason if latest_escalation else "SLA breach",
+                "escalated_at": latest_escalation.escalated_at if latest_escalation else ticket.created_at,
+                "time_since_escalation": None,
+                "previous_priority": latest_escalation.previous_priority if latest_escalation else None,
+                "created_at": ticket.created_at,
+                "sla_deadline": ticket.sla_deadline,
+                "gm_acknowledged": gm_acknowledged,
+                "acknowledged_by": acknowledged_by_name,
+                "acknowledged_at": acknowledged_at,
+                "acknowledgment_note": acknowledgment_note,
+                "type": "escalation"  # Mark as escalation type
+            }, latest_escalation.escalated_at if latest_escalation else None))
+
+        # Last update per paused ticket (shows why it's paused), in one query
+        last_updates = {}
+        if paused_tickets:
+            latest = db.query(
+                TicketUpdate.ticket_id, func.max(TicketUpdate.created_at).label("created_at")
+            ).filter(
+                TicketUpdate.ticket_id.in_([ticket.id for ticket in paused_tickets])
+            ).group_by(TicketUpdate.ticket_id).subquery()
+            for ticket_id, update_text in db.query(TicketUpdate.ticket_id, TicketUpdate.update_text).join(
+                latest, and_(TicketUpdate.ticket_id == latest.c.ticket_id, TicketUpdate.created_at == latest.c.created_at)
+            ):
+                last_updates[ticket_id] = update_text
+
+        # (entry, paused since)
+        paused = []
+        for ticket in paused_tickets:
+            waiting_reason = last_updates.get(ticket.id) or "Waiting for external response"
+
+            paused.append(({
+                "id": ticket.id,
+                "ticket_id": ticket.id,
+                "ticket_number": ticket.ticket_number,
+                "title": ticket.problem_summary,
+                "problem_summary": ticket.problem_summary,
+                "priority": ticket.priority.value,
+                "status": ticket.status,
+                "category": "General Support",
+                "sla_status": "Paused",  # Custom status for paused tickets
+                "requires_update": False,
+                "assignee_name": ticket.assignee_name or "Unassigned",
+                "assignee_id": ticket.assignee_id,
+                "reported_by_name": ticket.user_name,
+                "reported_by_email": ticket.user_email,
+                "user_name": ticket.user_name,
+                "user_email": ticket.user_email,
+                "escalation_reason": f"⏸️ SLA Paused - {waiting_reason}",
+                "escalated_at": ticket.updated_at,  # When it was paused
+                "time_since_escalation": None,
+                "previous_priority": None,
+                "created_at": ticket.created_at,
+                "sla_deadline": ticket.sla_deadline,
+                "sla_paused_minutes": ticket.sla_paused_minutes,  # Show remaining time
+                "gm_acknowledged": False,  # Paused tickets don't need acknowledgment
+                "acknowledged_by": None,
+                "acknowledged_at": None,
+                "acknowledgment_note": None,
+                "type": "paused"  # Mark as paused type
+            }, ticket.updated_at))
+
+        logger.debug(f"Escalation snapshot built at version {version}: {len(active)} escalated, {len(paused)} paused")
+        return {"version": version, "active": active, "paused": paused}
+
+
+# Singleton instance
+escalation_snapshot = EscalationSnapshot()
+
+cluster_channel.on_invalidate(SNAPSHOT_NAME, escalation_snapshot.clear)
@@ -0,0 +1,192 @@
+"""
+In-process event bus for live dashboard updates
+
+Ticket routes, escalation routes and the SLA monitor publish small events
+(ticket id/number, status, priority, assignee) after they commit. Each open
+Server-Sent Events connection holds a Subscription with its own bounded
+queue; events are filtered per subscriber so technicians only receive
+events for tickets assigned (or previously assigned) to them.
+
+Publishing is thread-safe: sync route handlers run in the threadpool, so
+events are handed to each subscriber's event loop with
+call_soon_threadsafe. Recent events are kept in a ring buffer so a
+reconnecting client can resume from its Last-Event-ID.
+
+With several processes (CLUSTER_CHANNEL_ENABLED), events travel through the
+cluster channel instead: every process - the publisher included - fans out
+each event when it arrives, and the channel's message id is the event id,
+so a client can resume on whichever worker it reconnects to.
+"""
+from collections import deque
+from datetime import datetime
+from typing import Iterable, List, Optional
+from app.config import settings
+from app.services.cluster_channel import cluster_channel
+import asyncio
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Event types
+TICKET_CREATED = "ticket.created"
+TICKET_UPDATED = "ticket.updated"
+TICKET_DELETED = "ticket.deleted"
+TICKET_ESCALATED = "ticket.escalated"
+ESCALATION_ACKNOWLEDGED = "escalation.acknowledged"
+
+# Sent to a subscriber that fell behind or resumed from an expired event id
+RESYNC = "resync"
+
+# Roles that see every ticket event; technicians only see their own tickets
+ALL_TICKET_ROLES = {"admin", "helpdesk_officer", "ict_manager", "ict_gm"}
+
+# Cluster channel topic carrying events between processes
+EVENTS_TOPIC = "events"
+
+
+def _value(value):
+    """Enum members are published by value"""
+    return getattr(value, "value", value)
+
+
+def ticket_event_data(ticket, **extra) -> dict:
+    """Event payload for a ticket - small enough that clients fetch details themselves"""
+    return {
+        "ticket_id": ticket.id,
+        "ticket_number": ticket.ticket_number,
+        "status": _value(ticket.status),
+        "priority": _value(ticket.priority),
+        "assignee_id": ticket.assignee_id,
+        **extra
+    }
+
+
+class Subscription:
+    """One connected client: a bounded queue plus the filter for its role"""
+
+    def __init__(self, user_id: int, role: str, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.user_id = user_id
+        self.role = role
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+    def accepts(self, event: dict) -> bool:
+        if self.role in ALL_TICKET_ROLES:
+            return True
+        return self.user_id in event.get("assignee_ids", [])
+
+    def deliver(self, event: dict):
+        """Runs on the subscriber's loop"""
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog and tell the client to refetch instead
+            self.overflowed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait({"id": event["id"], "type": RESYNC})
+
+    async def next_event(self, timeout: float) -> Optional[dict]:
+        """Next event, or None after timeout (time for a heartbeat)"""
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event["type"] == RESYNC:
+            self.overflowed = False
+        return event
+
+
+class EventBus:
+    """Fan-out of ticket events to connected dashboards"""
+
+    def __init__(self, buffer_size: int = None, queue_size: int = None):
+        self.queue_size = queue_size or settings.EVENT_QUEUE_SIZE
+        self._recent = deque(maxlen=buffer_size or settings.EVENT_BUFFER_SIZE)
+        self._subscribers: List[Subscription] = []
+        # Ids start from the boot time so ids from a previous process are
+        # always older than anything buffered and force a resync
+        self._last_id = int(time.time() * 1000)
+        self._lock = threading.Lock()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(self, user_id: int, role: str, last_event_id: Optional[int] = None) -> Subscription:
+        """Register a subscriber on the running loop, replaying missed events if possible"""
+        sub = Subscription(user_id, role, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.append(sub)
+            if last_event_id is not None:
+                oldest = self._recent[0]["id"] if self._recent else self._last_id + 1
+                if last_event_id < oldest - 1 or last_event_id > self._last_id:
+                    # Missed events are no longer buffered
+                    sub.deliver({"id": last_event_id, "type": RESYNC})
+                else:
+                    for event in self._recent:
+                        if event["id"] > last_event_id and sub.accepts(event):
+                            sub.deliver(event)
+        return sub
+
+    def unsubscribe(self, sub: Subscription):
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def publish(self, event_type: str, data: dict, assignee_ids: Iterable[Optional[int]] = ()) -> dict:
+        """Publish an event to every subscriber allowed to see it (callable from any thread)"""
+        event = {
+            "type": event_type,
+            "assignee_ids": sorted({aid for aid in assignee_ids if aid}),
+            "timestamp": datetime.now().isoformat(),
+            "data": data
+        }
+        if cluster_channel.enabled:
+            # Delivered (with its id) when the channel hands it back - here and in every other process
+            cluster_channel.publish(EVENTS_TOPIC, event)
+            return event
+        return self._fan_out(event)
+
+    def receive(self, payload: dict, message_id: Optional[int]):
+        """Cluster channel handler: fan out an event published by any process"""
+        self._fan_out(dict(payload), message_id)
+
+    def _fan_out(self, event: dict, event_id: Optional[int] = None) -> dict:
+        """Number (or adopt the channel's id for), buffer and deliver an event"""
+        with self._lock:
+            self._last_id = event_id if event_id is not None else self._last_id + 1
+            event["id"] = self._last_id
+            self._recent.append(event)
+            subscribers = list(self._subscribers)
+
+        for sub in subscribers:
+            if sub.accepts(event):
+                try:
+                    sub.loop.call_soon_threadsafe(sub.deliver, event)
+                except RuntimeError:
+                    # Loop already closed - the connection is going away
+                    self.unsubscribe(sub)
+        return event
+
+    def publish_ticket(self, event_type: str, ticket, previous_assignee_id: Optional[int] = None, **extra) -> dict:
+        """Publish an event describing a ticket (ORM object or row with the same attributes)"""
+        return self.publish(
+            event_type,
+            ticket_event_data(ticket, **extra),
+            assignee_ids=(ticket.assignee_id, previous_assignee_id)
+        )
+
+    def publish_tickets(self, event_type: str, tickets: Iterable, **extra):
+        for ticket in tickets:
+            self.publish_ticket(event_type, ticket, **extra)
+
+
+# Singleton instance
+event_bus = EventBus()
+cluster_channel.subscribe(EVENTS_TOPIC, event_bus.receive)
@@ -0,0 +1,142 @@
+"""
+Request metrics - latency histograms, DB usage and slow request capture
+
+The profiling middleware (app.utils.profiling) hands every finished request
+to `request_metrics.record()`. Aggregates are kept per route template, so
+/api/tickets/NDB-0001 and /api/tickets/NDB-0002 share one series. Slow or
+N+1-looking requests are also kept, with their SQL, in a bounded ring buffer
+for the admin debug endpoint.
+"""
+from collections import defaultdict, deque
+from threading import Lock
+from typing import List, Optional
+from app.config import settings
+from app.utils.timezone import get_sa_time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Histogram buckets in seconds (Prometheus convention)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 250)
+
+
+class Histogram:
+    """Cumulative bucket counts plus sum, as Prometheus expects"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """Thread-safe aggregate of request profiles"""
+
+    def __init__(self, buffer_size: int = 100):
+        self._lock = Lock()
+        self.latency = defaultdict(lambda: Histogram(LATENCY_BUCKETS))  # (method, route, status)
+        self.queries = defaultdict(lambda: Histogram(QUERY_COUNT_BUCKETS))  # (method, route)
+        self.db_seconds = defaultdict(float)  # (method, route)
+        self.slow_queries = defaultdict(int)  # (method, route)
+        self.n_plus_one = defaultdict(int)  # (method, route)
+        self.slow_requests = deque(maxlen=buffer_size)
+
+    def record(self, method: str, route: str, status: int, duration: float, profile):
+        """Fold one finished request into the aggregates"""
+        repeated = profile.repeated_statements(settings.N_PLUS_ONE_THRESHOLD)
+        with self._lock:
+            self.latency[(method, route, status)].observe(duration)
+            self.queries[(method, route)].observe(profile.query_count)
+            self.db_seconds[(method, route)] += profile.db_time
+            self.slow_queries[(method, route)] += len(profile.slow_queries)
+            if repeated:
+                self.n_plus_one[(method, route)] += 1
+
+        if duration * 1000 >= settings.SLOW_REQUEST_MS or repeated or profile.slow_queries:
+            entry = {
+                "at": get_sa_time().isoformat(),
+                "method": method,
+                "route": route,
+                "path": profile.path,
+                "status": status,
+                "duration_ms": round(duration * 1000, 1),
+                "query_count": profile.query_count,
+                "db_time_ms": round(profile.db_time * 1000, 1),
+                "slow_queries": profile.slow_queries,
+                "repeated_statements": repeated
+            }
+            with self._lock:
+                self.slow_requests.append(entry)
+            logger.warning(
+                f"Slow request {method} {profile.path}: {entry['duration_ms']}ms, "
+                f"{profile.query_count} queries ({entry['db_time_ms']}ms in DB)"
+                + (f", {len(repeated)} repeated statement(s) - possible N+1" if repeated else "")
+            )
+
+    def recent_slow_requests(self, limit: Optional[int] = None) -> List[dict]:
+        """Newest first"""
+        with self._lock:
+            entries = list(self.slow_requests)
+        entries.reverse()
+        return entries[:limit] if limit else entries
+
+    def render_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format (version 0.0.4)"""
+        lines = []
+        with self._lock:
+            lines += self._histogram_lines(
+                "helpdesk_http_request_duration_seconds",
+                "HTTP request latency by route template",
+                self.latency,
+                ("method", "route", "status")
+            )
+            lines += self._histogram_lines(
+                "helpdesk_db_queries_per_request",
+                "Database statements executed per request",
+                self.queries,
+                ("method", "route")
+            )
+            for name, help_text, values in (
+                ("helpdesk_db_time_seconds_total", "Time spent executing database statements", self.db_seconds),
+                ("helpdesk_slow_queries_total", f"Statements slower than {settings.SLOW_QUERY_MS}ms", self.slow_queries),
+                ("helpdesk_n_plus_one_requests_total", "Requests that repeated one statement at least "
+                    f"{settings.N_PLUS_ONE_THRESHOLD} times", self.n_plus_one),
+            ):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, route), value in sorted(values.items()):
+                    lines.append(f"{name}{prometheus_labels(method=method, route=route)} {value}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(name: str, help_text: str, series: dict, label_names) -> list:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for key, histogram in sorted(series.items()):
+            labels = dict(zip(label_names, key))
+            for bound, count in zip(histogram.buckets, histogram.counts):
+                lines.append(f"{name}_bucket{prometheus_labels(**labels, le=bound)} {count}")
+            lines.append(f"{name}_bucket{prometheus_labels(**labels, le='+Inf')} {histogram.total}")
+            lines.append(f"{name}_sum{prometheus_labels(**labels)} {histogram.sum}")
+            lines.append(f"{name}_count{prometheus_labels(**labels)} {histogram.total}")
+        return lines
+
+
+# Singleton instance
+request_metrics = RequestMetrics(buffer_size=settings.SLOW_REQUEST_BUFFER_SIZE)
@@ -0,0 +1,253 @@
+"""
+Full-text search index over tickets and ticket updates
+
+Two index tables are kept in sync by database triggers, so every write path
+(ORM, bulk SQL, admin scripts) updates the index without extra code:
+- ticket_search: one row per ticket (summary, description, user name/email)
+- ticket_update_search: one row per TicketUpdate (update_text)
+
+SQLite uses FTS5 virtual tables ranked with bm25(); Postgres uses tsvector
+columns with GIN indexes ranked with ts_rank().
+"""
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Relative weight of each ticket column (summary matters most)
+SQLITE_TICKET_WEIGHTS = "10.0, 4.0, 2.0, 2.0"
+
+SQLITE_DDL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ticket_search USING fts5(
+        problem_summary, problem_description, user_name, user_email,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS ticket_update_search USING fts5(
+        ticket_id UNINDEXED, is_internal UNINDEXED, update_text,
+        tokenize = 'porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_search_ai AFTER INSERT ON tickets BEGIN
+        INSERT INTO ticket_search (rowid, problem_summary, problem_description, user_name, user_email)
+        VALUES (new.id, new.problem_summary, coalesce(new.problem_description, ''), new.user_name, new.user_email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_search_au
+    AFTER UPDATE OF problem_summary, problem_description, user_name, user_email ON tickets BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id;
+        INSERT INTO ticket_search (rowid, problem_summary, problem_description, user_name, user_email)
+        VALUES (new.id, new.problem_summary, coalesce(new.problem_description, ''), new.user_name, new.user_email);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tickets_search_ad AFTER DELETE ON tickets BEGIN
+        DELETE FROM ticket_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ticket_updates_search_ai AFTER INSERT ON ticket_updates BEGIN
+        INSERT INTO ticket_update_search (rowid, ticket_id, is_internal, update_text)
+        VALUES (new.id, new.ticket_id, coalesce(new.is_internal, 0), new.update_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ticket_updates_search_au AFTER UPDATE OF update_text, is_internal ON ticket_updates BEGIN
+        DELETE FROM ticket_update_search WHERE rowid = old.id;
+        INSERT INTO ticket_update_search (rowid, ticket_id, is_internal, update_text)
+        VALUES (new.id, new.ticket_id, coalesce(new.is_internal, 0), new.update_text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS ticket_updates_search_ad AFTER DELETE ON ticket_updates BEGIN
+        DELETE FROM ticket_update_search WHERE rowid = old.id;
+    END
+    """,
+]
+
+POSTGRES_TICKET_DOCUMENT = """
+    setweight(to_tsvector('english', coalesce({row}.problem_summary, '')), 'A') ||
+    setweight(to_tsvector('english', coalesce({row}.problem_description, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce({row}.user_name, '') || ' ' || coalesce({row}.user_email, '')), 'C')
+"""
+
+POSTGRES_UPDATE_DOCUMENT = "setweight(to_tsvector('english', coalesce({row}.update_text, '')), 'D')"
+
+POSTGRES_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS ticket_search (
+        ticket_id INTEGER PRIMARY KEY,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_ticket_search_document ON ticket_search USING gin (document)",
+    """
+    CREATE TABLE IF NOT EXISTS ticket_update_search (
+        update_id INTEGER PRIMARY KEY,
+        ticket_id INTEGER NOT NULL,
+        is_internal INTEGER NOT NULL DEFAULT 0,
+        document TSVECTOR NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_ticket_update_search_document ON ticket_update_search USING gin (document)",
+    f"""
+    CREATE OR REPLACE FUNCTION ticket_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM ticket_search WHERE ticket_id = OLD.id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO ticket_search (ticket_id, document)
+        VALUES (NEW.id, {POSTGRES_TICKET_DOCUMENT.format(row='NEW')})
+        ON CONFLICT (ticket_id) DO UPDATE SET document = EXCLUDED.document;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    f"""
+    CREATE OR REPLACE FUNCTION ticket_update_search_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            DELETE FROM ticket_update_search WHERE update_id = OLD.id;
+            RETURN OLD;
+        END IF;
+        INSERT INTO ticket_update_search (update_id, ticket_id, is_internal, document)
+        VALUES (NEW.id, NEW.ticket_id, coalesce(NEW.is_internal, 0), {POSTGRES_UPDATE_DOCUMENT.format(row='NEW')})
+        ON CONFLICT (update_id) DO UPDATE SET is_internal = EXCLUDED.is_internal, document = EXCLUDED.document;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS tickets_search_sync ON tickets",
+    """
+    CREATE TRIGGER tickets_search_sync
+    AFTER INSERT OR DELETE OR UPDATE OF problem_summary, problem_description, user_name, user_email ON tickets
+    FOR EACH ROW EXECUTE FUNCTION ticket_search_sync()
+    """,
+    "DROP TRIGGER IF EXISTS ticket_updates_search_sync ON ticket_updates",
+    """
+    CREATE TRIGGER ticket_updates_search_sync
+    AFTER INSERT OR DELETE OR UPDATE OF update_text, is_internal ON ticket_updates
+    FOR EACH ROW EXECUTE FUNCTION ticket_update_search_sync()
+    """,
+]
+
+
+class TicketSearchIndex:
+    """Trigger-maintained inverted index over tickets and their updates"""
+
+    def install(self, engine: Engine):
+        """Create index tables and sync triggers (idempotent)"""
+        statements = POSTGRES_DDL if engine.dialect.name == "postgresql" else SQLITE_DDL
+        with engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+        logger.info("Ticket search index installed")
+
+    def rebuild(self, engine: Engine):
+        """Repopulate the index from tickets and ticket_updates"""
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM ticket_search"))
+            conn.execute(text("DELETE FROM ticket_update_search"))
+
+            if engine.dialect.name == "postgresql":
+                conn.execute(text(
+                    f"INSERT INTO ticket_search (ticket_id, document) "
+                    f"SELECT t.id, {POSTGRES_TICKET_DOCUMENT.format(row='t')} FROM tickets t"
+                ))
+                conn.execute(text(
+                    f"INSERT INTO ticket_update_search (update_id, ticket_id, is_internal, document) "
+                    f"SELECT u.id, u.ticket_id, coalesce(u.is_internal, 0), {POSTGRES_UPDATE_DOCUMENT.format(row='u')} "
+                    f"FROM ticket_updates u"
+                ))
+            else:
+                conn.execute(text(
+                    "INSERT INTO ticket_search (rowid, problem_summary, problem_description, user_name, user_email) "
+                    "SELECT id, problem_summary, coalesce(problem_description, ''), user_name, user_email FROM tickets"
+                ))
+                conn.execute(text(
+                    "INSERT INTO ticket_update_search (rowid, ticket_id, is_internal, update_text) "
+                    "SELECT id, ticket_id, coalesce(is_internal, 0), update_text FROM ticket_updates"
+                ))
+        logger.info("Ticket search index rebuilt")
+
+    @staticmethod
+    def tokenize(query: str) -> List[str]:
+        """Split free text into search terms, dropping query-syntax characters"""
+        return [token.lower() for token in TOKEN_PATTERN.findall(query or "")]
+
+    def search(
+        self,
+        db: Session,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        include_internal: bool = False,
+        assignee_id: Optional[int] = None
+    ) -> Tuple[List[Tuple[int, float]], int]:
+        """Return ([(ticket_id, score)], total_matches), best matches first
+
+        Every term must match (as a prefix) within the ticket itself or
+        within a single update. Higher scores are better on both backends.
+        With assignee_id only tickets assigned to that user are matched.
+        """
+        tokens = self.tokenize(query)
+        if not tokens:
+            return [], 0
+
+        internal_filter = "" if include_internal else "AND is_internal = 0"
+
+        if db.bind.dialect.name == "postgresql":
+            params = {"q": " & ".join(f"{token}:*" for token in tokens)}
+            matches = f"""
+                SELECT ticket_id, ts_rank(document, to_tsquery('english', :q)) AS score
+                FROM ticket_search WHERE document @@ to_tsquery('english', :q)
+                UNION ALL
+                SELECT ticket_id, ts_rank(document, to_tsquery('english', :q)) AS score
+                FROM ticket_update_search WHERE document @@ to_tsquery('english', :q) {internal_filter}
+            """
+        else:
+            params = {"q": " AND ".join(f'"{token}"*' for token in tokens)}
+            # bm25() is lower-is-better; negate so both backends sort descending
+            matches = f"""
+                SELECT rowid AS ticket_id, -bm25(ticket_search, {SQLITE_TICKET_WEIGHTS}) AS score
+                FROM ticket_search WHERE ticket_search MATCH :q
+                UNION ALL
+                SELECT CAST(ticket_id AS INTEGER) AS ticket_id, -bm25(ticket_update_search) AS score
+                FROM ticket_update_search WHERE ticket_update_search MATCH :q {internal_filter}
+            """
+
+        scope_filter = ""
+        if assignee_id is not None:
+            scope_filter = "WHERE ticket_id IN (SELECT id FROM tickets WHERE assignee_id = :assignee_id)"
+            params["assignee_id"] = assignee_id
+
+        ranked = db.execute(
+            text(f"""
+                SELECT ticket_id, MAX(score) AS score FROM ({matches}) AS matches {scope_filter}
+                GROUP BY ticket_id ORDER BY score DESC, ticket_id DESC
+                LIMIT :limit OFFSET :offset
+            """),
+            {**params, "limit": limit, "offset": offset}
+        ).all()
+
+        total = db.execute(
+            text(f"SELECT COUNT(DISTINCT ticket_id) FROM ({matches}) AS matches {scope_filter}"),
+            params
+        ).scalar()
+
+        return [(row.ticket_id, float(row.score)) for row in ranked], total
+
+
+# Singleton instance
+ticket_search = TicketSearchIndex()
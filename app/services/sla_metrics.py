@@ -0,0 +1,182 @@
+"""
+SLA monitor metrics - per-cycle statistics, detection lag and notification health
+
+`SLAMonitor.check_sla_breaches` opens an SLACycle, reports what it did and
+closes it; the finished cycle is folded into cumulative counters and
+histograms and kept in a short history. Detection lag is the time between a
+ticket's sla_deadline and the cycle that marked it breached - with the
+default one-minute scan interval it should stay under ~60s, and growth means
+cycles are running late or taking too long.
+"""
+from collections import defaultdict, deque
+from threading import Lock
+from typing import List, Optional
+from app.services.request_metrics import Histogram, prometheus_labels
+from app.utils.timezone import get_sa_time
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+CYCLE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LAG_BUCKETS = (5, 15, 30, 60, 90, 120, 300, 600, 1800)
+NOTIFICATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class SLACycle:
+    """What one monitor run scanned, changed and sent"""
+
+    def __init__(self):
+        self.started_at = get_sa_time()
+        self.started_epoch = time.time()
+        self._started = time.perf_counter()
+        self.duration = 0.0
+        self.scanned = 0
+        self.transitions = defaultdict(int)  # on_track / at_risk / breached / escalated
+        self.detection_lags = []  # Seconds past sla_deadline when the breach was processed
+        self.notifications_queued = 0  # Handed to the delivery loop; sent/failed fill in as they go out
+        self.notifications_sent = 0
+        self.notifications_failed = 0
+        self.error: Optional[str] = None
+
+    def transition(self, kind: str):
+        self.transitions[kind] += 1
+
+    def finish(self):
+        self.duration = time.perf_counter() - self._started
+
+    def summary(self) -> dict:
+        return {
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration * 1000, 1),
+            "scanned": self.scanned,
+            "transitions": dict(self.transitions),
+            "max_detection_lag_seconds": round(max(self.detection_lags), 1) if self.detection_lags else None,
+            "notifications_queued": self.notifications_queued,
+            "notifications_sent": self.notifications_sent,
+            "notifications_failed": self.notifications_failed,
+            "error": self.error
+        }
+
+
+class SLAMonitorMetrics:
+    """Thread-safe cumulative SLA monitor metrics"""
+
+    def __init__(self, history_size: int = 60):
+        self._lock = Lock()
+        self.cycles = 0
+        self.cycle_errors = 0
+        self.scanned_total = 0
+        self.transitions = defaultdict(int)
+        self.cycle_duration = Histogram(CYCLE_BUCKETS)
+        self.detection_lag = Histogram(LAG_BUCKETS)
+        self.notification_latency = defaultdict(lambda: Histogram(NOTIFICATION_BUCKETS))  # channel
+        self.notification_failures = defaultdict(int)  # channel
+        self.last_cycle: Optional[SLACycle] = None
+        self.history = deque(maxlen=history_size)
+
+    def start_cycle(self) -> SLACycle:
+        return SLACycle()
+
+    def finish_cycle(self, cycle: SLACycle):
+        cycle.finish()
+        with self._lock:
+            self.cycles += 1
+            self.cycle_errors += 1 if cycle.error else 0
+            self.scanned_total += cycle.scanned
+            for kind, count in cycle.transitions.items():
+                self.transitions[kind] += count
+            self.cycle_duration.observe(cycle.duration)
+            for lag in cycle.detection_lags:
+                self.detection_lag.observe(lag)
+            self.last_cycle = cycle
+            self.history.append(cycle)  # Summarized on read, so notifications delivered later still count
+
+        logger.info(
+            f"SLA cycle: scanned {cycle.scanned} tickets in {cycle.duration * 1000:.0f}ms, "
+            f"transitions {dict(cycle.transitions) or 'none'}, "
+            f"notifications {cycle.notifications_queued} queued, {cycle.notifications_sent} sent / "
+            f"{cycle.notifications_failed} failed"
+        )
+
+    def record_notification(self, cycle: Optional[SLACycle], channel: str, duration: float, ok: bool):
+        with self._lock:
+            self.notification_latency[channel].observe(duration)
+            if not ok:
+                self.notification_failures[channel] += 1
+        if cycle is not None:
+            if ok:
+                cycle.notifications_sent += 1
+            else:
+                cycle.notifications_failed += 1
+
+    def recent_cycles(self, limit: Optional[int] = None) -> List[dict]:
+        """Newest first"""
+        with self._lock:
+            entries = list(self.history)
+        entries.reverse()
+        return [cycle.summary() for cycle in (entries[:limit] if limit else entries)]
+
+    def render_prometheus(self) -> str:
+        """SLA monitor metrics in the Prometheus text exposition format"""
+        with self._lock:
+            lines = [
+                "# HELP helpdesk_sla_cycles_total SLA monitor runs",
+                "# TYPE helpdesk_sla_cycles_total counter",
+                f"helpdesk_sla_cycles_total {self.cycles}",
+                "# HELP helpdesk_sla_cycle_errors_total SLA monitor runs that failed and rolled back",
+                "# TYPE helpdesk_sla_cycle_errors_total counter",
+                f"helpdesk_sla_cycle_errors_total {self.cycle_errors}",
+                "# HELP helpdesk_sla_tickets_scanned_total Tickets evaluated across all runs",
+                "# TYPE helpdesk_sla_tickets_scanned_total counter",
+                f"helpdesk_sla_tickets_scanned_total {self.scanned_total}",
+                "# HELP helpdesk_sla_transitions_total SLA status changes and escalations",
+                "# TYPE helpdesk_sla_transitions_total counter",
+            ]
+            lines += [
+                f"helpdesk_sla_transitions_total{prometheus_labels(transition=kind)} {count}"
+                for kind, count in sorted(self.transitions.items())
+            ]
+            lines += self._histogram(
+                "helpdesk_sla_cycle_duration_seconds", "Wall time of one SLA monitor run", self.cycle_duration
+            )
+            lines += self._histogram(
+                "helpdesk_sla_detection_lag_seconds", "Time from sla_deadline until the breach was processed",
+                self.detection_lag
+            )
+            lines += [
+                "# HELP helpdesk_sla_notification_seconds Send latency of SLA notifications",
+                "# TYPE helpdesk_sla_notification_seconds histogram",
+            ]
+            for channel, histogram in sorted(self.notification_latency.items()):
+                lines += self._histogram("helpdesk_sla_notification_seconds", None, histogram, channel=channel)
+            lines += [
+                "# HELP helpdesk_sla_notification_failures_total SLA notifications that failed to send",
+                "# TYPE helpdesk_sla_notification_failures_total counter",
+            ]
+            lines += [
+                f"helpdesk_sla_notification_failures_total{prometheus_labels(channel=channel)} {count}"
+                for channel, count in sorted(self.notification_failures.items())
+            ]
+            if self.last_cycle is not None:
+                lines += [
+                    "# HELP helpdesk_sla_last_cycle_timestamp_seconds Start of the most recent SLA monitor run",
+                    "# TYPE helpdesk_sla_last_cycle_timestamp_seconds gauge",
+                    f"helpdesk_sla_last_cycle_timestamp_seconds {self.last_cycle.started_epoch}",
+                ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram(name: str, help_text: Optional[str], histogram: Histogram, **labels) -> list:
+        lines = [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"] if help_text else []
+        for bound, count in zip(histogram.buckets, histogram.counts):
+            lines.append(f"{name}_bucket{prometheus_labels(**labels, le=bound)} {count}")
+        lines.append(f"{name}_bucket{prometheus_labels(**labels, le='+Inf')} {histogram.total}")
+        suffix = prometheus_labels(**labels) if labels else ""
+        lines.append(f"{name}_sum{suffix} {histogram.sum}")
+        lines.append(f"{name}_count{suffix} {histogram.total}")
+        return lines
+
+
+# Singleton instance
+sla_metrics = SLAMonitorMetrics()
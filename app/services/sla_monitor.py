@@ -1,6 +1,6 @@
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timedelta
+from app.config import settings
 from app.database import SessionLocal
 from app.models.ticket import Ticket, TicketStatus, TicketPriority, SLAStatus, SLAEscalation
 from app.models.audit_log import AuditLog
@@ -8,74 +8,205 @@ from app.models.user import UserRole
 from app.utils.ticket_helpers import is_sla_breached, is_sla_warning, get_next_priority, calculate_sla_deadline
 from app.services.email_service import EmailService
 from app.services.whatsapp_service import whatsapp_service
+from app.services.escalation_snapshot import escalation_snapshot
+from app.services.event_bus import event_bus, ticket_event_data, TICKET_UPDATED, TICKET_ESCALATED
+from app.services.sla_metrics import sla_metrics, SLACycle
+from typing import Optional
+import asyncio
+import inspect
 import logging
-import json
+import time
 
 logger = logging.getLogger(__name__)
 
+# What the scan reads for every open ticket; full Ticket instances are loaded only for those that change
+SLA_SCAN_COLUMNS = (Ticket.id, Ticket.sla_deadline, Ticket.sla_status)
+
+SCAN_LOAD_BATCH = 500
+
+
+def sla_status_at(sla_deadline: datetime, now: datetime) -> SLAStatus:
+    """SLA status of a ticket with this deadline at `now` - at risk within 2 minutes of it"""
+    time_remaining = (sla_deadline - now).total_seconds() / 60  # in minutes
+    if time_remaining <= 0:
+        return SLAStatus.BREACHED
+    if time_remaining <= 2:
+        return SLAStatus.AT_RISK
+    return SLAStatus.ON_TRACK
+
 
 class SLAMonitor:
     """Background service to monitor SLA deadlines and trigger escalations"""
     
-    def __init__(self):
-        self.scheduler = AsyncIOScheduler()
+    def __init__(self, interval_seconds: int = None):
+        self._scheduler = None
+        self.interval_seconds = interval_seconds or settings.SLA_SCAN_INTERVAL_SECONDS
+        self.cycle: Optional[SLACycle] = None  # Run in progress, for notification metrics
+        self.notifications: Optional[asyncio.Queue] = None  # (cycle, channel, send, args, kwargs)
+        self._delivery: Optional[asyncio.Task] = None
+    
+    @property
+    def scheduler(self):
+        """APScheduler instance, created on first use - web workers that leave scanning to the SLA worker never import it"""
+        if self._scheduler is None:
+            from apscheduler.schedulers.asyncio import AsyncIOScheduler
+            self._scheduler = AsyncIOScheduler()
+        return self._scheduler
     
     def start(self):
-        """Start the SLA monitoring scheduler"""
-        # Run every minute
+        """Start the SLA monitoring scheduler and the notification delivery loop (inside a running event loop)"""
         self.scheduler.add_job(
             self.check_sla_breaches,
             'interval',
-            minutes=1,
+            seconds=self.interval_seconds,
             id='sla_monitor',
             replace_existing=True
         )
         self.scheduler.start()
-        logger.info("SLA Monitor started - checking every minute")
+        self.notifications = asyncio.Queue()
+        self._delivery = asyncio.create_task(self.deliver_notifications())
+        logger.info(f"SLA Monitor started - checking every {self.interval_seconds}s")
     
     def stop(self):
-        """Stop the scheduler"""
-        self.scheduler.shutdown()
+        """Stop the scheduler and the delivery loop; queued notifications are dropped (see shutdown)"""
+        if self._scheduler is not None and self._scheduler.running:
+            self._scheduler.shutdown(wait=False)
+        if self._delivery is not None:
+            self._delivery.cancel()
+            self._delivery = None
+            if self.notifications.qsize():
+                logger.warning(f"{self.notifications.qsize()} SLA notifications dropped at shutdown")
         logger.info("SLA Monitor stopped")
     
+    async def shutdown(self, timeout: float = None):
+        """Graceful stop: no new scans, let a running scan finish, then send what it queued"""
+        timeout = settings.SLA_SHUTDOWN_TIMEOUT_SECONDS if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        if self._scheduler is not None and self._scheduler.running:
+            self._scheduler.pause()
+        while self.cycle is not None and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        if self._delivery is not None:
+            try:
+                await asyncio.wait_for(self.notifications.join(), max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                pass
+        self.stop()
+    
+    @property
+    def pending_notifications(self) -> int:
+        return self.notifications.qsize() if self._delivery is not None else 0
+    
     async def check_sla_breaches(self):
         """Check for SLA breaches and trigger escalations"""
+        cycle = self.cycle = sla_metrics.start_cycle()
         db = SessionLocal()
         try:
             # Get all open or in-progress tickets (EXCLUDE "Waiting on User" - SLA is paused)
-            tickets = db.query(Ticket).filter(
+            rows = db.query(*SLA_SCAN_COLUMNS).filter(
                 Ticket.status.in_([TicketStatus.OPEN, TicketStatus.IN_PROGRESS]),
                 Ticket.status != TicketStatus.WAITING_ON_USER  # ✅ SLA EXEMPT when waiting for parts/user
             ).all()
+            cycle.scanned = len(rows)
             
             now = datetime.now()  # ✅ FIXED: Use local time, not UTC
+            changed = []
+            
+            # Most tickets keep their status - only the ones that move are loaded as Ticket instances
+            moving = [row.id for row in rows if sla_status_at(row.sla_deadline, now) != row.sla_status]
+            tickets = []
+            for start in range(0, len(moving), SCAN_LOAD_BATCH):
+                tickets += db.query(Ticket).options(joinedload(Ticket.assignee)).filter(
+                    Ticket.id.in_(moving[start:start + SCAN_LOAD_BATCH])
+                ).order_by(Ticket.id).all()
             
             for ticket in tickets:
-                # Calculate time remaining
-                time_remaining = (ticket.sla_deadline - now).total_seconds() / 60  # in minutes
+                old_sla_status = ticket.sla_status
+                was_escalated = ticket.escalated
                 
                 # Update SLA status
-                if time_remaining <= 0:
+                new_sla_status = sla_status_at(ticket.sla_deadline, now)
+                if new_sla_status == SLAStatus.BREACHED:
                     # BREACHED
                     if ticket.sla_status != SLAStatus.BREACHED:
+                        # How long after the deadline this run picked the breach up
+                        cycle.detection_lags.append((datetime.now() - ticket.sla_deadline).total_seconds())
+                        cycle.transition("breached")
                         ticket.sla_status = SLAStatus.BREACHED
                         await self.handle_sla_breach(db, ticket)
-                elif time_remaining <= 2:
+                elif new_sla_status == SLAStatus.AT_RISK:
                     # AT RISK (within 2 minutes of deadline)
                     if ticket.sla_status != SLAStatus.AT_RISK:
+                        cycle.transition("at_risk")
                         ticket.sla_status = SLAStatus.AT_RISK
                         await self.handle_sla_warning(db, ticket)
                 else:
                     # ON TRACK
+                    if old_sla_status not in (None, SLAStatus.ON_TRACK):
+                        cycle.transition("on_track")
                     ticket.sla_status = SLAStatus.ON_TRACK
+                
+                # Only tickets whose SLA state moved are pushed to dashboards
+                if ticket.escalated and not was_escalated:
+                    cycle.transition("escalated")
+                    changed.append((TICKET_ESCALATED, ticket_event_data(ticket, sla_status=ticket.sla_status.value), ticket.assignee_id))
+                elif ticket.sla_status != old_sla_status:
+                    changed.append((TICKET_UPDATED, ticket_event_data(ticket, sla_status=ticket.sla_status.value), ticket.assignee_id))
             
             db.commit()
             
+            # Escalations created by handle_sla_breach are visible now - drop the cached escalation view
+            if cycle.transitions["escalated"]:
+                escalation_snapshot.invalidate()
+            
+            for event_type, data, assignee_id in changed:
+                event_bus.publish(event_type, data, assignee_ids=(assignee_id,))
+            
         except Exception as e:
             logger.error(f"Error in SLA monitoring: {str(e)}")
+            cycle.error = str(e)
             db.rollback()
         finally:
             db.close()
+            self.cycle = None
+            sla_metrics.finish_cycle(cycle)
+    
+    async def _notify(self, channel: str, send, *args, **kwargs):
+        """Queue a notification for the delivery loop, so a burst of escalations never holds up the scan.
+        Without a running loop (one-off calls to check_sla_breaches) it is sent straight away."""
+        if self._delivery is None:
+            await self._send(self.cycle, channel, send, args, kwargs)
+            return
+        if self.cycle is not None:
+            self.cycle.notifications_queued += 1
+        self.notifications.put_nowait((self.cycle, channel, send, args, kwargs))
+    
+    async def deliver_notifications(self):
+        """Send queued notifications one at a time, after the scan that queued them has committed"""
+        while True:
+            cycle, channel, send, args, kwargs = await self.notifications.get()
+            try:
+                await self._send(cycle, channel, send, args, kwargs)
+            except Exception as e:
+                logger.error(f"Failed to send SLA {channel} notification: {str(e)}")
+            finally:
+                self.notifications.task_done()
+    
+    async def _send(self, cycle: Optional[SLACycle], channel: str, send, args: tuple, kwargs: dict):
+        """Call a notification sender, recording its latency and outcome. Sync senders (Twilio)
+        run in a thread so they don't block the event loop."""
+        started = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(send):
+                result = await send(*args, **kwargs)
+            else:
+                result = await asyncio.to_thread(send, *args, **kwargs)
+        except Exception:
+            sla_metrics.record_notification(cycle, channel, time.perf_counter() - started, ok=False)
+            raise
+        # Senders that swallow their own errors report them by returning False
+        sla_metrics.record_notification(cycle, channel, time.perf_counter() - started, ok=result is not False)
+        return result
     
     async def handle_sla_breach(self, db: Session, ticket: Ticket):
         """Handle SLA breach - escalate ticket with forced update requirement"""
@@ -119,7 +250,7 @@ class SLAMonitor:
             entity_id=ticket.id,
             action='sla_escalated',
             performed_by_id=None,  # System action
-            details=json.dumps({
+            details={
                 'ticket_number': ticket.ticket_number,
                 'old_priority': old_priority,
                 'new_priority': new_priority.value,
@@ -128,7 +259,7 @@ class SLAMonitor:
                 'reason': 'SLA deadline exceeded',
                 'requires_update': True,
                 'escalated_to': ['assignee', 'ict_manager', 'ict_gm']
-            })
+            }
         )
         db.add(audit_log)
         
@@ -157,14 +288,16 @@ class SLAMonitor:
         try:
             # Email to assignee
             if ticket.assignee:
-                await EmailService.send_sla_escalation(ticket_data, escalation.escalation_reason)
+                await self._notify("email", EmailService.send_sla_escalation, ticket_data, escalation.escalation_reason)
                 # WhatsApp to assignee
-                whatsapp_service.send_sla_escalation(ticket_data, escalation.escalation_reason)
+                await self._notify("whatsapp", whatsapp_service.send_sla_escalation, ticket_data, escalation.escalation_reason)
             
             # Email to Manager
             if manager:
                 manager_data = {**ticket_data, 'recipient_email': manager.email, 'recipient_name': manager.name}
-                await EmailService.send_email(
+                await self._notify(
+                    "email",
+                    EmailService.send_email,
                     to_email=manager.email,
                     subject=f"🚨 SLA BREACH ALERT - {ticket.ticket_number}",
                     body=f"""
@@ -182,7 +315,9 @@ class SLAMonitor:
             
             # Email to GM
             if gm:
-                await EmailService.send_email(
+                await self._notify(
+                    "email",
+                    EmailService.send_email,
                     to_email=gm.email,
                     subject=f"🚨 EXECUTIVE ALERT: SLA BREACH - {ticket.ticket_number}",
                     body=f"""
@@ -199,10 +334,10 @@ class SLAMonitor:
                     """
                 )
             
-            logger.info(f"Escalation notifications sent for {ticket.ticket_number}")
+            logger.info(f"Escalation notifications queued for {ticket.ticket_number}")
             
         except Exception as e:
-            logger.error(f"Failed to send escalation notifications: {str(e)}")
+            logger.error(f"Failed to queue escalation notifications: {str(e)}")
     
     async def handle_sla_warning(self, db: Session, ticket: Ticket):
         """Handle SLA warning - send pre-expiry alert (2 minutes before deadline)"""
@@ -215,7 +350,9 @@ class SLAMonitor:
         # Send warning notification to assignee
         if ticket.assignee:
             try:
-                await EmailService.send_email(
+                await self._notify(
+                    "email",
+                    EmailService.send_email,
                     to_email=ticket.assignee.email,
                     subject=f"⏰ SLA WARNING - {ticket.ticket_number} - 2 Minutes Remaining",
                     body=f"""
@@ -230,12 +367,14 @@ class SLAMonitor:
                 )
                 
                 # WhatsApp alert
-                whatsapp_service.send_message(
+                await self._notify(
+                    "whatsapp",
+                    whatsapp_service.send_message,
                     to_number=ticket.assignee.phone,
                     message=f"⏰ SLA ALERT: Ticket {ticket.ticket_number} has less than 2 minutes remaining! Update immediately to avoid escalation."
                 )
                 
-                logger.info(f"✅ SLA warning sent for {ticket.ticket_number}")
+                logger.info(f"✅ SLA warning queued for {ticket.ticket_number}")
                 
             except Exception as e:
                 logger.error(f"❌ Failed to send SLA warning: {str(e)}")
@@ -0,0 +1,318 @@
+"""
+Bulk ticket import from CSV or JSON
+
+Rows are streamed from the source - CSV and JSON Lines line by line, a JSON
+array element by element - validated with TicketCreate and written
+in batches: ticket ids/numbers are allocated as a block per batch, tickets
+and their initial TicketUpdate rows are inserted with executemany, and the
+duplicate-detection index is filled in the same transaction. Per-ticket
+notifications are replaced by an optional digest per assignee.
+
+A row that cannot be parsed (a malformed JSONL line or CSV record) is
+reported like a row that fails validation, and the import goes on. When the
+rest of the file cannot be read at all (bad encoding, a broken JSON array)
+the import stops there: batches already written stay committed, and the
+report says at which row reading stopped.
+"""
+from sqlalchemy import insert, func, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from pydantic import ValidationError
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus
+from app.models.user import User
+from app.schemas.ticket import TicketCreate
+from app.utils.ticket_helpers import generate_ticket_number, calculate_sla_deadline
+from app.services.duplicate_detector import duplicate_detector
+from app.services.email_service import EmailService
+from app.services.event_bus import event_bus, TICKET_CREATED
+import csv
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+MAX_REPORTED_ERRORS = 100
+
+JSON_CHUNK_SIZE = 64 * 1024
+
+
+class UnreadableRow:
+    """Stands in for a row that could not be parsed, so it is reported and the import goes on"""
+
+    def __init__(self, error: str):
+        self.error = error
+
+
+def iter_json_array(stream: IO[str], chunk_size: int = JSON_CHUNK_SIZE) -> Iterator:
+    """Yield the elements of a top-level JSON array, reading the stream in chunks"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    eof = False
+
+    def fill() -> bool:
+        nonlocal buffer, position, eof
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buffer = buffer[position:] + chunk
+        position = 0
+        return True
+
+    def next_char() -> str:
+        """First non-whitespace character at or after position (reading more as needed), or '' at the end"""
+        nonlocal position
+        while True:
+            while position < len(buffer) and buffer[position].isspace():
+                position += 1
+            if position < len(buffer):
+                return buffer[position]
+            if not fill():
+                return ""
+
+    if next_char() != "[":
+        raise ValueError("JSON import must be an array of objects")
+    position += 1
+    if next_char() == "]":
+        return
+
+    while True:
+        next_char()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError as e:
+                # Most likely the element runs past the buffer - read on, unless there is nothing left
+                if eof or not fill():
+                    raise ValueError(f"Invalid JSON: {e.msg}")
+                continue
+            # A number cut off by the end of the buffer ("1.5e" of "1.5e3") decodes as a shorter one -
+            # only take the value once the character after it is a separator
+            if not eof and (end == len(buffer) or buffer[end] not in ",] \t\r\n") and fill():
+                continue
+            break
+        position = end
+        yield value
+
+        separator = next_char()
+        if separator == "]":
+            return
+        if separator != ",":
+            raise ValueError("Invalid JSON: expected ',' or ']' between array elements")
+        position += 1
+
+
+class TicketImporter:
+    """Validates and inserts tickets in batches"""
+
+    def __init__(self, batch_size: int = 500):
+        self.batch_size = batch_size
+
+    @staticmethod
+    def read_rows(stream: IO[str], fmt: str) -> Iterator[dict]:
+        """Yield raw rows from a text stream: csv, jsonl (one object per line) or json (array)"""
+        if fmt == "csv":
+            reader = csv.DictReader(stream)
+            while True:
+                try:
+                    row = next(reader)
+                except StopIteration:
+                    return
+                except csv.Error as e:
+                    yield UnreadableRow(f"Invalid CSV: {str(e)}")
+                    continue
+                # Empty CSV cells mean "not provided"
+                yield {k.strip(): (v.strip() if v and v.strip() else None) for k, v in row.items() if k}
+        elif fmt == "jsonl":
+            for line in stream:
+                if line.strip():
+                    try:
+                        yield json.loads(line)
+                    except ValueError as e:
+                        yield UnreadableRow(f"Invalid JSON: {str(e)}")
+        elif fmt == "json":
+            yield from iter_json_array(stream)
+        else:
+            raise ValueError(f"Unsupported import format: {fmt}")
+
+    def run(
+        self,
+        db: Session,
+        rows: Iterable[dict],
+        created_by: User,
+        notify: bool = False
+    ) -> Tuple[dict, List[dict]]:
+        """Import rows; returns (report, notification digests).
+
+        If the rows stop being readable, the rows read so far are still imported and
+        report["stopped_at_row"] is the first row that could not be read.
+        """
+        started = time.perf_counter()
+        report = {
+            "total_rows": 0,
+            "imported": 0,
+            "failed": 0,
+            "errors": [],
+            "first_ticket_number": None,
+            "last_ticket_number": None,
+            "stopped_at_row": None
+        }
+        assignees: Dict[int, Optional[User]] = {}
+        imported_by_assignee: Dict[int, List[dict]] = {}
+
+        batch = []
+        rows = iter(rows)
+        row_number = 0
+        while True:
+            row_number += 1
+            try:
+                raw = next(rows)
+            except StopIteration:
+                break
+            except (ValueError, UnicodeDecodeError, csv.Error) as e:
+                # Nothing after this point can be read - keep what was read before it
+                report["total_rows"] += 1
+                report["stopped_at_row"] = row_number
+                self._fail(report, row_number, f"Could not read the file from this row on: {str(e)}")
+                break
+
+            report["total_rows"] += 1
+            if isinstance(raw, UnreadableRow):
+                self._fail(report, row_number, raw.error)
+                continue
+            try:
+                ticket = TicketCreate.model_validate(raw)
+            except ValidationError as e:
+                self._fail(report, row_number, "; ".join(
+                    f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+                ))
+                continue
+
+            if ticket.assignee_id not in assignees:
+                assignees[ticket.assignee_id] = db.query(User).filter(User.id == ticket.assignee_id).first()
+            if not assignees[ticket.assignee_id]:
+                self._fail(report, row_number, f"assignee_id: user {ticket.assignee_id} does not exist")
+                continue
+
+            batch.append(ticket)
+            if len(batch) >= self.batch_size:
+                self._flush(db, batch, created_by, assignees, report, imported_by_assignee)
+                batch = []
+
+        if batch:
+            self._flush(db, batch, created_by, assignees, report, imported_by_assignee)
+
+        elapsed = time.perf_counter() - started
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["rows_per_second"] = round(report["imported"] / elapsed, 1) if elapsed > 0 else 0.0
+        logger.info(
+            f"Imported {report['imported']}/{report['total_rows']} tickets in {elapsed:.2f}s "
+            f"({report['rows_per_second']} rows/s)"
+        )
+
+        digests = []
+        if notify:
+            for assignee_id, tickets in imported_by_assignee.items():
+                assignee = assignees[assignee_id]
+                digests.append({
+                    "recipient_email": assignee.email,
+                    "recipient_name": assignee.name,
+                    "recipient_whatsapp": assignee.phone,
+                    "heading": "New Tickets Assigned",
+                    "intro": "The following imported tickets have been assigned to you.",
+                    "tickets": tickets
+                })
+
+        return report, digests
+
+    def _flush(self, db: Session, batch: List[TicketCreate], created_by: User, assignees: dict, report: dict, imported_by_assignee: dict):
+        """Insert one batch, retrying once with a fresh block if ids collide"""
+        for attempt in (1, 2):
+            try:
+                self._insert_batch(db, batch, created_by, assignees, report, imported_by_assignee)
+                return
+            except IntegrityError:
+                db.rollback()
+                if attempt == 2:
+                    raise
+                logger.warning("Ticket number block collided with a concurrent insert - reallocating")
+
+    def _insert_batch(self, db: Session, batch: List[TicketCreate], created_by: User, assignees: dict, report: dict, imported_by_assignee: dict):
+        # Allocate a contiguous block of ids (and therefore ticket numbers) for the batch
+        last_id = db.query(func.max(Ticket.id)).scalar() or 0
+        deadlines = {}
+
+        tickets = []
+        updates = []
+        signatures = []
+        for offset, ticket in enumerate(batch, start=1):
+            ticket_id = last_id + offset
+            if ticket.priority not in deadlines:
+                deadlines[ticket.priority] = calculate_sla_deadline(ticket.priority)
+
+            tickets.append({
+                "id": ticket_id,
+                "ticket_number": generate_ticket_number(ticket_id - 1),
+                "user_name": ticket.user_name,
+                "user_email": ticket.user_email,
+                "user_phone": ticket.user_phone,
+                "problem_summary": ticket.problem_summary,
+                "problem_description": ticket.problem_description,
+                "priority": ticket.priority,
+                "status": TicketStatus.OPEN,
+                "assignee_id": ticket.assignee_id,
+                "sla_deadline": deadlines[ticket.priority]
+            })
+            updates.append({
+                "ticket_id": ticket_id,
+                "update_text": f"Ticket imported and assigned to {assignees[ticket.assignee_id].name}",
+                "updated_by_id": created_by.id,
+                "new_status": TicketStatus.OPEN.value,
+                "new_priority": ticket.priority.value,
+                "new_assignee_id": ticket.assignee_id
+            })
+            signatures.append((ticket_id, ticket.problem_summary, ticket.problem_description))
+
+        # Core table inserts keep NULL descriptions in the same executemany batch
+        # (ORM bulk insert splits rows whose None-valued keys differ)
+        db.execute(insert(Ticket.__table__), tickets)
+        db.execute(insert(TicketUpdate.__table__), updates)
+        duplicate_detector.index_tickets(db, signatures)
+
+        if db.bind.dialect.name == "postgresql":
+            # Explicit ids bypass the sequence - move it past the block
+            db.execute(text("SELECT setval(pg_get_serial_sequence('tickets', 'id'), (SELECT MAX(id) FROM tickets))"))
+
+        db.commit()
+
+        report["imported"] += len(tickets)
+        report["first_ticket_number"] = report["first_ticket_number"] or tickets[0]["ticket_number"]
+        report["last_ticket_number"] = tickets[-1]["ticket_number"]
+
+        for row in tickets:
+            event_bus.publish(TICKET_CREATED, {
+                "ticket_id": row["id"],
+                "ticket_number": row["ticket_number"],
+                "status": TicketStatus.OPEN.value,
+                "priority": row["priority"].value,
+                "assignee_id": row["assignee_id"]
+            }, assignee_ids=(row["assignee_id"],))
+            imported_by_assignee.setdefault(row["assignee_id"], []).append({
+                "ticket_number": row["ticket_number"],
+                "problem_summary": row["problem_summary"],
+                "status": TicketStatus.OPEN.value,
+                "ticket_url": EmailService.get_ticket_url(row["ticket_number"])
+            })
+
+    @staticmethod
+    def _fail(report: dict, row_number: int, error: str):
+        report["failed"] += 1
+        if len(report["errors"]) < MAX_REPORTED_ERRORS:
+            report["errors"].append({"row": row_number, "error": error})
+
+
+# Singleton instance
+ticket_importer = TicketImporter()
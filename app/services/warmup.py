@@ -0,0 +1,162 @@
+"""
+Warm-start priming
+
+Right after a deploy nothing has run yet: the database's page cache is cold,
+SQLAlchemy has compiled none of the dashboard statements, the connection
+pools are empty and no email template is compiled, so the first dashboard
+loads are the slowest of the day. With WARMUP_ENABLED the app primes itself
+in the background at startup:
+
+- the dashboard reads - active technicians and workload, ticket lists and
+  badge summaries, the escalation view, KPI and statistics rollups - are
+  requested once through the app itself (in-process ASGI requests, as a
+  manager and as a technician), so the exact routes, statements and
+  serializers real viewers hit are exercised;
+- the asyncio engine opens its first connection;
+- the notification email templates are compiled.
+
+/health/ready answers 503 until this has finished, so a load balancer only
+sends traffic to warm instances; /health/live answers as soon as the process
+serves requests. A failed step is logged and recorded but never keeps the
+instance out of rotation.
+"""
+from typing import List, Optional
+from sqlalchemy import text
+from app.config import settings
+from app.database import SessionLocal
+from app.models.user import User, UserRole
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# (caller, path) - what the GM, manager, helpdesk and technician dashboards load first
+WARMUP_REQUESTS = [
+    ("manager", "/api/auth/users"),
+    ("manager", "/api/technicians/workload"),
+    ("manager", "/api/tickets"),
+    ("manager", "/api/tickets/summary"),
+    ("manager", "/api/escalations"),
+    ("manager", "/api/reports/kpis"),
+    ("manager", "/api/reports/statistics"),
+    ("technician", "/api/tickets?scope=mine"),
+    ("technician", "/api/tickets/summary?scope=mine"),
+]
+
+MANAGER_ROLES = [UserRole.ICT_GM, UserRole.ICT_MANAGER, UserRole.ADMIN]
+
+
+class StartupWarmer:
+    """Runs the warm-up once per process and reports readiness"""
+
+    def __init__(self):
+        self.state = "pending"  # pending / running / done / disabled
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: List[dict] = []
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state in ("done", "disabled")
+
+    def status(self) -> dict:
+        duration = None
+        if self.started_at is not None:
+            duration = round(((self.finished_at or time.perf_counter()) - self.started_at) * 1000, 1)
+        return {"state": self.state, "duration_ms": duration, "steps": self.steps}
+
+    def start(self, app):
+        """Schedule the warm-up on the running event loop (from the lifespan)"""
+        if not settings.WARMUP_ENABLED:
+            self.state = "disabled"
+            return
+        self._task = asyncio.create_task(self.run(app))
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def run(self, app):
+        self.state = "running"
+        self.started_at = time.perf_counter()
+        self.steps = []
+        logger.info("Warm-up started")
+
+        await self._step("async engine", self._open_async_engine)
+        await self._step("email templates", self._compile_templates)
+        tokens = await asyncio.to_thread(self._caller_tokens)
+        if tokens:
+            await self._warm_routes(app, tokens)
+        else:
+            self.steps.append({"name": "dashboard reads", "ok": True, "ms": 0.0, "detail": "no active users yet"})
+
+        self.finished_at = time.perf_counter()
+        self.state = "done"
+        failed = [step["name"] for step in self.steps if not step["ok"]]
+        logger.info(
+            f"Warm-up finished in {(self.finished_at - self.started_at) * 1000:.0f}ms"
+            + (f" ({len(failed)} step(s) failed: {', '.join(failed)})" if failed else "")
+        )
+
+    async def _step(self, name: str, action):
+        started = time.perf_counter()
+        step = {"name": name, "ok": True}
+        try:
+            detail = await action()
+            if detail is not None:
+                step["detail"] = detail
+        except Exception as e:
+            step.update(ok=False, detail=str(e))
+            logger.warning(f"Warm-up step {name} failed: {str(e)}")
+        step["ms"] = round((time.perf_counter() - started) * 1000, 1)
+        self.steps.append(step)
+
+    async def _open_async_engine(self):
+        from app.database import async_engine
+        async with async_engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    async def _compile_templates(self):
+        from app.services.email_service import precompile_templates
+        return f"{await asyncio.to_thread(precompile_templates)} compiled"
+
+    def _caller_tokens(self) -> dict:
+        """Bearer tokens for an active manager-level user and an active technician, where they exist"""
+        from app.utils.auth import create_access_token
+        db = SessionLocal()
+        try:
+            callers = {
+                "manager": db.query(User.email).filter(User.role.in_(MANAGER_ROLES), User.is_active == 1).first(),
+                "technician": db.query(User.email).filter(User.role == UserRole.TECHNICIAN, User.is_active == 1).first(),
+            }
+        finally:
+            db.close()
+        return {role: create_access_token({"sub": row.email}) for role, row in callers.items() if row}
+
+    async def _warm_routes(self, app, tokens: dict):
+        import httpx
+
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+            for caller, path in WARMUP_REQUESTS:
+                if caller not in tokens:
+                    continue
+
+                async def request(caller=caller, path=path):
+                    response = await client.get(
+                        path, headers={"Authorization": f"Bearer {tokens[caller]}", "User-Agent": "helpdesk-warmup"}
+                    )
+                    if response.status_code >= 400:
+                        raise RuntimeError(f"HTTP {response.status_code}")
+
+                await self._step(f"GET {path}", request)
+
+
+# Singleton instance
+startup_warmer = StartupWarmer()
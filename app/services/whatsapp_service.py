@@ -1,4 +1,3 @@
-from twilio.rest import Client
 from app.config import settings
 import logging
 
@@ -9,7 +8,15 @@ class WhatsAppService:
     """Service for sending WhatsApp messages via Twilio"""
     
     def __init__(self):
-        self.client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        self._client = None
+    
+    @property
+    def client(self):
+        """Twilio client, created (and twilio imported) on the first message"""
+        if self._client is None:
+            from twilio.rest import Client
+            self._client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
+        return self._client
     
     def send_message(self, to_number: str, message: str):
         """Send a WhatsApp message"""
@@ -20,8 +27,10 @@ class WhatsAppService:
                 to=to_number
             )
             logger.info(f"WhatsApp message sent to {to_number}: {message.sid}")
+            return True
         except Exception as e:
             logger.error(f"Failed to send WhatsApp message: {str(e)}")
+            return False
     
     def send_ticket_created(self, ticket_data: dict):
         """Send WhatsApp notification when ticket is created"""
@@ -90,9 +99,27 @@ Check your email for full details.
             settings.ICT_MANAGER_WHATSAPP
         ]
         
-        for recipient in recipients:
-            if recipient:
-                self.send_message(recipient, message)
+        # False if any recipient could not be reached
+        return all([self.send_message(recipient, message) for recipient in recipients if recipient])
+
+    
+    def send_ticket_digest(self, digest: dict):
+        """Send one WhatsApp message covering several tickets (bulk operations)"""
+        ticket_numbers = ", ".join(t['ticket_number'] for t in digest['tickets'][:20])
+        if len(digest['tickets']) > 20:
+            ticket_numbers += f" and {len(digest['tickets']) - 20} more"
+        
+        message = f"""
+📋 *{digest['heading']}*
+
+{digest['intro']}
+Tickets: {ticket_numbers}
+
+Check your email for details.
+        """.strip()
+        
+        if digest.get('recipient_whatsapp'):
+            self.send_message(digest['recipient_whatsapp'], message)
 
 
 # Singleton instance
@@ -43,6 +43,11 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
 
 def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
     """Get the current authenticated user"""
+    return get_user_from_token(token, db)
+
+
+def get_user_from_token(token: str, db: Session) -> User:
+    """Resolve a JWT to its user (also used where the token cannot come from a header)"""
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
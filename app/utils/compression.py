@@ -0,0 +1,124 @@
+"""
+Response compression middleware (Brotli or gzip)
+
+Negotiates Accept-Encoding and compresses complete response bodies above a
+size threshold. Streaming responses (the SSE event stream, CSV exports,
+static files) pass through untouched so events are never held in a
+compressor buffer. Brotli is used when the optional `brotli` package is
+installed and the client prefers it; otherwise gzip.
+"""
+from app.config import settings
+import gzip
+import logging
+
+try:
+    import brotli
+except ImportError:  # Optional - gzip only
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+
+
+def accepted_encodings(header: str) -> dict:
+    """Parse Accept-Encoding into {coding: q}"""
+    encodings = {}
+    for item in header.split(","):
+        parts = [p.strip() for p in item.split(";")]
+        if not parts[0]:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            if param.startswith("q="):
+                try:
+                    q = float(param[2:])
+                except ValueError:
+                    q = 0.0
+        encodings[parts[0].lower()] = q
+    return encodings
+
+
+def choose_encoding(header: str) -> str:
+    """Best supported coding for an Accept-Encoding header, or '' for identity"""
+    encodings = accepted_encodings(header or "")
+    options = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = "", 0.0
+    for coding in options:
+        q = encodings.get(coding, encodings.get("*", 0.0))
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=settings.BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=settings.GZIP_LEVEL)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware - compresses single-message response bodies"""
+
+    def __init__(self, app, minimum_size: int = None):
+        self.app = app
+        self.minimum_size = minimum_size if minimum_size is not None else settings.COMPRESSION_MIN_SIZE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+
+        async def send_wrapper(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                # Hold the start until we know whether the body is compressible
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body" and start_message is not None:
+                start, start_message = start_message, None
+                body = message.get("body", b"")
+                if message.get("more_body", False) or not self._should_compress(start, body):
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressed = compress(body, encoding)
+                headers = [
+                    (k, v) for k, v in start["headers"]
+                    if k.lower() not in (b"content-length", b"etag")
+                ]
+                etag = next((v for k, v in start["headers"] if k.lower() == b"etag"), None)
+                if etag is not None:
+                    # The encoded bytes differ from the identity body, so the validator becomes weak
+                    headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+                headers += [
+                    (b"content-encoding", encoding.encode("latin-1")),
+                    (b"content-length", str(len(compressed)).encode("latin-1")),
+                    (b"vary", b"Accept-Encoding"),
+                ]
+                await send({**start, "headers": headers})
+                await send({"type": "http.response.body", "body": compressed})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _should_compress(self, start: dict, body: bytes) -> bool:
+        if len(body) < self.minimum_size:
+            return False
+        headers = {k.lower(): v for k, v in start["headers"]}
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1")
+        return content_type.startswith(COMPRESSIBLE_TYPES) and not content_type.startswith("text/event-stream")
@@ -0,0 +1,40 @@
+"""
+HTTP conditional request helpers (ETag / If-None-Match)
+
+Read endpoints build an ETag from a cheap data version (the ticket change
+sequence) plus whatever else shapes the response (query parameters, the
+caller's role). When the client's If-None-Match matches, the endpoint
+answers 304 before running its heavy queries.
+"""
+from fastapi import Request, Response
+from typing import Optional
+import hashlib
+
+# Authenticated data: browsers may keep it but must revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(*parts) -> str:
+    """Strong ETag from the values that determine a response body"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when If-None-Match lists this ETag (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return etag in candidates or f"W/{etag}" in candidates
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Return a 304 response if the client already has this version; otherwise set validators on response"""
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return None
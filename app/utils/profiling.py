@@ -0,0 +1,122 @@
+"""
+Request profiling middleware and SQLAlchemy statement hooks
+
+ProfilingMiddleware opens a RequestProfile for each HTTP request in a
+context variable. Engine hooks installed by `instrument_engine()` add every
+statement's count and duration to the active profile - context variables
+follow the request into threadpool (sync routes) and greenlet (async
+session) execution. Once the last body chunk has been sent, the profile is
+recorded in `request_metrics` under the matched route template and closed,
+so background tasks that run afterwards (notification emails and WhatsApp
+messages) add neither time nor queries to the request.
+
+Long-lived streams (Server-Sent Events) are not timed.
+"""
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import event
+from app.config import settings
+from app.services.request_metrics import request_metrics
+import time
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+SQL_PREVIEW_LENGTH = 500
+
+
+class RequestProfile:
+    """Database activity of one request"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.query_count = 0
+        self.db_time = 0.0
+        self.statements = Counter()
+        self.slow_queries = []
+        self.finished = False
+
+    def add_statement(self, statement: str, duration: float):
+        if self.finished:
+            return
+        self.query_count += 1
+        self.db_time += duration
+        self.statements[statement] += 1
+        if duration * 1000 >= settings.SLOW_QUERY_MS:
+            self.slow_queries.append({
+                "sql": statement[:SQL_PREVIEW_LENGTH],
+                "duration_ms": round(duration * 1000, 1)
+            })
+
+    def repeated_statements(self, threshold: int) -> list:
+        """Statements executed at least `threshold` times - the signature of an N+1 loop"""
+        return [
+            {"sql": statement[:SQL_PREVIEW_LENGTH], "count": count}
+            for statement, count in self.statements.most_common()
+            if count >= threshold
+        ]
+
+
+def instrument_engine(sync_engine):
+    """Attribute statement counts and time to the active request profile"""
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_profile.get() is not None:
+            conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        profile = _current_profile.get()
+        started = conn.info.get("profile_started")
+        if profile is not None and started:
+            profile.add_statement(statement, time.perf_counter() - started.pop())
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware - times requests and records their DB profile"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.PROFILING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["path"])
+        token = _current_profile.set(profile)
+        status_code = 500
+        streaming = False
+        started = time.perf_counter()
+
+        def finish():
+            if profile.finished or streaming:
+                return
+            profile.finished = True
+            # FastAPI records the matched APIRoute in the scope; static files and 404s have none
+            route = scope.get("route")
+            request_metrics.record(
+                scope["method"],
+                getattr(route, "path", None) or "unmatched",
+                status_code,
+                time.perf_counter() - started,
+                profile
+            )
+
+        async def send_wrapper(message):
+            nonlocal status_code, streaming
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                content_type = dict(message.get("headers") or []).get(b"content-type", b"")
+                streaming = content_type.startswith(b"text/event-stream")
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                # The client has the whole response; BackgroundTasks run after this point
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_profile.reset(token)
+            finish()  # Responses that never completed
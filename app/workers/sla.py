@@ -0,0 +1,176 @@
+"""
+Standalone SLA worker
+
+    python -m app.workers.sla [--interval 60] [--health-port 8001] [--no-archive]
+
+Runs the SLA monitor - scans, escalations and their email/WhatsApp
+notifications - plus nightly audit archiving outside the web process, so an
+escalation burst never competes with API requests and each side is scaled on
+its own. Run exactly one per database. The web processes then need
+RUN_SCHEDULER=False, and CLUSTER_CHANNEL_ENABLED=True on both sides carries
+the worker's live events to dashboards (run_server.py --workers N sets this up).
+
+GET /health on the health port answers 200 while scans complete on schedule
+and 503 otherwise; GET /metrics serves the SLA monitor's Prometheus metrics,
+which the web processes no longer collect.
+
+SIGTERM/SIGINT stop it gracefully: no new scans, a running scan finishes and
+its queued notifications are sent, within SLA_SHUTDOWN_TIMEOUT_SECONDS.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import time
+
+from app.config import settings
+from app.services.audit_archive import audit_archiver
+from app.services.cluster_channel import cluster_channel
+from app.services.email_service import precompile_templates
+from app.services.sla_metrics import sla_metrics
+from app.services.sla_monitor import sla_monitor
+
+logger = logging.getLogger(__name__)
+
+# Unhealthy once this many scan intervals pass without a finished scan
+MISSED_SCANS_UNHEALTHY = 3
+
+
+class SLAWorker:
+    """Runs the SLA monitor until SIGTERM/SIGINT"""
+
+    def __init__(self, interval_seconds: int = None, health_host: str = "0.0.0.0", health_port: int = None,
+                 archive: bool = True):
+        self.monitor = sla_monitor
+        if interval_seconds:
+            self.monitor.interval_seconds = interval_seconds
+        self.health_host = health_host
+        self.health_port = settings.SLA_WORKER_HEALTH_PORT if health_port is None else health_port
+        self.archive = archive
+        self.started_at = time.time()
+        self.stopping = False
+        self._stop: asyncio.Event = None
+
+    def health(self) -> dict:
+        now = time.time()
+        last = sla_metrics.last_cycle
+        last_finished = last.started_epoch + last.duration if last else self.started_at
+        since = now - last_finished
+        if self.stopping:
+            state = "stopping"
+        elif since < self.monitor.interval_seconds * MISSED_SCANS_UNHEALTHY:
+            state = "healthy"
+        else:
+            state = "unhealthy"
+        return {
+            "status": state,
+            "pid": os.getpid(),
+            "uptime_seconds": round(now - self.started_at, 1),
+            "scan_interval_seconds": self.monitor.interval_seconds,
+            "scan_running": self.monitor.cycle is not None,
+            "seconds_since_last_scan": round(since, 1) if last else None,
+            "last_scan": last.summary() if last else None,
+            "cycles": sla_metrics.cycles,
+            "cycle_errors": sla_metrics.cycle_errors,
+            "pending_notifications": self.monitor.pending_notifications
+        }
+
+    def request_stop(self, reason: str = "shutdown"):
+        if not self.stopping:
+            logger.info(f"SLA worker stopping ({reason})")
+        self.stopping = True
+        self._stop.set()
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.request_stop, sig.name)
+            except NotImplementedError:
+                # Windows event loops have no signal handlers
+                signal.signal(sig, lambda signum, frame: loop.call_soon_threadsafe(
+                    self.request_stop, signal.Signals(signum).name
+                ))
+
+        cluster_channel.start()
+        if self.archive:
+            audit_archiver.schedule(self.monitor.scheduler)
+        self.monitor.start()
+        precompile_templates()  # So the first escalation email doesn't compile its template
+        server = None
+        if self.health_port:
+            server = await asyncio.start_server(self._handle_http, self.health_host, self.health_port)
+            logger.info(f"SLA worker health on http://{self.health_host}:{self.health_port}/health")
+        logger.info(f"SLA worker running (pid {os.getpid()})")
+
+        try:
+            await self._stop.wait()
+        finally:
+            self.stopping = True
+            await self.monitor.shutdown()
+            cluster_channel.stop()
+            if server is not None:
+                server.close()
+                await server.wait_closed()
+            logger.info("SLA worker stopped")
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Minimal HTTP/1.1 responder for /health and /metrics"""
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), 5)
+            while await asyncio.wait_for(reader.readline(), 5) not in (b"\r\n", b"\n", b""):
+                pass  # Headers are not needed
+            parts = request_line.decode("latin-1").split()
+            path = parts[1].split("?")[0] if len(parts) > 1 else ""
+
+            if path == "/health":
+                health = self.health()
+                status = "200 OK" if health["status"] == "healthy" else "503 Service Unavailable"
+                body, content_type = json.dumps(health).encode(), "application/json"
+            elif path == "/metrics":
+                status = "200 OK"
+                body = sla_metrics.render_prometheus().encode()
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                status, body, content_type = "404 Not Found", b'{"detail": "Not Found"}', "application/json"
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (asyncio.TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the SLA monitor outside the web process")
+    parser.add_argument("--interval", type=int, default=settings.SLA_SCAN_INTERVAL_SECONDS,
+                        help="Seconds between SLA scans")
+    parser.add_argument("--health-host", default="0.0.0.0")
+    parser.add_argument("--health-port", type=int, default=settings.SLA_WORKER_HEALTH_PORT,
+                        help="Port for /health and /metrics (0 disables)")
+    parser.add_argument("--no-archive", action="store_true",
+                        help="Leave nightly audit log archiving to another process")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    worker = SLAWorker(
+        interval_seconds=args.interval,
+        health_host=args.health_host,
+        health_port=args.health_port,
+        archive=not args.no_archive
+    )
+    asyncio.run(worker.run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Benchmark: memory per row of the list-heavy reads
+
+Seeds a scratch SQLite database with generate_synthetic_data, then measures
+with tracemalloc, for each list-heavy read, the peak and retained Python
+memory of:
+- legacy path: full Ticket instances (with their assignee) in the session's
+  identity map, as the endpoints used to load them
+- current path: the column-projected rows the endpoints load now
+for the ticket list, both CSV exports, the escalation view and the SLA scan.
+
+Usage: python benchmark_memory.py [--tickets 100000] [--output memory.json]
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Never touch the real database - point the app at a scratch file before importing it
+DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_benchmark_memory.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("DATABASE_READ_URL", None)
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app.database import SessionLocal, init_db
+from app.models.user import User
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus
+from app.api import escalations, reports
+from app.api.tickets import TICKET_LIST_COLUMNS
+from app.services.escalation_snapshot import ESCALATION_TICKET_COLUMNS
+from app.services.sla_monitor import SLA_SCAN_COLUMNS
+from generate_synthetic_data import generate
+
+OPEN_STATUSES = [TicketStatus.OPEN, TicketStatus.IN_PROGRESS]
+ESCALATION_FILTER = (Ticket.escalated == True, Ticket.status.in_(OPEN_STATUSES))
+
+
+def with_assignee(db):
+    return db.query(Ticket).options(joinedload(Ticket.assignee))
+
+
+def with_updates_count(query):
+    """The reports export's grouped update count, joined onto `query`"""
+    counts = select(
+        TicketUpdate.ticket_id, func.count(TicketUpdate.id).label("updates_count")
+    ).group_by(TicketUpdate.ticket_id).subquery()
+    return query.add_columns(func.coalesce(counts.c.updates_count, 0)).outerjoin(
+        counts, counts.c.ticket_id == Ticket.id
+    ).order_by(Ticket.created_at.desc()).all()
+
+
+# name -> (legacy loader, current loader); each takes a Session and returns the rows
+READS = {
+    "ticket list": (
+        lambda db: with_assignee(db).order_by(Ticket.created_at.desc()).all(),
+        lambda db: db.query(*TICKET_LIST_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id)
+        .order_by(Ticket.created_at.desc()).all()
+    ),
+    "reports export": (
+        lambda db: with_updates_count(with_assignee(db)),
+        lambda db: with_updates_count(db.query(*reports.EXPORT_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id))
+    ),
+    "escalations export": (
+        lambda db: with_assignee(db).order_by(Ticket.created_at.desc()).all(),
+        lambda db: db.query(*escalations.EXPORT_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id)
+        .order_by(Ticket.created_at.desc()).all()
+    ),
+    "escalation view": (
+        lambda db: with_assignee(db).filter(*ESCALATION_FILTER).all(),
+        lambda db: db.query(*ESCALATION_TICKET_COLUMNS)
+        .outerjoin(User, User.id == Ticket.assignee_id).filter(*ESCALATION_FILTER).all()
+    ),
+    "SLA scan": (
+        lambda db: db.query(Ticket).filter(Ticket.status.in_(OPEN_STATUSES)).all(),
+        lambda db: db.query(*SLA_SCAN_COLUMNS).filter(Ticket.status.in_(OPEN_STATUSES)).all()
+    ),
+}
+
+
+def measure(loader) -> dict:
+    """Peak and retained traced memory while `loader`'s rows are alive"""
+    db = SessionLocal()
+    try:
+        gc.collect()
+        tracemalloc.start()
+        started = time.perf_counter()
+        rows = loader(db)
+        ms = (time.perf_counter() - started) * 1000
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return {"rows": len(rows), "ms": ms, "peak_bytes": peak, "retained_bytes": retained}
+    finally:
+        db.close()
+
+
+def per_row(result: dict, key: str) -> float:
+    return result[key] / max(result["rows"], 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per row: full ORM instances vs column projections")
+    parser.add_argument("--tickets", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    args = parser.parse_args()
+
+    print(f"\n📊 Seeding {args.tickets} tickets into {DB_PATH}...")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    init_db()
+    db = SessionLocal()
+    try:
+        generate(db, tickets=args.tickets, seed=args.seed)
+    finally:
+        db.close()
+
+    print("\n🧠 Python memory while the rows are held (tracemalloc)")
+    print("=" * 86)
+    print(f"   {'read':<20}{'rows':>8}   {'legacy peak':>12} {'per row':>9}   {'current peak':>12} {'per row':>9}   {'saved':>6}")
+    results = {}
+    for name, (legacy_loader, current_loader) in READS.items():
+        legacy, current = measure(legacy_loader), measure(current_loader)
+        if legacy["rows"] != current["rows"]:
+            print(f"❌ {name}: legacy loaded {legacy['rows']} rows, current {current['rows']}")
+            sys.exit(1)
+        saved = 1 - current["peak_bytes"] / legacy["peak_bytes"] if legacy["peak_bytes"] else 0
+        results[name] = {"legacy": legacy, "current": current, "peak_reduction": saved}
+        print(
+            f"   {name:<20}{legacy['rows']:>8}   {legacy['peak_bytes'] / 2 ** 20:>9.1f} MB {per_row(legacy, 'peak_bytes'):>7.0f} B"
+            f"   {current['peak_bytes'] / 2 ** 20:>9.1f} MB {per_row(current, 'peak_bytes'):>7.0f} B   {saved:>6.0%}"
+        )
+
+    print("\n⏱️  Load time (tracemalloc adds overhead to both paths)")
+    for name, result in results.items():
+        print(f"   {name:<20} legacy {result['legacy']['ms']:8.0f} ms   current {result['current']['ms']:8.0f} ms")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"tickets": args.tickets, "reads": results}, f, indent=2)
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    print("\n✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
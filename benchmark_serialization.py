@@ -0,0 +1,151 @@
+"""
+Benchmark: /api/tickets serialization and bytes on the wire
+
+Seeds a throwaway SQLite database with N tickets, then compares:
+- legacy path: ORM objects -> TicketListResponse models -> stdlib json
+- current path: column rows -> dicts -> orjson
+and measures the full endpoint with identity, gzip and Brotli encodings.
+
+Usage: python benchmark_serialization.py [--tickets 10000] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+# Never touch the real database - point the app at a scratch file before importing it
+DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_benchmark.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from fastapi.testclient import TestClient
+import orjson
+
+from app.database import SessionLocal, init_db
+from app.models.user import User
+from app.models.ticket import Ticket, TicketStatus, TicketPriority
+from app.utils.auth import create_access_token, get_password_hash
+from app.api.tickets import TICKET_LIST_COLUMNS, ticket_list_item, ticket_list_row
+
+
+def seed(count: int):
+    """Create technicians and `count` tickets"""
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+
+    db = SessionLocal()
+    password = get_password_hash("benchmark")
+    officer = User(name="Benchmark Officer", email="bench.officer@ndabase.com", hashed_password=password, role="helpdesk_officer")
+    technicians = [
+        User(name=f"Technician {i}", email=f"bench.tech{i}@ndabase.com", hashed_password=password, role="technician")
+        for i in range(10)
+    ]
+    db.add_all([officer] + technicians)
+    db.commit()
+    technician_ids = [t.id for t in technicians]
+
+    statuses = list(TicketStatus)
+    priorities = list(TicketPriority)
+    now = datetime.now()
+    rows = [{
+        "ticket_number": f"NDB-{i + 1:04d}",
+        "user_name": f"Staff Member {i % 300}",
+        "user_email": f"staff{i % 300}@ndabase.com",
+        "user_phone": "+27110000000",
+        "problem_summary": f"Printer on floor {i % 7} shows paper jam error {i}",
+        "problem_description": "The printer stopped mid-job and shows a paper jam error even after clearing the tray.",
+        "priority": priorities[i % len(priorities)],
+        "status": statuses[i % len(statuses)],
+        "assignee_id": technician_ids[i % len(technician_ids)],
+        "created_at": now - timedelta(minutes=i),
+        "updated_at": now - timedelta(minutes=i),
+        "sla_deadline": now + timedelta(hours=8) - timedelta(minutes=i),
+        "resolved_at": now if statuses[i % len(statuses)] in (TicketStatus.RESOLVED, TicketStatus.CLOSED) else None
+    } for i in range(count)]
+    for start in range(0, count, 1000):
+        db.execute(insert(Ticket.__table__), rows[start:start + 1000])
+    db.commit()
+    db.close()
+    return "bench.officer@ndabase.com"
+
+
+def timed(fn, repeat: int):
+    """Median wall time in ms and the last result"""
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), result
+
+
+def legacy_path():
+    db = SessionLocal()
+    try:
+        tickets = db.query(Ticket).order_by(Ticket.created_at.desc()).all()
+        models = [ticket_list_item(ticket) for ticket in tickets]
+        return json.dumps([m.model_dump(mode="json") for m in models]).encode("utf-8")
+    finally:
+        db.close()
+
+
+def current_path():
+    db = SessionLocal()
+    try:
+        rows = db.query(*TICKET_LIST_COLUMNS).outerjoin(User, User.id == Ticket.assignee_id).order_by(Ticket.created_at.desc()).all()
+        return orjson.dumps([ticket_list_row(row) for row in rows])
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/tickets serialization and compression")
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"\n📊 Seeding {args.tickets} tickets into {DB_PATH}...")
+    email = seed(args.tickets)
+
+    print("\n⏱️  Serialization (query + build + encode, median of runs)")
+    print("=" * 60)
+    legacy_ms, legacy_body = timed(legacy_path, args.repeat)
+    current_ms, current_body = timed(current_path, args.repeat)
+    print(f"   Legacy  (ORM + Pydantic + json):  {legacy_ms:8.1f} ms  {len(legacy_body):>10,} bytes")
+    print(f"   Current (rows + dicts + orjson):  {current_ms:8.1f} ms  {len(current_body):>10,} bytes")
+    print(f"   Speed-up: {legacy_ms / current_ms:.1f}x")
+    if json.loads(legacy_body) != json.loads(current_body):
+        print("❌ Payloads differ between legacy and current paths")
+        sys.exit(1)
+    print("✅ Payloads are identical")
+
+    from app.main import app
+    client = TestClient(app)
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+
+    print("\n🌐 GET /api/tickets end to end (median of runs)")
+    print("=" * 60)
+    for encoding in ("identity", "gzip", "br"):
+        def request():
+            return client.get("/api/tickets", headers={**headers, "Accept-Encoding": encoding})
+        ms, response = timed(request, args.repeat)
+        applied = response.headers.get("content-encoding", "identity")
+        wire = int(response.headers.get("content-length", len(response.content)))
+        print(f"   {encoding:<8} -> {applied:<8} {ms:8.1f} ms  {wire:>10,} bytes on the wire")
+
+    etag = client.get("/api/tickets", headers=headers).headers.get("etag")
+    ms, response = timed(lambda: client.get("/api/tickets", headers={**headers, "If-None-Match": etag}), args.repeat)
+    print(f"   If-None-Match     -> {response.status_code}      {ms:8.1f} ms  {len(response.content):>10,} bytes")
+
+    os.remove(DB_PATH)
+    print("\n✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+"""
+Benchmark suite: mixed helpdesk workload against the app in-process
+
+Seeds a scratch SQLite database with generate_synthetic_data, then replays a
+weighted mix of dashboard polls, ticket creates, updates, reassigns and SLA
+monitor cycles through an in-process ASGI client with several concurrent
+virtual users. Reports throughput and p50/p95/p99 latency per operation and
+saves everything (plus the git commit and dataset shape) to JSON, so runs can
+be compared across commits:
+
+    python benchmark_suite.py --output before.json
+    git checkout <other commit>
+    python benchmark_suite.py --output after.json --compare before.json
+
+Email and WhatsApp senders are replaced with no-ops for the run, so the
+numbers measure the application rather than SMTP/Twilio round trips. The
+same --seed gives the same dataset and the same operation sequence.
+
+Usage: python benchmark_suite.py [--tickets 5000] [--operations 2000] [--users 10] [--seed 42]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+# Never touch the real database - point the app at a scratch file before importing it
+DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_benchmark_suite.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+
+import httpx
+
+from app.database import SessionLocal, init_db
+from app.utils.auth import create_access_token
+from generate_synthetic_data import generate
+
+# Relative frequency of each operation in the mix
+WORKLOAD = {
+    "GET /api/tickets (technician)": 20,
+    "GET /api/tickets/summary": 15,
+    "GET /api/tickets (officer)": 8,
+    "GET /api/tickets/{ticket_number}": 15,
+    "GET /api/tickets/changes": 8,
+    "GET /api/escalations": 6,
+    "GET /api/reports/kpis": 4,
+    "GET /api/reports/statistics": 3,
+    "GET /api/technicians/workload": 3,
+    "POST /api/tickets": 6,
+    "PATCH /api/tickets/{ticket_number}": 8,
+    "POST /api/tickets/{ticket_id}/reassign": 3,
+    "SLA monitor cycle": 1,
+}
+
+
+def silence_notifications():
+    """Swap outbound email/WhatsApp calls for no-ops for the whole run"""
+    from app.services.email_service import EmailService
+    from app.services.whatsapp_service import whatsapp_service
+
+    async def no_email(*args, **kwargs):
+        return None
+
+    for name in dir(EmailService):
+        if name.startswith("send_"):
+            setattr(EmailService, name, staticmethod(no_email))
+    for name in dir(whatsapp_service):
+        if name.startswith("send_"):
+            setattr(whatsapp_service, name, lambda *args, **kwargs: True)
+
+
+def seed(args) -> dict:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    init_db()
+    db = SessionLocal()
+    try:
+        return generate(db, tickets=args.tickets, technicians=args.technicians, seed=args.seed)
+    finally:
+        db.close()
+
+
+class Workload:
+    """Builds requests for each operation from the seeded dataset"""
+
+    def __init__(self, client: httpx.AsyncClient, data: dict, rng: random.Random):
+        self.client = client
+        self.data = data
+        self.rng = rng
+        self.tokens = {}
+        ids = data["user_ids"]
+        self.technicians = ids["technician"]
+        self.officer = ids["helpdesk_officer"][0]
+        self.gm = ids["ict_gm"][0]
+        self.change_token = "0"
+        self.created = 0
+
+    def headers(self, user_id: int) -> dict:
+        if user_id not in self.tokens:
+            db = SessionLocal()
+            from app.models.user import User
+            email = db.get(User, user_id).email
+            db.close()
+            self.tokens[user_id] = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+        return self.tokens[user_id]
+
+    def ticket(self):
+        # Recent tickets are the ones people open and edit
+        index = len(self.data["ticket_numbers"]) - 1 - min(int(self.rng.expovariate(1 / 200)), len(self.data["ticket_numbers"]) - 1)
+        return self.data["ticket_ids"][index], self.data["ticket_numbers"][index]
+
+    async def run(self, operation: str) -> int:
+        """Perform one operation; returns the HTTP status (200 for SLA cycles)"""
+        client, rng = self.client, self.rng
+        technician = rng.choice(self.technicians)
+
+        if operation == "GET /api/tickets (technician)":
+            response = await client.get("/api/tickets?scope=mine", headers=self.headers(technician))
+        elif operation == "GET /api/tickets/summary":
+            response = await client.get("/api/tickets/summary", headers=self.headers(technician))
+        elif operation == "GET /api/tickets (officer)":
+            response = await client.get("/api/tickets?status=Open", headers=self.headers(self.officer))
+        elif operation == "GET /api/tickets/{ticket_number}":
+            _, number = self.ticket()
+            response = await client.get(f"/api/tickets/{number}", headers=self.headers(technician))
+        elif operation == "GET /api/tickets/changes":
+            response = await client.get(f"/api/tickets/changes?since={self.change_token}&limit=500", headers=self.headers(self.officer))
+            if response.status_code == 200:
+                self.change_token = response.json()["next_token"]
+        elif operation == "GET /api/escalations":
+            response = await client.get("/api/escalations", headers=self.headers(self.gm))
+        elif operation == "GET /api/reports/kpis":
+            response = await client.get("/api/reports/kpis", headers=self.headers(self.gm))
+        elif operation == "GET /api/reports/statistics":
+            response = await client.get("/api/reports/statistics", headers=self.headers(self.gm))
+        elif operation == "GET /api/technicians/workload":
+            response = await client.get("/api/technicians/workload", headers=self.headers(self.gm))
+        elif operation == "POST /api/tickets":
+            self.created += 1
+            response = await client.post("/api/tickets", headers=self.headers(self.officer), json={
+                "user_name": f"Benchmark Staff {self.created}",
+                "user_email": f"bench{self.created}@ndabase.com",
+                "user_phone": "+27110000000",
+                "problem_summary": f"Benchmark issue {self.created}: printer offline",
+                "problem_description": "Printer shows offline on every workstation.",
+                "priority": rng.choice(["Normal", "Normal", "High", "Urgent"]),
+                "assignee_id": technician
+            })
+        elif operation == "PATCH /api/tickets/{ticket_number}":
+            _, number = self.ticket()
+            response = await client.patch(f"/api/tickets/{number}", headers=self.headers(technician), json={
+                "update_text": "Benchmark progress note",
+                "priority": rng.choice(["Normal", "High"])
+            })
+        elif operation == "POST /api/tickets/{ticket_id}/reassign":
+            ticket_id, _ = self.ticket()
+            response = await client.post(f"/api/tickets/{ticket_id}/reassign", headers=self.headers(self.officer), json={
+                "new_assignee_id": technician,
+                "reassign_reason": "Benchmark workload rebalancing"
+            })
+        elif operation == "SLA monitor cycle":
+            from app.services.sla_monitor import sla_monitor
+            await sla_monitor.check_sla_breaches()
+            return 200
+        else:
+            raise ValueError(operation)
+        return response.status_code
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round((len(ordered) - 1) * pct / 100)))]
+
+
+async def replay(args, data: dict) -> dict:
+    from app.main import app
+
+    rng = random.Random(args.seed)
+    operations = rng.choices(list(WORKLOAD), weights=list(WORKLOAD.values()), k=args.operations)
+    queue = iter(operations)
+    latencies = defaultdict(list)
+    errors = defaultdict(int)  # 5xx
+    rejected = defaultdict(int)  # 4xx - e.g. reassigning a ticket that needs a forced update first
+
+    # Unhandled errors come back as 500s and count against the operation instead of aborting the run
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        workload = Workload(client, data, rng)
+
+        async def virtual_user():
+            for operation in queue:
+                started = time.perf_counter()
+                status_code = await workload.run(operation)
+                latencies[operation].append((time.perf_counter() - started) * 1000)
+                if status_code >= 500:
+                    errors[operation] += 1
+                elif status_code >= 400:
+                    rejected[operation] += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(virtual_user() for _ in range(args.users)))
+        elapsed = time.perf_counter() - started
+
+    results = {}
+    for operation in WORKLOAD:
+        samples = latencies.get(operation)
+        if not samples:
+            continue
+        results[operation] = {
+            "count": len(samples),
+            "errors": errors[operation],
+            "rejected": rejected[operation],
+            "throughput_per_s": round(len(samples) / elapsed, 2),
+            "mean_ms": round(statistics.mean(samples), 2),
+            "p50_ms": round(percentile(samples, 50), 2),
+            "p95_ms": round(percentile(samples, 95), 2),
+            "p99_ms": round(percentile(samples, 99), 2),
+        }
+    return {"elapsed_s": round(elapsed, 2), "total_throughput_per_s": round(args.operations / elapsed, 2), "operations": results}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report: dict, baseline: dict = None):
+    print(f"\n   {'operation':<40} {'n':>5} {'4xx':>4} {'5xx':>4} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for operation, stats in report["results"]["operations"].items():
+        line = (f"   {operation:<40} {stats['count']:>5} {stats['rejected']:>4} {stats['errors']:>4} {stats['throughput_per_s']:>7.1f} "
+                f"{stats['p50_ms']:>8.1f} {stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f}")
+        previous = (baseline or {}).get("results", {}).get("operations", {}).get(operation)
+        if previous:
+            change = (stats["p95_ms"] - previous["p95_ms"]) / previous["p95_ms"] * 100 if previous["p95_ms"] else 0
+            line += f"   p95 {change:+.0f}% vs {baseline['commit']}"
+        print(line)
+    results = report["results"]
+    print(f"\n   Total: {report['config']['operations']} operations in {results['elapsed_s']}s "
+          f"({results['total_throughput_per_s']} ops/s, {report['config']['users']} virtual users)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mixed-workload benchmark against the app in-process")
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--technicians", type=int, default=12)
+    parser.add_argument("--operations", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default=None, help="Write results JSON here (default: benchmark_results/<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier results JSON to compare p95 against")
+    args = parser.parse_args()
+
+    silence_notifications()
+
+    print(f"\n📊 Seeding {args.tickets} tickets into {DB_PATH} (seed {args.seed})...")
+    started = time.perf_counter()
+    data = seed(args)
+    print(f"   {data['tickets']} tickets, {data['ticket_updates']} updates, {data['escalations']} escalations "
+          f"in {time.perf_counter() - started:.1f}s")
+
+    print(f"\n⏱️  Replaying {args.operations} operations with {args.users} virtual users...")
+    print("=" * 60)
+    logging.disable(logging.WARNING)  # Per-request and slow-request logging would swamp the report
+    results = asyncio.run(replay(args, data))
+    logging.disable(logging.NOTSET)
+
+    report = {
+        "commit": git_commit(),
+        "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "dataset": {k: data[k] for k in ("users", "tickets", "ticket_updates", "escalations", "audit_logs")},
+        "results": results,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    output = args.output or os.path.join("benchmark_results", f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+
+    failed = sum(stats["errors"] for stats in results["operations"].values())
+    if failed:
+        print(f"\n❌ Benchmark complete with {failed} server errors - results saved to {output}")
+        sys.exit(1)
+    print(f"\n✅ Benchmark complete - results saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Benchmark: read throughput vs number of web workers
+
+Seeds a scratch SQLite database with generate_synthetic_data, then for each
+worker count starts `run_server.py --workers N` against it and drives
+dashboard reads (ticket lists, summaries, details, search) from several load
+generator processes for a fixed time. Prints requests/second per worker
+count and the speed-up over one worker.
+
+Scaling can only be near-linear up to the number of free CPU cores - the
+load generators run on the same machine, so leave them some. Results are
+saved to JSON with --output.
+
+Usage: python benchmark_workers.py [--workers 1,2,4] [--duration 20] [--clients 4] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_benchmark_workers.db")
+PORT = 8877
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def seed(tickets: int) -> dict:
+    """Create the dataset in a child process so this one never imports the app against another database"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    script = (
+        "import json\n"
+        "from app.database import SessionLocal, init_db\n"
+        "from app.utils.auth import create_access_token\n"
+        "from generate_synthetic_data import generate\n"
+        "init_db()\n"
+        "db = SessionLocal()\n"
+        f"data = generate(db, tickets={tickets})\n"
+        "db.close()\n"
+        "print(json.dumps({\n"
+        "    'tickets': data['ticket_numbers'],\n"
+        "    'technician': create_access_token({'sub': 'tech1@synthetic.ndabase.com'}),\n"
+        "    'officer': create_access_token({'sub': 'officer1@synthetic.ndabase.com'}),\n"
+        "}))\n"
+    )
+    output = subprocess.run([sys.executable, "-c", script], env=server_env(), capture_output=True, text=True, check=True)
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def server_env() -> dict:
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{DB_PATH}"}
+    env.pop("ASYNC_DATABASE_URL", None)
+    env.pop("DATABASE_READ_URL", None)
+    return env
+
+
+async def drive(data: dict, duration: float, concurrency: int, seed_value: int) -> tuple:
+    """Issue reads from `concurrency` connections until the deadline; returns (completed, failed) requests"""
+    rng = random.Random(seed_value)
+    technician = {"Authorization": f"Bearer {data['technician']}"}
+    officer = {"Authorization": f"Bearer {data['officer']}"}
+    recent = data["tickets"][-500:]
+    deadline = time.monotonic() + duration
+    completed = failed = 0
+
+    async def user(client: httpx.AsyncClient):
+        nonlocal completed, failed
+        while time.monotonic() < deadline:
+            pick = rng.random()
+            if pick < 0.35:
+                response = await client.get(f"/api/tickets/{rng.choice(recent)}", headers=technician)
+            elif pick < 0.6:
+                response = await client.get("/api/tickets/summary", headers=technician)
+            elif pick < 0.85:
+                response = await client.get("/api/tickets?scope=mine", headers=technician)
+            else:
+                response = await client.get("/api/tickets/search?q=printer", headers=officer)
+            if response.status_code == 200:
+                completed += 1
+            else:
+                failed += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=30) as client:
+        await asyncio.gather(*(user(client) for _ in range(concurrency)))
+    return completed, failed
+
+
+def load_generator(data: dict, duration: float, concurrency: int, seed_value: int, results):
+    results.put(asyncio.run(drive(data, duration, concurrency, seed_value)))
+
+
+def measure(workers: int, data: dict, args) -> tuple:
+    """Returns (requests per second, failed requests) for one worker count"""
+    log = open(os.path.join(tempfile.gettempdir(), f"helpdesk_benchmark_workers_{workers}.log"), "w")
+    server = subprocess.Popen(
+        [sys.executable, "run_server.py", "--workers", str(workers), "--port", str(PORT), "--host", "127.0.0.1"],
+        env=server_env(), stdout=log, stderr=log
+    )
+    try:
+        for _ in range(120):
+            try:
+                if httpx.get(f"{BASE_URL}/health/ready").status_code == 200:
+                    break
+            except httpx.TransportError:
+                time.sleep(0.5)
+        else:
+            raise SystemExit(f"❌ Server with {workers} workers did not start - see {log.name}")
+        time.sleep(2)  # Let every worker finish starting
+
+        # Warm-up pass, then the measured run
+        asyncio.run(drive(data, 2, args.concurrency, 0))
+        results = multiprocessing.Queue()
+        generators = [
+            multiprocessing.Process(target=load_generator, args=(data, args.duration, args.concurrency, n, results))
+            for n in range(args.clients)
+        ]
+        for generator in generators:
+            generator.start()
+        counts = [results.get() for _ in generators]
+        for generator in generators:
+            generator.join()
+        return sum(c for c, _ in counts) / args.duration, sum(f for _, f in counts)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read throughput vs web worker count")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per measurement")
+    parser.add_argument("--clients", type=int, default=4, help="Load generator processes")
+    parser.add_argument("--concurrency", type=int, default=16, help="Connections per load generator")
+    parser.add_argument("--output", default=None, help="Write results JSON here")
+    args = parser.parse_args()
+    worker_counts = [int(n) for n in args.workers.split(",")]
+
+    print(f"\n📊 Seeding {args.tickets} tickets into {DB_PATH}...")
+    data = seed(args.tickets)
+
+    cores = os.cpu_count()
+    print(f"\n⏱️  {args.clients} load generators x {args.concurrency} connections, {args.duration:.0f}s per run, {cores} CPU cores")
+    print("=" * 60)
+    results, failed = {}, 0
+    for workers in worker_counts:
+        throughput, errors = measure(workers, data, args)
+        results[workers] = throughput
+        failed += errors
+        speedup = throughput / results[worker_counts[0]]
+        print(f"   {workers} worker(s): {throughput:8.1f} req/s   x{speedup:.2f}   ({speedup / workers * worker_counts[0]:.0%} efficiency)")
+        if workers > cores:
+            print(f"      ⚠️  More workers than CPU cores - expect no further gain")
+        if errors:
+            print(f"      ❌ {errors} requests did not return 200")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"cpu_cores": cores, "config": vars(args), "requests_per_second": results}, f, indent=2)
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    if failed:
+        print(f"\n❌ Benchmark complete with {failed} failed requests")
+        sys.exit(1)
+    print("\n✅ Benchmark complete")
+
+
+if __name__ == "__main__":
+    main()
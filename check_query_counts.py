@@ -0,0 +1,315 @@
+"""
+Query-count regression guard for the API routes
+
+Seeds two scratch databases with generate_synthetic_data - a small one and a
+large one - and calls every route in app/api against each, counting the SQL
+statements the request executes. A route whose count grows with the size of
+the data has an N+1 loop (or loads rows it should aggregate in SQL) and fails
+the check. Each size is measured in its own process, so caches filled by one
+run cannot hide statements in the other.
+
+Usage: python check_query_counts.py [--small 10] [--large 1000] [--output query_counts.json]
+
+Exits with status 1 when a route grows, errors, or has no case below. New
+routes need an entry in CASES (or SKIPPED, with the reason).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+MARKER = "QUERY_COUNTS "
+
+# Technicians scale with the dataset too, so per-technician loops show up
+SIZES = {"small": {"tickets": 10, "technicians": 2}, "large": {"tickets": 1000, "technicians": 20}}
+
+# Routes that cannot be measured as a single request
+SKIPPED = {
+    ("GET", "/api/events/stream"): "Server-Sent Events stream never completes",
+    ("GET", "/api/tickets/my-tickets"): "shadowed by GET /api/tickets/{ticket_number}",
+    ("POST", "/api/tickets/create-my-ticket"): "references Ticket.reported_by_id, which does not exist",
+}
+
+
+def ticket_body(n: int, technician: int) -> dict:
+    return {
+        "user_name": f"Query Check {n}",
+        "user_email": f"querycheck{n}@ndabase.com",
+        "user_phone": "+27110000000",
+        "problem_summary": "Query check: printer offline",
+        "problem_description": "Printer shows offline on every workstation.",
+        "priority": "Normal",
+        "assignee_id": technician
+    }
+
+
+# (method, route template, caller role, request keyword arguments built from the fixture)
+# Run in this order on both datasets - reads first, then writes, deletes last.
+CASES = [
+    ("GET", "/api/auth/me", "technician", lambda f: {}),
+    ("GET", "/api/auth/users", "helpdesk_officer", lambda f: {}),
+    ("GET", "/api/tickets", "helpdesk_officer", lambda f: {}),
+    ("GET", "/api/tickets/summary", "helpdesk_officer", lambda f: {}),
+    ("GET", "/api/tickets/changes", "helpdesk_officer", lambda f: {}),
+    ("GET", "/api/tickets/search", "helpdesk_officer", lambda f: {"params": {"q": "printer"}}),
+    ("GET", "/api/tickets/{ticket_number}", "technician", lambda f: {"number": f["open"]}),
+    ("GET", "/api/tickets/{ticket_number}/updates", "technician", lambda f: {"number": f["open"]}),
+    ("GET", "/api/tickets/{ticket_id}/check-blocked", "technician", lambda f: {"id": f["escalated_id"]}),
+    ("GET", "/api/reports/tickets/export", "ict_manager", lambda f: {}),
+    ("GET", "/api/reports/statistics", "ict_manager", lambda f: {}),
+    ("GET", "/api/escalations", "ict_gm", lambda f: {}),
+    ("GET", "/api/reports/kpis", "ict_gm", lambda f: {}),
+    ("GET", "/api/reports/export", "ict_gm", lambda f: {}),
+    ("GET", "/api/audit-logs", "ict_gm", lambda f: {}),
+    ("GET", "/api/technicians/workload", "ict_gm", lambda f: {}),
+    ("GET", "/metrics", "admin", lambda f: {}),
+    ("GET", "/debug/slow-requests", "admin", lambda f: {}),
+    ("GET", "/debug/sla-cycles", "admin", lambda f: {}),
+    ("GET", "/health", None, lambda f: {}),
+    ("GET", "/health/live", None, lambda f: {}),
+    ("GET", "/health/ready", None, lambda f: {}),
+    ("GET", "/", None, lambda f: {"follow_redirects": False}),
+    ("POST", "/api/auth/login", None, lambda f: {
+        "data": {"username": "admin@synthetic.ndabase.com", "password": "synthetic"}}),
+    ("POST", "/api/auth/register", None, lambda f: {"json": {
+        "email": "public@synthetic.ndabase.com", "name": "Public User", "password": "synthetic1"}}),
+    ("POST", "/api/auth/register-user", "admin", lambda f: {"json": {
+        "email": "added@synthetic.ndabase.com", "name": "Added User", "password": "synthetic1"}}),
+    ("PUT", "/api/auth/profile", "technician", lambda f: {"json": {"phone": "+27820000000"}}),
+    ("POST", "/api/auth/change-password", "admin", lambda f: {"json": {
+        "current_password": "synthetic", "new_password": "synthetic"}}),
+    ("POST", "/api/tickets", "helpdesk_officer", lambda f: {"json": ticket_body(1, f["technician"])}),
+    ("POST", "/api/tickets/import", "helpdesk_officer", lambda f: {"files": {"file": ("tickets.jsonl", "\n".join(
+        json.dumps(ticket_body(n, f["technician"])) for n in range(2, 5)))}}),
+    ("PATCH", "/api/tickets/{ticket_number}", "technician", lambda f: {"number": f["open"], "json": {
+        "update_text": "Query check progress note", "status": "In Progress"}}),
+    ("POST", "/api/tickets/{ticket_id}/forced-update", "technician", lambda f: {"id": f["escalated_id"], "params": {
+        "update_text": "Query check escalation update", "time_spent": 15}}),
+    ("POST", "/api/tickets/{ticket_id}/reassign", "helpdesk_officer", lambda f: {"id": f["open_id"], "json": {
+        "new_assignee_id": f["technician"], "reassign_reason": "Query check rebalancing"}}),
+    ("POST", "/api/tickets/{ticket_id}/internal-note", "helpdesk_officer", lambda f: {"id": f["open_id"], "params": {
+        "note_text": "Query check internal note"}}),
+    ("POST", "/api/tickets/{ticket_id}/time-tracking", "technician", lambda f: {"id": f["open_id"], "json": {
+        "update_text": "Query check time entry", "time_spent": 30}}),
+    ("POST", "/api/escalations/{ticket_id}/acknowledge", "ict_gm", lambda f: {"id": f["escalated_id"]}),
+    ("POST", "/api/tickets/bulk", "helpdesk_officer", lambda f: {"json": {
+        "ticket_ids": f["bulk_ids"], "operation": "priority", "priority": "High", "notify": False}}),
+    ("POST", "/api/tickets/{ticket_number}/merge", "helpdesk_officer", lambda f: {"number": f["open"], "json": {
+        "duplicate_ticket_numbers": [f["duplicate"]]}}),
+    ("DELETE", "/api/tickets/{ticket_number}", "admin", lambda f: {"number": f["deletable"]}),
+    ("DELETE", "/api/auth/users/{user_id}", "admin", lambda f: {"user_id": f["deletable_user"]}),
+]
+
+
+def pin_fixture(db, data: dict) -> dict:
+    """Put the newest tickets into the states the write routes need, identically for every size"""
+    from app.models.ticket import Ticket, SLAEscalation, TicketStatus, SLAStatus
+    from app.models.user import User
+    from app.models.audit_log import AuditLog
+
+    ids = data["ticket_ids"]
+    paused, escalated, open_ticket, duplicate, deletable = (db.get(Ticket, ticket_id) for ticket_id in ids[-5:])
+
+    escalated.status = TicketStatus.IN_PROGRESS
+    escalated.escalated = 1
+    escalated.requires_update = 1
+    escalated.sla_status = SLAStatus.BREACHED
+    db.add(SLAEscalation(
+        ticket_id=escalated.id,
+        escalation_reason="Query check escalation",
+        previous_priority=escalated.priority.value,
+        new_priority="Urgent"
+    ))
+    for ticket in (open_ticket, duplicate, deletable):
+        ticket.status = TicketStatus.OPEN
+        ticket.escalated = 0
+        ticket.requires_update = 0
+    paused.status = TicketStatus.WAITING_ON_USER
+    paused.escalated = 0
+    # Reassigning to a different technician than the current one, a paused ticket and an
+    # attributed audit entry, so both datasets take the same code paths
+    technicians = data["user_ids"]["technician"]
+    open_ticket.assignee_id = technicians[-1]
+    db.add(AuditLog(
+        entity_type="ticket", entity_id=open_ticket.id, action="ticket_updated",
+        performed_by_id=technicians[-1], details={"ticket_number": open_ticket.ticket_number}
+    ))
+    # Seeded users own tickets and history; deleting one of them is a different request
+    spare = User(name="Spare User", email="spare@synthetic.ndabase.com", hashed_password="synthetic", role="technician")
+    db.add(spare)
+    db.commit()
+
+    return {
+        "technician": technicians[0],
+        "escalated_id": escalated.id,
+        "open": open_ticket.ticket_number,
+        "open_id": open_ticket.id,
+        "duplicate": duplicate.ticket_number,
+        "deletable": deletable.ticket_number,
+        "deletable_user": spare.id,
+        "bulk_ids": ids[:5],
+    }
+
+
+def measure(size: str) -> dict:
+    """Seed one dataset and count statements per route (runs in a child process)"""
+    db_path = os.path.join(tempfile.gettempdir(), f"helpdesk_query_counts_{size}.db")
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+    os.environ.pop("DATABASE_READ_URL", None)
+    os.environ["WARMUP_ENABLED"] = "False"  # Its background requests would be counted against the cases
+
+    import logging
+    from fastapi.routing import APIRoute
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+    from app.database import SessionLocal, init_db, engine, read_engine, async_engine
+    from app.main import app
+    from app.models.user import User
+    from app.services.email_service import EmailService
+    from app.services.whatsapp_service import whatsapp_service
+    from app.utils.auth import create_access_token, get_password_hash
+    from app.utils.profiling import RequestProfile
+    from generate_synthetic_data import generate
+
+    logging.disable(logging.WARNING)
+
+    # No SMTP/Twilio traffic from notification background tasks
+    async def no_email(*args, **kwargs):
+        return None
+
+    for name in dir(EmailService):
+        if name.startswith("send_"):
+            setattr(EmailService, name, staticmethod(no_email))
+    for name in dir(whatsapp_service):
+        if name.startswith("send_"):
+            setattr(whatsapp_service, name, lambda *args, **kwargs: True)
+
+    init_db()
+    db = SessionLocal()
+    data = generate(db, seed=42, password_hash=get_password_hash("synthetic"), **SIZES[size])
+    fixture = pin_fixture(db, data)
+    emails = {user.role: user.email for user in db.query(User).order_by(User.id.desc()).all()}
+    db.close()
+
+    # Requests run one at a time, so a single active profile is enough
+    active = {"profile": None}
+
+    def count_statement(conn, cursor, statement, parameters, context, executemany):
+        if active["profile"] is not None:
+            active["profile"].add_statement(statement, 0.0)
+
+    for sync_engine in {engine, read_engine, async_engine.sync_engine}:
+        event.listen(sync_engine, "before_cursor_execute", count_statement)
+
+    routes = {
+        (method, route.path)
+        for route in app.routes if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    results = {}
+    with TestClient(app, raise_server_exceptions=False) as client:
+        for method, template, role, build in CASES:
+            kwargs = build(fixture)
+            url = template.replace("{ticket_number}", str(kwargs.pop("number", ""))) \
+                .replace("{ticket_id}", str(kwargs.pop("id", ""))) \
+                .replace("{user_id}", str(kwargs.pop("user_id", "")))
+            if role:
+                kwargs["headers"] = {"Authorization": f"Bearer {create_access_token({'sub': emails[role]})}"}
+
+            profile = RequestProfile(url)
+            active["profile"] = profile
+            response = client.request(method, url, **kwargs)
+            active["profile"] = None
+
+            results[f"{method} {template}"] = {
+                "status": response.status_code,
+                "queries": profile.query_count,
+                "repeated": profile.repeated_statements(3)[:3],
+            }
+
+    covered = {(method, template) for method, template, _, _ in CASES}
+    return {
+        "dataset": {k: data[k] for k in ("users", "tickets", "ticket_updates", "escalations", "audit_logs")},
+        "routes": results,
+        "uncovered": sorted(f"{m} {p}" for m, p in routes - covered - set(SKIPPED)),
+    }
+
+
+def run_size(size: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--measure", size,
+         "--small", str(SIZES["small"]["tickets"]), "--large", str(SIZES["large"]["tickets"])],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    for line in output.stdout.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER):])
+    print(output.stdout[-2000:], output.stderr[-4000:])
+    raise SystemExit(f"❌ Measuring the {size} dataset failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail when a route's SQL statement count grows with data size")
+    parser.add_argument("--small", type=int, default=SIZES["small"]["tickets"], help="Tickets in the small dataset")
+    parser.add_argument("--large", type=int, default=SIZES["large"]["tickets"], help="Tickets in the large dataset")
+    parser.add_argument("--output", default=None, help="Also write the per-route report as JSON")
+    parser.add_argument("--measure", choices=list(SIZES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    SIZES["small"]["tickets"], SIZES["large"]["tickets"] = args.small, args.large
+
+    if args.measure:
+        print(MARKER + json.dumps(measure(args.measure)))
+        return
+
+    print(f"\n🔎 Counting SQL statements per route ({args.small} vs {args.large} tickets)...")
+    small = run_size("small")
+    large = run_size("large")
+
+    print("=" * 80)
+    print(f"   {'route':<52} {'small':>6} {'large':>6}  result")
+    report, failures = {}, []
+    for route, measured in large["routes"].items():
+        before = small["routes"][route]
+        errored = measured["status"] >= 400 or before["status"] >= 400
+        grew = measured["queries"] > before["queries"]
+        result = "ok"
+        if errored:
+            result = f"HTTP {before['status']}/{measured['status']}"
+        elif grew:
+            result = "GROWS"
+        if result != "ok":
+            failures.append(route)
+        report[route] = {"small": before["queries"], "large": measured["queries"], "result": result,
+                         "repeated": measured["repeated"]}
+        print(f"   {route:<52} {before['queries']:>6} {measured['queries']:>6}  {'✅' if result == 'ok' else '❌'} {result}")
+        if grew:
+            for statement in measured["repeated"]:
+                print(f"      {statement['count']}x {' '.join(statement['sql'].split())[:100]}")
+
+    for route in large["uncovered"]:
+        failures.append(route)
+        print(f"   {route:<52} {'-':>6} {'-':>6}  ❌ no case in CASES")
+    for (method, path), reason in SKIPPED.items():
+        print(f"   {method + ' ' + path:<52} {'-':>6} {'-':>6}  skipped: {reason}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"sizes": {"small": small["dataset"], "large": large["dataset"]}, "routes": report,
+                       "uncovered": large["uncovered"], "skipped": [f"{m} {p}" for m, p in SKIPPED]}, f, indent=2)
+
+    if failures:
+        print(f"\n❌ {len(failures)} route(s) failed the query-count check:")
+        for route in failures:
+            print(f"   - {route}")
+        sys.exit(1)
+    print("\n✅ No route's query count grows with data size")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Startup-time benchmark and import-time budget
+
+Measures, in fresh interpreters (best of --runs), how long it takes to
+import the web app, the modules an admin script needs (database + models) and
+the SLA worker, plus the web app's time to its first /health response.
+Heavy optional dependencies - pandas, Twilio, jinja2, aiosmtplib, APScheduler -
+are imported on first use; importing any of them at startup again is
+reported by name, since that regression is what makes startup slow.
+
+Usage: python check_startup_time.py [--runs 5] [--budget-ms 1500] [--slowest 15] [--output startup.json]
+
+Exits with status 1 when the web app import goes over the budget or a
+target loads one of its lazy modules at import.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+MARKER = "STARTUP "
+
+DEFAULT_BUDGET_MS = 1500
+
+# name -> (modules imported, modules that must not be loaded afterwards)
+TARGETS = {
+    "web app": (
+        ["app.main"],
+        ["pandas", "twilio", "jinja2", "aiosmtplib", "apscheduler"]
+    ),
+    "admin script": (
+        ["app.database", "app.models.user", "app.models.ticket", "app.models.audit_log"],
+        ["pandas", "twilio", "jinja2", "aiosmtplib", "apscheduler", "fastapi"]
+    ),
+    "SLA worker": (
+        ["app.workers.sla"],
+        ["pandas", "twilio", "jinja2", "aiosmtplib", "fastapi"]
+    ),
+}
+
+
+def measure(target: str) -> dict:
+    """Runs in a fresh interpreter: import the target's modules and time it"""
+    import importlib
+    import time
+
+    modules, lazy = TARGETS[target]
+    started = time.perf_counter()
+    for module in modules:
+        importlib.import_module(module)
+    result = {
+        "import_ms": (time.perf_counter() - started) * 1000,
+        "loaded_lazy_modules": [name for name in lazy if name in sys.modules]
+    }
+
+    if target == "web app":
+        import logging
+        from fastapi.testclient import TestClient
+        from app.main import app
+
+        logging.disable(logging.INFO)
+        with TestClient(app) as client:
+            client.get("/health")
+        result["first_response_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def run_target(target: str, runs: int) -> dict:
+    env = {**os.environ, "DATABASE_URL": "sqlite:///" + os.path.join(tempfile.gettempdir(), "helpdesk_startup.db")}
+    env.pop("ASYNC_DATABASE_URL", None)
+    env.pop("DATABASE_READ_URL", None)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, __file__, "--measure", target],
+            env=env, capture_output=True, text=True
+        )
+        lines = [line for line in output.stdout.splitlines() if line.startswith(MARKER)]
+        if output.returncode != 0 or not lines:
+            print(output.stdout + output.stderr)
+            raise SystemExit(f"❌ Measuring {target} failed")
+        samples.append(json.loads(lines[-1][len(MARKER):]))
+
+    result = {
+        "import_ms": min(s["import_ms"] for s in samples),
+        "loaded_lazy_modules": samples[-1]["loaded_lazy_modules"]
+    }
+    if "first_response_ms" in samples[0]:
+        result["first_response_ms"] = min(s["first_response_ms"] for s in samples)
+    return result
+
+
+def slowest_imports(limit: int) -> list:
+    """Modules with the largest cumulative import time for the web app (python -X importtime)"""
+    output = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        capture_output=True, text=True
+    )
+    rows = []
+    for line in output.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]) / 1000, parts[2].strip()))
+    rows.sort(reverse=True)
+    return rows[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Startup time per entry point, with an import-time budget")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per target (the fastest is reported)")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS, help="Budget for importing app.main")
+    parser.add_argument("--slowest", type=int, default=15, help="List the N slowest imports of the web app (0 = off)")
+    parser.add_argument("--output", default=None, help="Also write the results as JSON")
+    parser.add_argument("--measure", choices=list(TARGETS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(MARKER + json.dumps(measure(args.measure)))
+        return
+
+    # Best of N: other load on the machine only ever adds time
+    print(f"\n⏱️  Startup time, best of {args.runs} fresh interpreters")
+    print("=" * 70)
+    results, failures = {}, []
+    for target in TARGETS:
+        result = results[target] = run_target(target, args.runs)
+        line = f"   {target:<14} import {result['import_ms']:7.0f}ms"
+        if "first_response_ms" in result:
+            line += f"   first response {result['first_response_ms']:7.0f}ms"
+        print(line)
+        if result["loaded_lazy_modules"]:
+            failures.append(target)
+            print(f"      ❌ imports {', '.join(result['loaded_lazy_modules'])} at startup - import it where it is used")
+
+    web_ms = results["web app"]["import_ms"]
+    if web_ms > args.budget_ms:
+        failures.append("budget")
+        print(f"\n❌ Importing app.main took {web_ms:.0f}ms, over the {args.budget_ms:.0f}ms budget")
+    else:
+        print(f"\n✅ Importing app.main took {web_ms:.0f}ms (budget {args.budget_ms:.0f}ms)")
+
+    if args.slowest:
+        print(f"\n📊 Slowest imports of app.main (cumulative)")
+        for ms, module in slowest_imports(args.slowest):
+            print(f"   {ms:8.1f}ms  {module}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"budget_ms": args.budget_ms, "targets": results}, f, indent=2)
+
+    if failures:
+        print(f"\n❌ Startup check failed: {', '.join(failures)}")
+        sys.exit(1)
+    print("\n✅ Startup within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+Synthetic helpdesk data for benchmarks and load tests
+
+Seeds users, tickets, ticket updates, SLA escalations and audit log entries
+with realistic shapes: most tickets are Normal priority, a few technicians
+carry most of the load, a handful of staff raise many tickets, recent days
+are busier than old ones, and only breached tickets have escalations.
+The same --seed always produces the same data.
+
+Usage: python generate_synthetic_data.py --database /tmp/helpdesk_synthetic.db [--tickets 5000] [--technicians 12]
+
+Only ever point --database at a scratch file; it is deleted and recreated.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+DEFAULT_DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_synthetic.db")
+
+PRIORITY_WEIGHTS = {"NORMAL": 70, "HIGH": 22, "URGENT": 8}
+STATUS_WEIGHTS = {"OPEN": 15, "IN_PROGRESS": 20, "WAITING_ON_USER": 8, "RESOLVED": 35, "CLOSED": 22}
+STALE_STATUS_WEIGHTS = {"OPEN": 1, "IN_PROGRESS": 2, "WAITING_ON_USER": 2, "RESOLVED": 30, "CLOSED": 65}  # Older than a week
+UPDATES_PER_TICKET = {0: 10, 1: 25, 2: 25, 3: 15, 5: 12, 10: 8, 25: 4, 60: 1}
+
+PROBLEMS = [
+    ("Printer on floor {n} shows paper jam", "The printer keeps reporting a jam after the tray was cleared."),
+    ("Cannot connect to VPN", "VPN client times out during authentication from home."),
+    ("Outlook not syncing", "New mail is not arriving in Outlook since this morning."),
+    ("Laptop {n} will not boot", "The laptop powers on but stops at a black screen."),
+    ("Password reset for ERP", "Locked out of the ERP system after several attempts."),
+    ("Scanner not detected", "The scanner is not detected after the driver update."),
+    ("Wi-Fi drops in boardroom", "Wireless connection drops every few minutes in the boardroom."),
+    ("Request new monitor", "Second monitor requested for the design workstation."),
+    ("Shared drive access denied", "Access denied when opening the finance shared drive."),
+    ("Plotter colour calibration", "Large-format plotter prints with a magenta tint."),
+]
+
+UPDATE_TEXTS = [
+    "Contacted user for more details",
+    "Remote session started, investigating",
+    "Replaced toner and ran test print",
+    "Driver reinstalled, waiting for user confirmation",
+    "Escalated to network team",
+    "Parts ordered, expected tomorrow",
+    "Issue reproduced on a second machine",
+    "User confirmed the issue is resolved",
+]
+
+
+def weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def zipf_index(rng: random.Random, size: int, skew: float = 1.2) -> int:
+    """Index into a list where the first entries are picked far more often"""
+    weights = [1 / (rank ** skew) for rank in range(1, size + 1)]
+    return rng.choices(range(size), weights=weights)[0]
+
+
+def generate(db, tickets: int = 5000, technicians: int = 12, officers: int = 3, staff: int = 400,
+             days: int = 90, seed: int = 42, password_hash: str = "synthetic") -> dict:
+    """Insert a synthetic dataset through `db` (a Session on an initialised, empty database)
+
+    Returns a summary with the created ids, so callers can pick realistic targets.
+    """
+    from sqlalchemy import insert, select
+    from app.models.user import User, TechnicianType
+    from app.models.ticket import Ticket, TicketUpdate, SLAEscalation, TicketStatus, TicketPriority, SLAStatus
+    from app.models.audit_log import AuditLog, ticket_target
+
+    rng = random.Random(seed)
+    now = datetime.now()
+
+    # Users: one of each management role, then officers and technicians
+    people = [
+        {"name": "Synthetic Admin", "email": "admin@synthetic.ndabase.com", "role": "admin"},
+        {"name": "Synthetic ICT Manager", "email": "manager@synthetic.ndabase.com", "role": "ict_manager"},
+        {"name": "Synthetic ICT GM", "email": "gm@synthetic.ndabase.com", "role": "ict_gm"},
+    ]
+    people += [
+        {"name": f"Helpdesk Officer {i + 1}", "email": f"officer{i + 1}@synthetic.ndabase.com", "role": "helpdesk_officer"}
+        for i in range(officers)
+    ]
+    technician_types = [t.value for t in TechnicianType]
+    people += [
+        {"name": f"Technician {i + 1}", "email": f"tech{i + 1}@synthetic.ndabase.com", "role": "technician",
+         "technician_type": rng.choice(technician_types)}
+        for i in range(technicians)
+    ]
+    db.execute(insert(User.__table__), [
+        {"phone": f"+2782{rng.randint(1000000, 9999999)}", "hashed_password": password_hash, "is_active": 1,
+         "technician_type": None, **person}
+        for person in people
+    ])
+    db.commit()
+    users = db.execute(select(User.id, User.email, User.role)).all()
+    by_role = {}
+    for user in users:
+        by_role.setdefault(user.role, []).append(user.id)
+    technician_ids = by_role["technician"]
+    author_ids = technician_ids + by_role["helpdesk_officer"]
+
+    # Tickets: newer days are busier; a few staff and technicians dominate
+    requesters = [(f"Staff Member {i + 1}", f"staff{i + 1}@ndabase.com") for i in range(staff)]
+    ticket_rows = []
+    for i in range(tickets):
+        created_at = now - timedelta(minutes=int(rng.expovariate(1 / (days * 1440 / 4))) % (days * 1440))
+        priority = TicketPriority[weighted(rng, PRIORITY_WEIGHTS)]
+        stale = created_at < now - timedelta(days=7)
+        status = TicketStatus[weighted(rng, STALE_STATUS_WEIGHTS if stale else STATUS_WEIGHTS)]
+        sla_minutes = {TicketPriority.URGENT: 20, TicketPriority.HIGH: 480, TicketPriority.NORMAL: 1440}[priority]
+        sla_deadline = created_at + timedelta(minutes=sla_minutes)
+        closed = status in (TicketStatus.RESOLVED, TicketStatus.CLOSED)
+        breached = not closed and sla_deadline < now
+        name, email = requesters[zipf_index(rng, len(requesters), 0.8)]
+        summary, description = rng.choice(PROBLEMS)
+        ticket_rows.append({
+            "ticket_number": f"NDB-{i + 1:04d}",
+            "user_name": name,
+            "user_email": email,
+            "user_phone": f"+2711{rng.randint(1000000, 9999999)}",
+            "problem_summary": summary.format(n=rng.randint(1, 9)),
+            "problem_description": description,
+            "priority": priority,
+            "status": status,
+            "assignee_id": technician_ids[zipf_index(rng, len(technician_ids))],
+            "created_at": created_at,
+            "updated_at": created_at,
+            "resolved_at": created_at + timedelta(minutes=rng.randint(10, sla_minutes * 2)) if closed else None,
+            "sla_deadline": sla_deadline,
+            "sla_status": SLAStatus.BREACHED if breached else SLAStatus.ON_TRACK,
+            "escalated": 1 if breached else 0,
+            "requires_update": 1 if breached and rng.random() < 0.5 else 0,
+        })
+    for start in range(0, len(ticket_rows), 1000):
+        db.execute(insert(Ticket.__table__), ticket_rows[start:start + 1000])
+    db.commit()
+    ticket_ids = db.execute(select(Ticket.id).order_by(Ticket.id)).scalars().all()
+
+    # History, escalations and audit entries
+    update_rows, escalation_rows, audit_rows = [], [], []
+    for ticket_id, row in zip(ticket_ids, ticket_rows):
+        count = weighted(rng, UPDATES_PER_TICKET)
+        for n in range(count):
+            update_rows.append({
+                "ticket_id": ticket_id,
+                "update_text": rng.choice(UPDATE_TEXTS),
+                "updated_by_id": rng.choice(author_ids),
+                "created_at": row["created_at"] + timedelta(minutes=5 * (n + 1)),
+                "is_internal": 1 if rng.random() < 0.15 else 0,
+                "time_spent": rng.choice([None, 10, 15, 30, 60]),
+            })
+        if row["escalated"]:
+            acknowledged = rng.random() < 0.5
+            escalation_rows.append({
+                "ticket_id": ticket_id,
+                "escalation_reason": f"SLA deadline exceeded. Auto-escalated from {row['priority'].value} to Urgent.",
+                "escalated_at": row["sla_deadline"] + timedelta(minutes=1),
+                "previous_priority": row["priority"].value,
+                "new_priority": TicketPriority.URGENT.value,
+                "gm_acknowledged": 1 if acknowledged else 0,
+                "acknowledged_by_id": by_role["ict_gm"][0] if acknowledged else None,
+                "acknowledged_at_gm": row["sla_deadline"] + timedelta(minutes=30) if acknowledged else None,
+            })
+            audit_rows.append({
+                "entity_type": "ticket", "entity_id": ticket_id, "action": "sla_escalated",
+                "performed_by_id": None, "target": ticket_target(row["ticket_number"]),
+                "details": {"ticket_number": row["ticket_number"], "reason": "SLA deadline exceeded"},
+                "created_at": row["sla_deadline"] + timedelta(minutes=1),
+            })
+        if rng.random() < 0.1:
+            audit_rows.append({
+                "entity_type": "ticket", "entity_id": ticket_id, "action": "ticket_reassigned",
+                "performed_by_id": rng.choice(by_role["helpdesk_officer"]), "target": ticket_target(row["ticket_number"]),
+                "details": {"ticket_number": row["ticket_number"], "reassign_reason": "Rebalancing workload"},
+                "created_at": row["created_at"] + timedelta(minutes=30),
+            })
+    for table, rows in ((TicketUpdate.__table__, update_rows), (SLAEscalation.__table__, escalation_rows),
+                        (AuditLog.__table__, audit_rows)):
+        for start in range(0, len(rows), 1000):
+            db.execute(insert(table), rows[start:start + 1000])
+    db.commit()
+
+    return {
+        "users": {role: len(ids) for role, ids in by_role.items()},
+        "user_ids": by_role,
+        "tickets": len(ticket_ids),
+        "ticket_updates": len(update_rows),
+        "escalations": len(escalation_rows),
+        "audit_logs": len(audit_rows),
+        "ticket_numbers": [row["ticket_number"] for row in ticket_rows],
+        "ticket_ids": list(ticket_ids),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a scratch database with synthetic helpdesk data")
+    parser.add_argument("--database", default=DEFAULT_DB_PATH, help="SQLite file to (re)create")
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--technicians", type=int, default=12)
+    parser.add_argument("--staff", type=int, default=400)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    if os.path.exists(args.database):
+        os.remove(args.database)
+    os.environ["DATABASE_URL"] = f"sqlite:///{args.database}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from app.database import SessionLocal, init_db
+    from app.utils.auth import get_password_hash
+
+    print(f"\n📊 Generating {args.tickets} tickets into {args.database} (seed {args.seed})...")
+    init_db()
+    db = SessionLocal()
+    try:
+        summary = generate(db, tickets=args.tickets, technicians=args.technicians, staff=args.staff,
+                           days=args.days, seed=args.seed, password_hash=get_password_hash("synthetic"))
+    finally:
+        db.close()
+
+    print(f"   Users:          {summary['users']}")
+    print(f"   Tickets:        {summary['tickets']}")
+    print(f"   Ticket updates: {summary['ticket_updates']}")
+    print(f"   Escalations:    {summary['escalations']}")
+    print(f"   Audit entries:  {summary['audit_logs']}")
+    print("\n✅ Synthetic data ready (all users have the password 'synthetic')")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Bulk import tickets from a CSV, JSON or JSON Lines file
+
+Usage:
+    python import_tickets.py legacy_tickets.csv --created-by admin@ndabase.com
+    python import_tickets.py export.jsonl --batch-size 1000 --notify
+
+Each row needs the same fields as POST /api/tickets: user_name, user_email,
+user_phone, problem_summary, problem_description (optional), priority
+(Normal/High/Urgent, optional) and assignee_id.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from app.database import SessionLocal
+from app.models import user, ticket, audit_log
+from app.models.user import User
+from app.services.ticket_import import TicketImporter
+from app.services.email_service import EmailService
+from app.services.whatsapp_service import whatsapp_service
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import tickets")
+    parser.add_argument("path", help="CSV, JSON or JSONL file to import")
+    parser.add_argument("--format", choices=["csv", "json", "jsonl"], help="File format (default: from extension)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per insert batch (default: 500)")
+    parser.add_argument("--created-by", default="admin@ndabase.com", help="Email of the user recorded as creator")
+    parser.add_argument("--notify", action="store_true", help="Send one digest per assignee after import")
+    args = parser.parse_args()
+
+    fmt = args.format or os.path.splitext(args.path)[1].lstrip(".").lower()
+    if fmt not in ("csv", "json", "jsonl"):
+        print("❌ Could not determine file format - use --format csv|json|jsonl")
+        sys.exit(1)
+
+    db = SessionLocal()
+    try:
+        creator = db.query(User).filter(User.email == args.created_by).first()
+        if not creator:
+            print(f"❌ User {args.created_by} not found")
+            sys.exit(1)
+
+        print(f"\n📥 Importing {args.path} ({fmt}, batches of {args.batch_size})...")
+        importer = TicketImporter(batch_size=args.batch_size)
+        with open(args.path, encoding="utf-8-sig", newline="") as fh:
+            report, digests = importer.run(db, importer.read_rows(fh, fmt), creator, notify=args.notify)
+
+        print("\n" + "=" * 50)
+        print(f"✅ Imported: {report['imported']} of {report['total_rows']} rows")
+        if report["imported"]:
+            print(f"   Tickets: {report['first_ticket_number']} → {report['last_ticket_number']}")
+        print(f"   Time: {report['elapsed_seconds']}s ({report['rows_per_second']} rows/second)")
+
+        if report["failed"]:
+            print(f"\n⚠️ Failed rows: {report['failed']}")
+            for error in report["errors"]:
+                print(f"   Row {error['row']}: {error['error']}")
+        if report["stopped_at_row"]:
+            print(f"\n❌ Stopped reading at row {report['stopped_at_row']} - rows after it were not imported")
+
+        if digests:
+            async def send_all():
+                for digest in digests:
+                    await EmailService.send_ticket_digest(digest)
+                    whatsapp_service.send_ticket_digest(digest)
+            asyncio.run(send_all())
+            print(f"\n📧 Sent {len(digests)} assignee digests")
+
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Load test: concurrent ticket writes against a single uvicorn worker
+
+Seeds a throwaway SQLite database, starts one uvicorn worker on it and fires
+PATCH /api/tickets/{number} (priority changes) and POST /api/tickets/{id}/reassign
+at increasing concurrency. Reports throughput and latency percentiles, plus
+the latency of GET /health sampled while the writes are in flight - when
+handlers block the event loop, that probe stalls with them.
+
+To compare before/after, run the server from another checkout of the app:
+
+    git worktree add /tmp/helpdesk-before <commit>
+    python load_test_async.py --app-dir /tmp/helpdesk-before
+    python load_test_async.py
+
+Priority changes and reassignments send no email/WhatsApp notifications, so
+the numbers measure the request path only.
+
+Usage: python load_test_async.py [--tickets 500] [--requests 400] [--concurrency 1,10,50]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Never touch the real database - point the app at a scratch file before importing it
+DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_load_test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+import httpx
+
+from app.database import SessionLocal, init_db
+from app.models.user import User
+from app.models.ticket import Ticket, TicketStatus, TicketPriority
+from app.utils.auth import create_access_token, get_password_hash
+
+PORT = 8799
+BASE_URL = f"http://127.0.0.1:{PORT}"
+
+
+def seed(count: int):
+    """Create technicians and `count` open tickets; returns (officer email, technician ids, tickets)"""
+    if os.path.exists(DB_PATH):
+        os.remove(DB_PATH)
+    init_db()
+
+    db = SessionLocal()
+    password = get_password_hash("loadtest")
+    officer = User(name="Load Officer", email="load.officer@ndabase.com", hashed_password=password, role="helpdesk_officer")
+    technicians = [
+        User(name=f"Load Technician {i}", email=f"load.tech{i}@ndabase.com", hashed_password=password, role="technician")
+        for i in range(5)
+    ]
+    db.add_all([officer] + technicians)
+    db.commit()
+    technician_ids = [t.id for t in technicians]
+
+    now = datetime.now()
+    db.execute(insert(Ticket.__table__), [{
+        "ticket_number": f"NDB-{i + 1:04d}",
+        "user_name": f"Staff Member {i}",
+        "user_email": f"staff{i}@ndabase.com",
+        "user_phone": "+27110000000",
+        "problem_summary": f"Scanner on floor {i % 7} not detected",
+        "problem_description": "The scanner is not detected after the driver update.",
+        "priority": TicketPriority.NORMAL,
+        "status": TicketStatus.OPEN,
+        "assignee_id": technician_ids[i % len(technician_ids)],
+        "created_at": now,
+        "updated_at": now,
+        "sla_deadline": now + timedelta(hours=24)
+    } for i in range(count)])
+    db.commit()
+    tickets = [(t.id, t.ticket_number) for t in db.query(Ticket.id, Ticket.ticket_number).all()]
+    db.close()
+    return "load.officer@ndabase.com", technician_ids, tickets
+
+
+def start_server(app_dir: str) -> subprocess.Popen:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--workers", "1", "--log-level", "warning"],
+        cwd=app_dir,
+        env=os.environ.copy()
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{BASE_URL}/health").status_code == 200:
+                return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run_level(client, headers, technician_ids, tickets, total: int, concurrency: int):
+    """Fire `total` writes with `concurrency` in flight; returns (req/s, latencies, probe latencies, errors)"""
+    priorities = ["High", "Normal"]
+    latencies, probes = [], []
+    errors = 0
+    counter = iter(range(total))
+    done = False
+
+    async def write(i: int):
+        ticket_id, ticket_number = tickets[i % len(tickets)]
+        if i % 2:
+            return await client.patch(
+                f"/api/tickets/{ticket_number}",
+                json={"priority": priorities[(i // len(tickets)) % 2]},
+                headers=headers
+            )
+        return await client.post(
+            f"/api/tickets/{ticket_id}/reassign",
+            json={"new_assignee_id": technician_ids[i % len(technician_ids)], "reassign_reason": "Load test reassignment"},
+            headers=headers
+        )
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            response = await write(i)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if response.status_code != 200:
+                errors += 1
+
+    async def probe():
+        while not done:
+            started = time.perf_counter()
+            await client.get("/health")
+            probes.append((time.perf_counter() - started) * 1000)
+            await asyncio.sleep(0.05)
+
+    probe_task = asyncio.create_task(probe())
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    done = True
+    await probe_task
+    return total / elapsed, latencies, probes, errors
+
+
+async def run(args, email, technician_ids, tickets) -> int:
+    """Run every concurrency level; returns the total number of failed writes"""
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': email})}"}
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 5)
+    async with httpx.AsyncClient(base_url=BASE_URL, limits=limits, timeout=60) as client:
+        # Warm up connections and the server's code paths
+        await run_level(client, headers, technician_ids, tickets, 20, 5)
+
+        print(f"   {'conc':>4}  {'req/s':>7}  {'p50 ms':>7}  {'p95 ms':>7}  {'/health p95':>11}  errors")
+        failed = 0
+        for concurrency in args.concurrency:
+            rate, latencies, probes, errors = await run_level(
+                client, headers, technician_ids, tickets, args.requests, concurrency
+            )
+            print(
+                f"   {concurrency:>4}  {rate:7.1f}  {statistics.median(latencies):7.1f}  "
+                f"{percentile(latencies, 95):7.1f}  {percentile(probes, 95) if probes else 0:11.1f}  {errors}"
+            )
+            failed += errors
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent write load test against one uvicorn worker")
+    parser.add_argument("--tickets", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=400, help="Writes per concurrency level")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in v.split(",")], default=[1, 10, 50])
+    parser.add_argument("--app-dir", default=os.path.dirname(os.path.abspath(__file__)), help="Checkout to run the server from")
+    args = parser.parse_args()
+
+    print(f"\n📊 Seeding {args.tickets} tickets into {DB_PATH}...")
+    email, technician_ids, tickets = seed(args.tickets)
+
+    print(f"\n🚀 Starting one uvicorn worker from {args.app_dir}")
+    server = start_server(args.app_dir)
+    try:
+        print("\n⏱️  PATCH priority / POST reassign, single worker")
+        print("=" * 60)
+        failed = asyncio.run(run(args, email, technician_ids, tickets))
+    finally:
+        server.terminate()
+        server.wait()
+        os.remove(DB_PATH)
+
+    if failed:
+        print(f"\n❌ Load test complete with {failed} failed writes")
+        sys.exit(1)
+    print("\n✅ Load test complete")
+
+
+if __name__ == "__main__":
+    main()
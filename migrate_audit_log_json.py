@@ -0,0 +1,82 @@
+"""
+Migration: Structured JSON details on audit_logs
+- Postgres: converts details from TEXT to JSONB and adds a GIN index
+- Adds the indexed target column - what each action was done to, "ticket:NDB-0001"
+  or "user:7" (hot table and monthly partitions) - and backfills it from details
+Run this once to update your database
+"""
+from sqlalchemy import inspect, text
+from app.database import SessionLocal, engine
+from app.services.audit_archive import audit_archiver
+
+
+def migrate():
+    db = SessionLocal()
+    postgres = engine.dialect.name == "postgresql"
+
+    print("\n🔄 Starting audit log JSON migration...")
+    print("=" * 50)
+
+    try:
+        migrations_applied = []
+        native = audit_archiver.is_native(db)
+
+        # Native partitions inherit column changes from the parent
+        tables = ["audit_logs"] if native else ["audit_logs"] + audit_archiver.list_partitions(db)
+
+        for table_name in tables:
+            columns = {col["name"]: col for col in inspect(engine).get_columns(table_name)}
+
+            if postgres and str(columns["details"]["type"]).upper() == "TEXT":
+                db.execute(text(
+                    f"ALTER TABLE {table_name} ALTER COLUMN details TYPE JSONB USING details::jsonb"
+                ))
+                migrations_applied.append(f"✅ {table_name}: details converted to JSONB")
+
+            if "target" not in columns:
+                db.execute(text(f"ALTER TABLE {table_name} ADD COLUMN target VARCHAR"))
+                migrations_applied.append(f"✅ {table_name}: added target column")
+
+            # Backfill the target as AuditLog's audit_target() computes it
+            ticket = "details->>'ticket_number'" if postgres else "json_extract(details, '$.ticket_number')"
+            db.execute(text(
+                f"UPDATE {table_name} SET target = CASE "
+                f"WHEN coalesce({ticket}, '') <> '' THEN 'ticket:' || {ticket} "
+                f"ELSE entity_type || ':' || entity_id END "
+                f"WHERE target IS NULL"
+            ))
+            db.execute(text(
+                f"CREATE INDEX IF NOT EXISTS ix_{table_name}_target ON {table_name} (target)"
+            ))
+
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_performed_by_id ON audit_logs (performed_by_id)"))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_entity ON audit_logs (entity_type, entity_id)"))
+        db.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_action ON audit_logs (action, created_at)"))
+        if postgres:
+            db.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_details ON audit_logs USING gin (details)"))
+        else:
+            db.execute(text("CREATE INDEX IF NOT EXISTS ix_audit_logs_created_at ON audit_logs (created_at)"))
+
+        db.commit()
+        audit_archiver.invalidate()  # Running processes cached the partitions' old columns
+
+        if migrations_applied:
+            print("\n📝 Applied migrations:")
+            for migration in migrations_applied:
+                print(f"  {migration}")
+        else:
+            print("\n✓ Columns already exist - only backfill and indexes were checked")
+
+        print("\n" + "=" * 50)
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,89 @@
+"""
+Migration: Partition the audit_logs table by month
+- Postgres: converts audit_logs into a natively partitioned table
+  (PARTITION BY RANGE (created_at)) with one partition per month
+- SQLite: rolls completed months out of audit_logs into audit_logs_YYYY_MM tables
+Run this once; afterwards the nightly archiver job keeps partitions rolling.
+"""
+from sqlalchemy import text
+from datetime import datetime
+from app.database import SessionLocal, engine
+from app.services.audit_archive import audit_archiver, month_start, next_month, partition_name
+
+
+def migrate_postgres(db):
+    if audit_archiver.is_native(db):
+        print("✅ audit_logs is already partitioned - skipping conversion")
+        return
+
+    oldest = db.execute(text("SELECT MIN(created_at) FROM audit_logs")).scalar() or datetime.now()
+
+    print("🔄 Converting audit_logs to a partitioned table...")
+    db.execute(text("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned"))
+    db.execute(text("""
+        CREATE TABLE audit_logs (
+            LIKE audit_logs_unpartitioned INCLUDING DEFAULTS,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """))
+    db.execute(text("CREATE INDEX ix_audit_logs_created_at ON audit_logs (created_at)"))
+
+    # One partition per month from the oldest row through next month
+    start = month_start(oldest)
+    last = next_month(datetime.now())
+    while start <= last:
+        name = partition_name(start)
+        db.execute(text(
+            f"CREATE TABLE {name} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+        ))
+        print(f"   ✓ Created partition {name}")
+        start = next_month(start)
+
+    db.execute(text("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned"))
+    # The id sequence now feeds the new parent - detach it so the drop keeps it
+    db.execute(text("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE"))
+    db.execute(text("DROP TABLE audit_logs_unpartitioned"))
+    db.commit()
+    audit_archiver.invalidate()  # Running processes cached the unpartitioned layout
+
+
+def migrate():
+    db = SessionLocal()
+
+    print("\n🔄 Starting audit log partitioning migration...")
+    print("=" * 50)
+
+    try:
+        if engine.dialect.name == "postgresql":
+            migrate_postgres(db)
+        else:
+            touched = audit_archiver.rollover(db)
+            if touched:
+                print("\n📝 Rolled over months:")
+                for name in touched:
+                    print(f"  ✅ {name}")
+            else:
+                print("\n✓ Nothing to roll over - audit_logs only holds the current month")
+
+        archived = audit_archiver.archive_expired(db)
+        for name in archived:
+            print(f"  📦 Archived {name} to {audit_archiver.archive_path(name)}")
+
+        print("\n📋 Partitions:")
+        for name in audit_archiver.list_partitions(db):
+            print(f"  • {name}")
+
+        print("\n" + "=" * 50)
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,65 @@
+"""
+Migration: Duplicate ticket detection and merging
+- Adds merged_into_id column to tickets
+- Creates ticket_signatures and ticket_signature_bands tables
+- Builds MinHash signatures for existing tickets (and drops those of tickets without usable text)
+Run this once to update your database
+"""
+from sqlalchemy import inspect, text
+from app.database import Base, SessionLocal, engine
+from app.models import user, ticket, audit_log
+from app.models.ticket import Ticket, TicketSignature, TicketSignatureBand
+from app.services.duplicate_detector import duplicate_detector, EMPTY_SIGNATURE
+
+
+def migrate():
+    db = SessionLocal()
+
+    print("\n🔄 Starting duplicate detection migration...")
+    print("=" * 50)
+
+    try:
+        columns = {col["name"] for col in inspect(engine).get_columns("tickets")}
+        if "merged_into_id" in columns:
+            print("✅ Column 'merged_into_id' already exists - skipping")
+        else:
+            db.execute(text("ALTER TABLE tickets ADD COLUMN merged_into_id INTEGER REFERENCES tickets(id)"))
+            db.execute(text("CREATE INDEX ix_tickets_merged_into_id ON tickets (merged_into_id)"))
+            db.commit()
+            print("✅ Added column 'merged_into_id' to tickets table")
+
+        Base.metadata.create_all(bind=engine)
+        print("✅ Signature tables ready")
+
+        # Signatures of tickets without usable text matched each other - they are no longer indexed
+        empty_ids = [row.ticket_id for row in db.query(TicketSignature.ticket_id).filter(
+            TicketSignature.signature == EMPTY_SIGNATURE
+        )]
+        if empty_ids:
+            db.query(TicketSignatureBand).filter(TicketSignatureBand.ticket_id.in_(empty_ids)).delete(synchronize_session=False)
+            db.query(TicketSignature).filter(TicketSignature.ticket_id.in_(empty_ids)).delete(synchronize_session=False)
+            db.commit()
+            print(f"✅ Removed {len(empty_ids)} signatures of tickets without usable text")
+
+        # Index tickets that don't have a signature yet
+        indexed = db.query(TicketSignature.ticket_id)
+        rows = db.query(Ticket.id, Ticket.problem_summary, Ticket.problem_description).filter(
+            Ticket.id.notin_(indexed)
+        ).all()
+        indexed_count = duplicate_detector.index_tickets(db, rows)
+        db.commit()
+        print(f"✅ Indexed {indexed_count} of {len(rows)} existing tickets (the rest have no usable text)")
+
+        print("\n" + "=" * 50)
+        print("✅ Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    migrate()
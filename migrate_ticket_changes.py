@@ -0,0 +1,61 @@
+"""
+Migration: Delta sync change feed for tickets
+- Adds change_seq column (indexed) to tickets
+- Adds change_xid columns (writing transaction, used on Postgres) to tickets and tombstones
+- Creates ticket_tombstones table for deleted tickets
+- Creates ticket_departures table for tickets reassigned away from someone
+- Installs the triggers that maintain both, then stamps existing tickets
+Run this once to update your database
+"""
+from sqlalchemy import inspect, text
+from app.database import Base, engine
+from app.models import user, ticket, audit_log
+from app.services.change_feed import ticket_changes
+
+
+def migrate():
+    print("\n🔄 Starting ticket change feed migration...")
+    print("=" * 50)
+
+    try:
+        columns = {col["name"] for col in inspect(engine).get_columns("tickets")}
+        if "change_seq" in columns:
+            print("✅ Column 'change_seq' already exists - skipping")
+        else:
+            with engine.begin() as conn:
+                conn.execute(text("ALTER TABLE tickets ADD COLUMN change_seq INTEGER"))
+                conn.execute(text("CREATE INDEX ix_tickets_change_seq ON tickets (change_seq)"))
+            print("✅ Added column 'change_seq' to tickets table")
+
+        Base.metadata.create_all(bind=engine)
+        print("✅ Tombstone and departure tables ready")
+
+        for table in ("tickets", "ticket_tombstones"):
+            columns = {col["name"] for col in inspect(engine).get_columns(table)}
+            if "change_xid" in columns:
+                print(f"✅ Column 'change_xid' already exists on {table} - skipping")
+                continue
+            with engine.begin() as conn:
+                conn.execute(text(f"ALTER TABLE {table} ADD COLUMN change_xid BIGINT"))
+                conn.execute(text(f"CREATE INDEX ix_{table}_change_xid_seq ON {table} (change_xid, change_seq)"))
+            print(f"✅ Added column 'change_xid' to {table} table")
+
+        ticket_changes.install(engine)
+        print("✅ Change sequence triggers installed")
+
+        stamped = ticket_changes.backfill(engine)
+        print(f"✅ Stamped {stamped} existing tickets")
+
+        print("\n" + "=" * 50)
+        print("✅ Migration completed successfully!")
+        print("\n📋 What this does:")
+        print("   - GET /api/tickets/changes?since=<token> returns only what changed")
+        print("   - Every ticket write (including deletes) advances the change sequence")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        raise
+
+
+if __name__ == "__main__":
+    migrate()
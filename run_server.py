@@ -1,6 +1,19 @@
 """
 Production server runner for Windows
+
+    python run_server.py                 # one process: web + SLA monitor (as before)
+    python run_server.py --workers 4     # 4 web workers + the SLA worker
+    python run_server.py --workers 4 --no-sla-worker   # SLA worker runs elsewhere
+
+With more than one worker the SLA monitor and audit archiving move to the SLA
+worker (python -m app.workers.sla, so they run once, not once per worker),
+and all processes share live events and cache invalidations through the
+cluster channel (app.services.cluster_channel).
 """
+import argparse
+import os
+import subprocess
+import sys
 import uvicorn
 import logging
 
@@ -13,12 +26,40 @@ logging.basicConfig(
     ]
 )
 
+
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=False,
-        workers=1,
-        log_level="info"
-    )
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description="Run the helpdesk server")
+    parser.add_argument("--workers", type=int, default=settings.WEB_WORKERS)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--no-sla-worker", action="store_true", help="Don't start the SLA worker (it runs elsewhere)")
+    args = parser.parse_args()
+
+    sla_worker = None
+    if args.workers > 1 or args.no_sla_worker:
+        # Inherited by the SLA worker and every web worker. Both are fresh interpreters (as on Windows),
+        # so they read these instead of the settings already loaded here.
+        os.environ["RUN_SCHEDULER"] = "False"
+        os.environ["CLUSTER_CHANNEL_ENABLED"] = "True"
+        if not args.no_sla_worker:
+            sla_worker = subprocess.Popen([sys.executable, "-m", "app.workers.sla"])
+            logging.info(f"SLA worker started (pid {sla_worker.pid})")
+
+    try:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=False,
+            workers=args.workers,
+            log_level="info"
+        )
+    finally:
+        if sla_worker is not None:
+            sla_worker.terminate()  # Graceful: finishes the running scan and sends queued notifications
+            try:
+                sla_worker.wait(timeout=settings.SLA_SHUTDOWN_TIMEOUT_SECONDS + 5)
+            except subprocess.TimeoutExpired:
+                sla_worker.kill()
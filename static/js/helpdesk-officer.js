@@ -5,6 +5,13 @@ let allTickets = [];
 let allTechnicians = [];
 let currentFilter = 'all';
 
+// Applies /api/tickets/changes to allTickets between full loads
+const ticketChanges = LiveUpdates.ticketChanges((changes) => {
+    allTickets = LiveUpdates.mergeTickets(allTickets, changes);
+    applyFilter(currentFilter);
+    showLastUpdate();
+});
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', function() {
     const token = localStorage.getItem('token');
@@ -18,11 +25,14 @@ document.addEventListener('DOMContentLoaded', function() {
     loadTechnicians();
     loadTickets();
     
-    // Refresh data every 30 seconds
-    setInterval(() => {
-        loadTickets();
-        loadTechnicians();
-    }, 30000);
+    // Apply ticket changes as they happen (polls only if the stream is down)
+    const refresh = async (events = []) => {
+        if (!(await ticketChanges.pull(events))) {
+            loadTickets();
+            loadTechnicians();
+        }
+    };
+    LiveUpdates.connect({ onChange: refresh, fallback: refresh });
 });
 
 // API Helper Function
@@ -190,14 +200,9 @@ async function loadTickets() {
         const response = await apiRequest('/tickets');
         if (response && response.ok) {
             allTickets = await response.json();
+            ticketChanges.start(response.headers.get('X-Change-Token'));
             applyFilter(currentFilter);
-            
-            // Update last refresh time
-            const now = new Date();
-            const timeElement = document.getElementById('lastUpdate');
-            if (timeElement) {
-                timeElement.textContent = `Last updated: ${now.toLocaleTimeString()}`;
-            }
+            showLastUpdate();
         }
     } catch (error) {
         console.error('Error loading tickets:', error);
@@ -205,6 +210,15 @@ async function loadTickets() {
     }
 }
 
+// Update last refresh time
+function showLastUpdate() {
+    const now = new Date();
+    const timeElement = document.getElementById('lastUpdate');
+    if (timeElement) {
+        timeElement.textContent = `Last updated: ${now.toLocaleTimeString()}`;
+    }
+}
+
 // Apply Filter
 function applyFilter(filter) {
     currentFilter = filter;
@@ -615,6 +629,7 @@ async function createTicket(event) {
 
 // Logout
 function logout() {
+    LiveUpdates.disconnect();
     localStorage.clear();
     window.location.href = '/static/index.html';
 }
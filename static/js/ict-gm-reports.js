@@ -3,16 +3,13 @@ const API_BASE = 'http://localhost:8000/api';
 let currentFilters = { date_from: null, date_to: null, status: '', priority: '' };
 let allTickets = [];
 let charts = {};
-let refreshInterval;
 
 document.addEventListener('DOMContentLoaded', () => {
     checkAuth();
     initializeDateFilters();
     loadData();
-    // Auto-refresh every 30 seconds
-    refreshInterval = setInterval(() => {
-        loadData();
-    }, 30000);
+    // Refresh when tickets change (polls only if the stream is down)
+    LiveUpdates.connect({ onChange: () => loadData(), fallback: () => loadData() });
 });
 
 function checkAuth() {
@@ -31,10 +28,8 @@ function checkAuth() {
 }
 
 function logout() {
-    // Clear refresh interval before logout
-    if (refreshInterval) {
-        clearInterval(refreshInterval);
-    }
+    // Close the live update stream before logout
+    LiveUpdates.disconnect();
     localStorage.clear();
     window.location.href = '/static/index.html';
 }
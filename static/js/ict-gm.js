@@ -9,10 +9,13 @@ document.addEventListener('DOMContentLoaded', () => {
     checkAuth();
     loadDashboardData();
     
-    // Auto-refresh every 60 seconds
-    setInterval(() => {
-        loadDashboardData();
-    }, 60000);
+    // Refresh on escalation activity (polls only if the stream is down)
+    LiveUpdates.connect({
+        types: ['ticket.escalated', 'escalation.acknowledged', 'ticket.updated', 'ticket.deleted'],
+        onChange: () => loadDashboardData(),
+        fallback: () => loadDashboardData(),
+        fallbackInterval: 60000
+    });
 });
 
 // Authentication
@@ -35,6 +38,7 @@ function checkAuth() {
 }
 
 function logout() {
+    LiveUpdates.disconnect();
     localStorage.clear();
     window.location.href = '/static/index.html';
 }
@@ -0,0 +1,164 @@
+// Live Updates - Server-Sent Events client shared by the dashboards
+// Replaces fixed setInterval polling: dashboards refresh only when the server
+// reports a relevant change, and fall back to polling if the stream is unavailable.
+// Ticket lists apply just the changes (/api/tickets/changes) instead of reloading.
+const LiveUpdates = (() => {
+    const STREAM_URL = 'http://localhost:8000/api/events/stream';
+    const CHANGES_URL = 'http://localhost:8000/api/tickets/changes';
+    const EVENT_TYPES = [
+        'ticket.created',
+        'ticket.updated',
+        'ticket.deleted',
+        'ticket.escalated',
+        'escalation.acknowledged',
+        'resync'
+    ];
+
+    let source = null;
+    let fallbackTimer = null;
+    let failures = 0;
+
+    // Coalesce bursts of events (bulk updates, imports) into one refresh, but refresh
+    // at least every maxWait ms while a steady stream of events keeps arriving
+    function debounce(fn, wait, maxWait) {
+        let timer = null;
+        let firstAt = null;
+        let pending = [];
+        const flush = () => {
+            clearTimeout(timer);
+            timer = null;
+            firstAt = null;
+            const events = pending;
+            pending = [];
+            fn(events);
+        };
+        return (event) => {
+            pending.push(event);
+            if (firstAt === null) firstAt = Date.now();
+            clearTimeout(timer);
+            timer = setTimeout(flush, Math.max(0, Math.min(wait, firstAt + maxWait - Date.now())));
+        };
+    }
+
+    /**
+     * Connect to the event stream.
+     * options.onChange(events)  - called (debounced) with the received events
+     * options.types             - event types to react to (default: all)
+     * options.debounce          - quiet period in ms before onChange (default 1000)
+     * options.maxWait           - longest onChange is held back by a busy stream (default 5000)
+     * options.fallback          - function to poll with if the stream fails
+     * options.fallbackInterval  - polling interval in ms (default 30000)
+     */
+    function connect(options) {
+        const token = localStorage.getItem('token');
+        const types = options.types || EVENT_TYPES;
+        const notify = debounce(options.onChange, options.debounce || 1000, options.maxWait || 5000);
+
+        if (!token || typeof EventSource === 'undefined') {
+            startFallback(options);
+            return;
+        }
+
+        source = new EventSource(`${STREAM_URL}?token=${encodeURIComponent(token)}`);
+
+        source.onopen = () => {
+            failures = 0;
+            stopFallback();
+        };
+
+        source.onerror = () => {
+            // EventSource reconnects on its own; poll meanwhile if it keeps failing
+            failures += 1;
+            if (failures >= 3) {
+                startFallback(options);
+            }
+        };
+
+        types.concat(types.includes('resync') ? [] : ['resync']).forEach(type => {
+            source.addEventListener(type, (e) => {
+                const event = JSON.parse(e.data);
+                console.log('[LiveUpdates]', event.type, event.data ? event.data.ticket_number : '');
+                notify(event);
+            });
+        });
+    }
+
+    function startFallback(options) {
+        if (fallbackTimer || !options.fallback) return;
+        console.warn('[LiveUpdates] Event stream unavailable - falling back to polling');
+        fallbackTimer = setInterval(options.fallback, options.fallbackInterval || 30000);
+    }
+
+    function stopFallback() {
+        if (fallbackTimer) {
+            clearInterval(fallbackTimer);
+            fallbackTimer = null;
+        }
+    }
+
+    /**
+     * Keep a ticket list current from /api/tickets/changes.
+     * apply(changes, events) merges {tickets, deleted} into the page's list.
+     * Call start() with the list response's X-Change-Token after each full load,
+     * then pull(events) on every change; it resolves to false when the caller
+     * should reload the whole list instead (no token yet, a resync, or an error).
+     */
+    function ticketChanges(apply) {
+        let since = null;
+
+        async function pull(events = []) {
+            if (since === null || events.some(e => e.type === 'resync')) return false;
+            const token = localStorage.getItem('token');
+            const tickets = [];
+            const deleted = [];
+            let next = since;
+            try {
+                let hasMore = true;
+                while (hasMore) {
+                    const response = await fetch(`${CHANGES_URL}?since=${encodeURIComponent(next)}`, {
+                        headers: { 'Authorization': `Bearer ${token}` }
+                    });
+                    if (!response.ok) return false;
+                    const page = await response.json();
+                    tickets.push(...page.tickets);
+                    deleted.push(...page.deleted);
+                    next = page.next_token;
+                    hasMore = page.has_more;
+                }
+            } catch (error) {
+                console.error('[LiveUpdates] Failed to fetch ticket changes:', error);
+                return false;
+            }
+            since = next;
+            if (tickets.length || deleted.length || events.length) {
+                apply({ tickets, deleted }, events);
+            }
+            return true;
+        }
+
+        return {
+            start(token) { since = token; },
+            pull
+        };
+    }
+
+    // Replace or add changed tickets and drop deleted ones, newest first like GET /api/tickets
+    function mergeTickets(list, changes) {
+        const byId = new Map(list.map(t => [t.id, t]));
+        changes.deleted.forEach(t => byId.delete(t.id));
+        changes.tickets.forEach(t => byId.set(t.id, t));
+        return [...byId.values()].sort((a, b) =>
+            (new Date(b.created_at) - new Date(a.created_at)) || (b.id - a.id)
+        );
+    }
+
+    function disconnect() {
+        stopFallback();
+        if (source) {
+            source.close();
+            source = null;
+        }
+    }
+
+    return { connect, disconnect, ticketChanges, mergeTickets };
+})();
@@ -6,14 +6,26 @@ let allTickets = [];
 let technicians = [];
 let draggedCard = null;
 
+// Applies /api/tickets/changes to allTickets between full loads
+// (tickets reassigned to someone else arrive as deleted)
+const ticketChanges = LiveUpdates.ticketChanges((changes) => {
+    allTickets = LiveUpdates.mergeTickets(allTickets, changes);
+    renderKanbanBoard(allTickets);
+    updateStats();
+    showLastUpdate();
+});
+
 // Initialize on page load
 document.addEventListener('DOMContentLoaded', () => {
     checkAuth();
     loadTechnicians();
     loadTickets();
     
-    // Auto-refresh every 30 seconds
-    setInterval(loadTickets, 30000);
+    // Apply changes to this technician's tickets as they happen (polls only if the stream is down)
+    const refresh = async (events = []) => {
+        if (!(await ticketChanges.pull(events))) loadTickets();
+    };
+    LiveUpdates.connect({ onChange: refresh, fallback: refresh });
     
     // Setup drag and drop
     setupDragAndDrop();
@@ -48,36 +60,33 @@ function checkAuth() {
 }
 
 function logout() {
+    LiveUpdates.disconnect();
     localStorage.clear();
     window.location.href = '/static/index.html';
 }
 
-// Load ALL tickets from ALL users (real-time sync)
+// Load the tickets assigned to this technician (the server scopes the list)
 async function loadTickets() {
     try {
         const token = localStorage.getItem('token');
         
-        // Fetch ALL tickets (not filtered by assignee)
-        const response = await fetch(`${API_BASE}/tickets`, {
-            headers: {
-                'Authorization': `Bearer ${token}`
-            }
-        });
+        const [response] = await Promise.all([
+            fetch(`${API_BASE}/tickets?scope=mine`, {
+                headers: {
+                    'Authorization': `Bearer ${token}`
+                }
+            }),
+            updateStats()
+        ]);
         
         if (!response.ok) throw new Error('Failed to load tickets');
         
         // API returns array directly, not wrapped in object
         allTickets = await response.json();
+        ticketChanges.start(response.headers.get('X-Change-Token'));
         
         renderKanbanBoard(allTickets);
-        updateStats(allTickets);
-        
-        // Update last refresh time
-        const now = new Date();
-        const timeElement = document.getElementById('lastUpdate');
-        if (timeElement) {
-            timeElement.textContent = `Last updated: ${now.toLocaleTimeString()}`;
-        }
+        showLastUpdate();
         
     } catch (error) {
         console.error('Error loading tickets:', error);
@@ -85,6 +94,15 @@ async function loadTickets() {
     }
 }
 
+// Update last refresh time
+function showLastUpdate() {
+    const now = new Date();
+    const timeElement = document.getElementById('lastUpdate');
+    if (timeElement) {
+        timeElement.textContent = `Last updated: ${now.toLocaleTimeString()}`;
+    }
+}
+
 // Render Kanban board
 function renderKanbanBoard(tickets) {
     const columns = {
@@ -200,24 +218,25 @@ function getSLAInfo(ticket) {
 }
 
 // Update statistics
-function updateStats(tickets) {
-    const myActive = tickets.filter(t => t.status !== 'Resolved' && t.status !== 'Closed').length;
-    const escalated = tickets.filter(t => t.escalated).length;
-    
-    // Count resolved today
-    const today = new Date();
-    today.setHours(0, 0, 0, 0);
-    const resolvedToday = tickets.filter(t => {
-        if (t.status !== 'Resolved') return false;
-        // Use resolved_at if available, otherwise fall back to updated_at
-        const resolvedDate = new Date(t.resolved_at || t.updated_at);
-        resolvedDate.setHours(0, 0, 0, 0);
-        return resolvedDate.getTime() === today.getTime();
-    }).length;
-    
-    document.getElementById('myTicketsCount').textContent = myActive;
-    document.getElementById('escalatedCount').textContent = escalated;
-    document.getElementById('resolvedTodayCount').textContent = resolvedToday;
+async function updateStats() {
+    // Counts come from the summary endpoint - no ticket rows needed for the badges
+    try {
+        const token = localStorage.getItem('token');
+        const response = await fetch(`${API_BASE}/tickets/summary?scope=mine`, {
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+        
+        if (!response.ok) throw new Error('Failed to load ticket summary');
+        
+        const summary = await response.json();
+        document.getElementById('myTicketsCount').textContent = summary.active;
+        document.getElementById('escalatedCount').textContent = summary.escalated;
+        document.getElementById('resolvedTodayCount').textContent = summary.resolved_today;
+    } catch (error) {
+        console.error('Error loading ticket summary:', error);
+    }
 }
 
 // Open ticket detail panel
@@ -387,6 +406,7 @@ function renderTicketDetail(ticket) {
         
         <div class="detail-section">
             <h3>Timeline & Updates</h3>
+            ${ticket.more_updates ? '<button class="btn-cancel" id="loadEarlierUpdates" onclick="loadEarlierUpdates()">Load earlier updates</button>' : ''}
             <div class="timeline" id="ticketTimeline">
                 ${renderTimeline(ticket.updates || [])}
             </div>
@@ -467,6 +487,35 @@ function renderTimeline(updates) {
     }).join('');
 }
 
+// Prepend an older page of history to the open ticket's timeline
+async function loadEarlierUpdates() {
+    if (!currentTicket || !currentTicket.updates || currentTicket.updates.length === 0) return;
+    
+    const pageSize = 50;
+    try {
+        const token = localStorage.getItem('token');
+        const before = currentTicket.updates[0].id;
+        const response = await fetch(`${API_BASE}/tickets/${currentTicket.ticket_number}/updates?before=${before}&limit=${pageSize}`, {
+            headers: {
+                'Authorization': `Bearer ${token}`
+            }
+        });
+        
+        if (!response.ok) throw new Error('Failed to load earlier updates');
+        
+        const older = await response.json();
+        currentTicket.updates = older.concat(currentTicket.updates);
+        document.getElementById('ticketTimeline').innerHTML = renderTimeline(currentTicket.updates);
+        
+        if (older.length < pageSize) {
+            document.getElementById('loadEarlierUpdates').remove();
+        }
+    } catch (error) {
+        console.error('Error loading earlier updates:', error);
+        showError('Failed to load earlier updates');
+    }
+}
+
 // Close detail panel
 function closeDetailPanel() {
     document.getElementById('detailPanel').classList.remove('active');
@@ -0,0 +1,178 @@
+"""
+Stress test: concurrent SQLite writers, readers and an SLA-monitor-style sweep
+
+Runs against a throwaway SQLite database using the app's own engine (and so
+its pragmas). Writer threads update tickets and add history rows, reader
+threads run the dashboard list query, and a sweeper thread re-evaluates
+sla_status for every active ticket in one transaction, the way the SLA
+monitor does. Reports commits, reads and "database is locked" failures.
+
+Compare journal modes by overriding the settings for one run:
+
+    SQLITE_JOURNAL_MODE=DELETE SQLITE_BUSY_TIMEOUT_MS=0 python stress_sqlite_concurrency.py
+    python stress_sqlite_concurrency.py
+
+Usage: python stress_sqlite_concurrency.py [--tickets 2000] [--writers 8] [--readers 4] [--seconds 10]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+# Never touch the real database - point the app at a scratch file before importing it
+DB_PATH = os.path.join(tempfile.gettempdir(), "helpdesk_stress.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+
+from datetime import datetime, timedelta
+from sqlalchemy import insert, text
+from sqlalchemy.exc import OperationalError
+
+from app.database import SessionLocal, engine, init_db
+from app.models.user import User
+from app.models.ticket import Ticket, TicketUpdate, TicketStatus, TicketPriority, SLAStatus
+
+
+class Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.values = {"writes": 0, "reads": 0, "sweeps": 0, "locked": 0, "other_errors": 0}
+
+    def add(self, key: str):
+        with self.lock:
+            self.values[key] += 1
+
+
+def seed(count: int) -> list:
+    """Create technicians and `count` active tickets; returns technician ids"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    init_db()
+
+    db = SessionLocal()
+    technicians = [
+        User(name=f"Stress Technician {i}", email=f"stress.tech{i}@ndabase.com", hashed_password="x", role="technician")
+        for i in range(5)
+    ]
+    db.add_all(technicians)
+    db.commit()
+    technician_ids = [t.id for t in technicians]
+
+    now = datetime.now()
+    db.execute(insert(Ticket.__table__), [{
+        "ticket_number": f"NDB-{i + 1:04d}",
+        "user_name": f"Staff Member {i}",
+        "user_email": f"staff{i}@ndabase.com",
+        "user_phone": "+27110000000",
+        "problem_summary": f"Laptop {i} will not boot",
+        "priority": TicketPriority.NORMAL,
+        "status": TicketStatus.OPEN,
+        "assignee_id": technician_ids[i % len(technician_ids)],
+        "created_at": now,
+        "updated_at": now,
+        "sla_deadline": now + timedelta(minutes=random.randint(-60, 600))
+    } for i in range(count)])
+    db.commit()
+    db.close()
+    return technician_ids
+
+
+def guarded(counters: Counters, key: str, fn):
+    db = SessionLocal()
+    try:
+        fn(db)
+        counters.add(key)
+    except OperationalError as exc:
+        db.rollback()
+        counters.add("locked" if "locked" in str(exc) else "other_errors")
+    finally:
+        db.close()
+
+
+def writer(counters: Counters, stop: threading.Event, ticket_count: int, technician_ids: list):
+    def work(db):
+        ticket = db.get(Ticket, random.randint(1, ticket_count))
+        ticket.priority = random.choice([TicketPriority.NORMAL, TicketPriority.HIGH])
+        db.add(TicketUpdate(ticket_id=ticket.id, update_text="Stress update", updated_by_id=random.choice(technician_ids)))
+        db.commit()
+    while not stop.is_set():
+        guarded(counters, "writes", work)
+
+
+def reader(counters: Counters, stop: threading.Event):
+    def work(db):
+        db.query(Ticket.id, Ticket.ticket_number, Ticket.status).order_by(Ticket.created_at.desc()).all()
+    while not stop.is_set():
+        guarded(counters, "reads", work)
+
+
+def sweeper(counters: Counters, stop: threading.Event):
+    """Same shape as the SLA monitor: read every active ticket, update statuses, commit once"""
+    def work(db):
+        now = datetime.now()
+        for ticket in db.query(Ticket).filter(Ticket.status.notin_([TicketStatus.RESOLVED, TicketStatus.CLOSED])).all():
+            new_status = SLAStatus.BREACHED if ticket.sla_deadline < now else SLAStatus.ON_TRACK
+            if ticket.sla_status != new_status:
+                ticket.sla_status = new_status
+            ticket.sla_deadline = ticket.sla_deadline + timedelta(seconds=random.choice([-30, 30]))
+        db.commit()
+    while not stop.is_set():
+        guarded(counters, "sweeps", work)
+        time.sleep(0.5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite concurrency stress test")
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"\n📊 Seeding {args.tickets} tickets into {DB_PATH}...")
+    technician_ids = seed(args.tickets)
+    with engine.connect() as conn:
+        pragmas = {name: conn.execute(text(f"PRAGMA {name}")).scalar() for name in ("journal_mode", "synchronous", "busy_timeout")}
+    print(f"   Pragmas: {pragmas}")
+
+    counters = Counters()
+    stop = threading.Event()
+    threads = (
+        [threading.Thread(target=writer, args=(counters, stop, args.tickets, technician_ids)) for _ in range(args.writers)]
+        + [threading.Thread(target=reader, args=(counters, stop)) for _ in range(args.readers)]
+        + [threading.Thread(target=sweeper, args=(counters, stop))]
+    )
+
+    print(f"\n⏱️  {args.writers} writers, {args.readers} readers, 1 SLA sweeper for {args.seconds}s")
+    print("=" * 60)
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    values = counters.values
+    print(f"   Writes committed:      {values['writes']:>8} ({values['writes'] / args.seconds:.1f}/s)")
+    print(f"   Reads completed:       {values['reads']:>8} ({values['reads'] / args.seconds:.1f}/s)")
+    print(f"   SLA sweeps committed:  {values['sweeps']:>8}")
+    print(f"   'database is locked':  {values['locked']:>8}")
+    print(f"   Other errors:          {values['other_errors']:>8}")
+
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+
+    if values["locked"] or values["other_errors"]:
+        print("\n❌ Lock errors under concurrency")
+        sys.exit(1)
+    else:
+        print("\n✅ No lock errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Shared fixtures for the API tests
+
+Every test gets an empty SQLite database (with the change-feed triggers and
+search index installed), one user per role plus a second technician, and
+email/WhatsApp sends replaced with no-ops.
+"""
+import asyncio
+import os
+import tempfile
+
+import pytest
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="helpdesk_tests_"), "helpdesk.db")
+
+# Settings are read at import time - point them at the scratch database first
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ["WARMUP_ENABLED"] = "False"
+for name, value in {
+    "SECRET_KEY": "test-secret-key",
+    "SMTP_HOST": "localhost",
+    "SMTP_USER": "helpdesk",
+    "SMTP_PASSWORD": "password",
+    "SMTP_FROM_EMAIL": "helpdesk@ndabase.com",
+    "ICT_GM_EMAIL": "gm@ndabase.com",
+    "ICT_MANAGER_EMAIL": "manager@ndabase.com",
+    "TWILIO_ACCOUNT_SID": "ACtest",
+    "TWILIO_AUTH_TOKEN": "token",
+    "TWILIO_WHATSAPP_FROM": "whatsapp:+10000000000",
+    "ICT_GM_WHATSAPP": "whatsapp:+10000000001",
+    "ICT_MANAGER_WHATSAPP": "whatsapp:+10000000002",
+}.items():
+    os.environ.setdefault(name, value)
+
+from fastapi.testclient import TestClient
+
+from app.database import SessionLocal, async_engine, engine, init_db
+from app.main import app
+from app.models.user import User
+from app.services.email_service import EmailService
+from app.services.whatsapp_service import whatsapp_service
+from app.utils.auth import create_access_token
+
+ROLES = ["admin", "technician", "helpdesk_officer", "ict_manager", "ict_gm"]
+
+
+def reset_database():
+    engine.dispose()
+    asyncio.run(async_engine.dispose())
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(DB_PATH + suffix):
+            os.remove(DB_PATH + suffix)
+    init_db()
+
+
+@pytest.fixture(autouse=True)
+def no_notifications(monkeypatch):
+    async def sent(*args, **kwargs):
+        return True
+
+    for name in dir(EmailService):
+        if name.startswith("send"):
+            monkeypatch.setattr(EmailService, name, staticmethod(sent))
+    monkeypatch.setattr(whatsapp_service, "send_message", lambda *args, **kwargs: True)
+
+
+@pytest.fixture
+def users():
+    """User ids by role, plus "technician2" - a second technician"""
+    reset_database()
+    db = SessionLocal()
+    try:
+        ids = {}
+        for role in ROLES + ["technician2"]:
+            user = User(
+                name=role.replace("_", " ").title(), email=f"{role}@ndabase.com", phone="+27110000000",
+                hashed_password="not-used", role=role.rstrip("2"), is_active=1
+            )
+            db.add(user)
+            db.commit()
+            ids[role] = user.id
+        return ids
+    finally:
+        db.close()
+
+
+@pytest.fixture
+def client(users):
+    return TestClient(app)
+
+
+@pytest.fixture
+def auth():
+    """Authorization header for the seeded user with a role"""
+    def header(role: str) -> dict:
+        return {"Authorization": f"Bearer {create_access_token({'sub': f'{role}@ndabase.com'})}"}
+    return header
+
+
+@pytest.fixture
+def create_ticket(client, users, auth):
+    """Log a ticket through the API; returns its JSON"""
+    def create(assignee: str = "technician", summary: str = "Printer not working") -> dict:
+        response = client.post("/api/tickets", headers=auth("helpdesk_officer"), json={
+            "user_name": "Bob Smith",
+            "user_email": "bob@ndabase.com",
+            "user_phone": "+27110000000",
+            "problem_summary": summary,
+            "problem_description": "The printer on floor 2 shows offline.",
+            "priority": "Normal",
+            "assignee_id": users[assignee],
+        })
+        assert response.status_code == 201, response.text
+        return response.json()
+    return create
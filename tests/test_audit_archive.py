@@ -0,0 +1,139 @@
+"""Audit partitions: rollover, archiving and the cached partition layout behind query()"""
+from datetime import datetime, timedelta
+
+import pytest
+
+import app.services.audit_archive as audit_archive
+from app.database import SessionLocal
+from app.models.audit_log import AuditLog
+from app.services.audit_archive import AuditLogArchiver
+
+NOW = datetime(2026, 10, 19)
+
+
+@pytest.fixture
+def db(users):
+    session = SessionLocal()
+    # One row a month for two years, plus one in the current month
+    for months in range(25):
+        session.add(AuditLog(
+            entity_type="ticket", entity_id=months, action="ticket_updated", details={},
+            created_at=NOW - timedelta(days=30 * months), performed_by_id=users["admin"]
+        ))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def archiver(tmp_path):
+    return AuditLogArchiver(str(tmp_path), retention_days=365)
+
+
+@pytest.fixture
+def reflections(monkeypatch):
+    """Counts schema reflections done by the archiver"""
+    calls = []
+    real = audit_archive.inspect
+
+    def counting(bind):
+        calls.append(bind)
+        return real(bind)
+
+    monkeypatch.setattr(audit_archive, "inspect", counting)
+    return calls
+
+
+def entity_ids(rows):
+    return [row["entity_id"] for row in rows]
+
+
+def test_query_reflects_partitions_once(db, archiver, reflections):
+    archiver.rollover(db, NOW)
+    reflections.clear()
+    first = archiver.query(db, limit=100)
+    assert entity_ids(first) == list(range(25))
+    assert len(reflections) == 1
+    assert archiver.query(db, limit=100) == first
+    assert len(reflections) == 1
+
+
+def test_rollover_and_archiving_refresh_the_layout(db, archiver):
+    # Cached before any partition exists
+    assert len(archiver.query(db, limit=100)) == 25
+    assert archiver.layout(db)["partitions"] == {}
+
+    archiver.rollover(db, NOW)
+    assert len(archiver.layout(db)["partitions"]) == 24
+    assert len(archiver.query(db, limit=100)) == 25
+
+    # Dropped partitions must not be queried again
+    archived = archiver.archive_expired(db, NOW)
+    assert archived and not set(archived) & set(archiver.layout(db)["partitions"])
+    kept = entity_ids(archiver.query(db, limit=100))
+    assert 12 <= len(kept) < 25 and kept == list(range(len(kept)))
+    assert entity_ids(archiver.query(db, limit=100, include_archived=True)) == list(range(25))
+
+
+def test_other_processes_are_told_to_refresh(db, archiver, monkeypatch):
+    published = []
+    monkeypatch.setattr(audit_archive.cluster_channel, "invalidate", published.append)
+    archiver.rollover(db, NOW)
+    assert published == [audit_archive.LAYOUT_CACHE_NAME]
+    # Nothing left to roll over - no partition created, nothing to announce
+    archiver.rollover(db, NOW)
+    assert published == [audit_archive.LAYOUT_CACHE_NAME]
+
+
+def test_partition_missing_a_column_selects_null(db, archiver):
+    archiver.rollover(db, NOW)
+    name = next(iter(archiver.layout(db)["partitions"]))
+    db.execute(audit_archive.text(f"ALTER TABLE {name} DROP COLUMN target"))
+    db.commit()
+    archiver.invalidate()
+    rows = archiver.query(db, limit=100)
+    assert len(rows) == 25
+    assert sum(row["target"] is None for row in rows) == 1  # The one row in that partition
+
+
+@pytest.mark.parametrize("tier", ["hot", "partition", "partition without target", "archive"])
+def test_target_filter_in_every_tier(users, archiver, tier):
+    created_at = NOW - timedelta(days=400) if tier == "archive" else NOW - timedelta(days=40)
+    session = SessionLocal()
+    try:
+        for entity_type, entity_id, action, details in [
+            ("ticket", 1, "ticket_reassigned", {"ticket_number": "NDB-0001"}),
+            ("escalation", 4, "escalation_acknowledged", {"ticket_number": "NDB-0001"}),
+            ("ticket", 2, "sla_escalated", {"ticket_number": "NDB-0002"}),
+            ("user", 7, "role_changed", {"old_role": "technician", "new_role": "ict_manager"}),
+            ("escalation", 7, "escalation_acknowledged", {"ticket_number": "NDB-0003"}),
+        ]:
+            session.add(AuditLog(
+                entity_type=entity_type, entity_id=entity_id, action=action, details=details,
+                created_at=NOW if tier == "hot" else created_at, performed_by_id=users["admin"]
+            ))
+        session.commit()
+        if tier != "hot":
+            archiver.rollover(session, NOW)
+        if tier == "partition without target":
+            for name in archiver.layout(session)["partitions"]:
+                session.execute(audit_archive.text(f"ALTER TABLE {name} DROP COLUMN target"))
+            session.commit()
+            archiver.invalidate()
+        if tier == "archive":
+            assert archiver.archive_expired(session, NOW)
+
+        def actions(**filters):
+            rows = archiver.query(session, include_archived=True, **filters)
+            assert all(row["archived"] == (tier == "archive") for row in rows)
+            return sorted((row["entity_type"], row["action"]) for row in rows)
+
+        ticket_history = [("escalation", "escalation_acknowledged"), ("ticket", "ticket_reassigned")]
+        assert actions(ticket_number="NDB-0001") == ticket_history
+        assert actions(target="ticket:NDB-0001") == ticket_history
+        assert actions(target="user:7") == [("user", "role_changed")]
+        # The acknowledgement targets its ticket, not escalation 7
+        assert actions(target="escalation:7") == []
+        assert actions(target="ticket:NDB-0001", ticket_number="NDB-0002") == []
+    finally:
+        session.close()
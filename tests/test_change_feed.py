@@ -0,0 +1,137 @@
+"""GET /api/tickets/changes - tokens, paging, tombstones and technician scope"""
+from sqlalchemy import text
+
+from app.database import SessionLocal, engine
+from app.services.change_feed import format_token, parse_token, ticket_changes
+
+
+def changes(client, auth, role="helpdesk_officer", **params):
+    response = client.get("/api/tickets/changes", headers=auth(role), params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+def test_tokens_round_trip():
+    assert parse_token(None) == (0, 0)
+    assert parse_token("") == (0, 0)
+    assert parse_token("42") == (0, 42)
+    assert parse_token("1234.7") == (1234, 7)
+    assert parse_token(format_token(1234, 7)) == (1234, 7)
+
+
+def test_bad_token_is_rejected(client, auth):
+    for token in ("abc", "1.2.3", "-1"):
+        response = client.get("/api/tickets/changes", headers=auth("helpdesk_officer"), params={"since": token})
+        assert response.status_code == 400, token
+
+
+def test_created_updated_and_deleted_since_token(client, auth, create_ticket):
+    first, second, third = (create_ticket() for _ in range(3))
+    feed = changes(client, auth)
+    assert ids(feed["tickets"]) == [first["id"], second["id"], third["id"]]
+    token = feed["next_token"]
+    assert changes(client, auth, since=token) == {
+        "since": token, "next_token": token, "has_more": False, "tickets": [], "deleted": []
+    }
+
+    response = client.patch(
+        f"/api/tickets/{second['ticket_number']}", headers=auth("technician"),
+        json={"status": "In Progress", "update_text": "On site now"}
+    )
+    assert response.status_code == 200, response.text
+    response = client.delete(f"/api/tickets/{third['ticket_number']}", headers=auth("admin"))
+    assert response.status_code == 200, response.text
+
+    feed = changes(client, auth, since=token)
+    assert ids(feed["tickets"]) == [second["id"]]
+    assert feed["tickets"][0]["status"] == "In Progress"
+    assert feed["deleted"] == [
+        {"id": third["id"], "ticket_number": third["ticket_number"], "deleted_at": feed["deleted"][0]["deleted_at"]}
+    ]
+    assert changes(client, auth, since=feed["next_token"])["tickets"] == []
+
+
+def test_pages_with_has_more(client, auth, create_ticket):
+    created = [create_ticket()["id"] for _ in range(5)]
+    seen, token = [], None
+    while True:
+        feed = changes(client, auth, limit=2, **({"since": token} if token else {}))
+        seen += ids(feed["tickets"])
+        token = feed["next_token"]
+        if not feed["has_more"]:
+            break
+    assert seen == created
+
+
+def test_tombstone_survives_id_reuse(client, auth, create_ticket):
+    create_ticket()
+    last = create_ticket()
+    token = changes(client, auth)["next_token"]
+    assert client.delete(f"/api/tickets/{last['ticket_number']}", headers=auth("admin")).status_code == 200
+
+    # SQLite hands the highest rowid out again once it is freed
+    replacement = create_ticket(summary="Monitor flickering")
+    assert replacement["id"] == last["id"]
+
+    feed = changes(client, auth, since=token)
+    assert ids(feed["deleted"]) == [last["id"]]
+    assert ids(feed["tickets"]) == [replacement["id"]]
+    assert feed["deleted"][0]["ticket_number"] == last["ticket_number"]
+
+
+def test_list_token_resumes_the_feed(client, auth, create_ticket):
+    create_ticket()
+    response = client.get("/api/tickets", headers=auth("helpdesk_officer"))
+    token = response.headers["X-Change-Token"]
+    later = create_ticket()
+    assert ids(changes(client, auth, since=token)["tickets"]) == [later["id"]]
+
+
+def test_technicians_only_see_their_own_tickets(client, auth, create_ticket):
+    mine = create_ticket("technician")
+    create_ticket("technician2")
+    assert ids(changes(client, auth, "technician")["tickets"]) == [mine["id"]]
+    assert len(changes(client, auth, "helpdesk_officer")["tickets"]) == 2
+
+
+def test_reassigned_ticket_leaves_the_old_technicians_feed(client, auth, users, create_ticket):
+    moved = create_ticket("technician")
+    token = changes(client, auth, "technician")["next_token"]
+    response = client.patch(
+        f"/api/tickets/{moved['ticket_number']}", headers=auth("helpdesk_officer"),
+        json={"assignee_id": users["technician2"]}
+    )
+    assert response.status_code == 200, response.text
+
+    feed = changes(client, auth, "technician", since=token)
+    assert feed["tickets"] == [] and ids(feed["deleted"]) == [moved["id"]]
+    assert ids(changes(client, auth, "technician2", since=token)["tickets"]) == [moved["id"]]
+    # Unscoped feeds see an update, not a removal
+    officer = changes(client, auth, "helpdesk_officer", since=token)
+    assert officer["deleted"] == [] and ids(officer["tickets"]) == [moved["id"]]
+
+    # Moving it back is an upsert newer than the departure
+    response = client.patch(
+        f"/api/tickets/{moved['ticket_number']}", headers=auth("helpdesk_officer"),
+        json={"assignee_id": users["technician"]}
+    )
+    assert response.status_code == 200, response.text
+    feed = changes(client, auth, "technician", since=token)
+    assert ids(feed["tickets"]) == [moved["id"]]
+
+
+def test_backfill_stamps_rows_without_a_change_seq(client, auth, create_ticket):
+    ticket = create_ticket()
+    db = SessionLocal()
+    try:
+        db.execute(text("UPDATE tickets SET change_seq = NULL WHERE id = :id"), {"id": ticket["id"]})
+        db.commit()
+    finally:
+        db.close()
+    assert changes(client, auth)["tickets"] == []
+    assert ticket_changes.backfill(engine) == 1
+    assert ids(changes(client, auth)["tickets"]) == [ticket["id"]]
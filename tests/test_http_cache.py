@@ -0,0 +1,89 @@
+"""ETag / If-None-Match on the ticket read endpoints"""
+import pytest
+from sqlalchemy import text
+
+from app.database import SessionLocal
+
+
+def revalidate(client, auth, url, role="technician"):
+    """Fetch url, then repeat with its ETag; returns (first response, conditional response)"""
+    first = client.get(url, headers=auth(role))
+    assert first.status_code == 200, first.text
+    assert first.headers["Cache-Control"] == "private, no-cache"
+    again = client.get(url, headers={**auth(role), "If-None-Match": first.headers["ETag"]})
+    return first, again
+
+
+@pytest.mark.parametrize("url", ["/api/tickets", "/api/tickets/summary", "/api/tickets?status=Open", "{detail}"])
+def test_unchanged_data_answers_304(client, auth, create_ticket, url):
+    ticket = create_ticket()
+    first, again = revalidate(client, auth, url.format(detail=f"/api/tickets/{ticket['ticket_number']}"))
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+
+
+def test_weak_and_listed_etags_match(client, auth, create_ticket):
+    create_ticket()
+    etag = client.get("/api/tickets", headers=auth("technician")).headers["ETag"]
+    for header in (f"W/{etag}", f'"stale", {etag}', "*"):
+        response = client.get("/api/tickets", headers={**auth("technician"), "If-None-Match": header})
+        assert response.status_code == 304, header
+    response = client.get("/api/tickets", headers={**auth("technician"), "If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+def test_etag_differs_per_caller_and_filter(client, auth, create_ticket):
+    create_ticket()
+    etags = {
+        client.get(url, headers=auth(role)).headers["ETag"]
+        for url, role in [
+            ("/api/tickets", "technician"), ("/api/tickets", "technician2"),
+            ("/api/tickets", "helpdesk_officer"), ("/api/tickets?priority=High", "technician"),
+        ]
+    }
+    assert len(etags) == 4
+
+
+def test_ticket_write_changes_the_list_and_detail_etags(client, auth, create_ticket):
+    ticket = create_ticket()
+    detail = f"/api/tickets/{ticket['ticket_number']}"
+    list_etag = client.get("/api/tickets", headers=auth("technician")).headers["ETag"]
+    detail_etag = client.get(detail, headers=auth("technician")).headers["ETag"]
+
+    response = client.post(
+        f"/api/tickets/{ticket['id']}/internal-note", headers=auth("helpdesk_officer"),
+        params={"note_text": "Called the user back"}
+    )
+    assert response.status_code == 201, response.text
+
+    for url, etag in [("/api/tickets", list_etag), (detail, detail_etag)]:
+        response = client.get(url, headers={**auth("technician"), "If-None-Match": etag})
+        assert response.status_code == 200, url
+        assert response.headers["ETag"] != etag
+
+
+def test_delete_and_assignee_rename_change_the_list_etag(client, auth, create_ticket):
+    create_ticket()
+    doomed = create_ticket()
+    etag = client.get("/api/tickets", headers=auth("technician")).headers["ETag"]
+    assert client.delete(f"/api/tickets/{doomed['ticket_number']}", headers=auth("admin")).status_code == 200
+    response = client.get("/api/tickets", headers={**auth("technician"), "If-None-Match": etag})
+    assert response.status_code == 200 and len(response.json()) == 1
+
+    # The list shows assignee names, so renaming a user has to invalidate it too
+    etag = response.headers["ETag"]
+    db = SessionLocal()
+    try:
+        db.execute(text("UPDATE users SET name = 'Renamed Technician' WHERE email = 'technician@ndabase.com'"))
+        db.commit()
+    finally:
+        db.close()
+    response = client.get("/api/tickets", headers={**auth("technician"), "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()[0]["assignee_name"] == "Renamed Technician"
+
+
+def test_missing_ticket_is_still_404(client, auth):
+    response = client.get("/api/tickets/NDB-9999", headers={**auth("technician"), "If-None-Match": "*"})
+    assert response.status_code == 404
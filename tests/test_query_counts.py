@@ -0,0 +1,30 @@
+"""No route's SQL statement count may grow with the data (see check_query_counts.py)"""
+import pytest
+
+import check_query_counts
+
+ROUTES = [f"{method} {template}" for method, template, _, _ in check_query_counts.CASES]
+
+
+@pytest.fixture(scope="module")
+def measured():
+    """Per-route counts on a small and a large dataset, each seeded and measured in its own process"""
+    sizes = {size: dict(values) for size, values in check_query_counts.SIZES.items()}
+    check_query_counts.SIZES["small"]["tickets"], check_query_counts.SIZES["large"]["tickets"] = 10, 100
+    try:
+        yield {size: check_query_counts.run_size(size) for size in ("small", "large")}
+    finally:
+        check_query_counts.SIZES.update(sizes)
+
+
+@pytest.mark.parametrize("route", ROUTES)
+def test_query_count_does_not_grow(measured, route):
+    small, large = measured["small"]["routes"][route], measured["large"]["routes"][route]
+    assert small["status"] < 400 and large["status"] < 400, f"HTTP {small['status']}/{large['status']}"
+    assert large["queries"] <= small["queries"], (
+        f"{small['queries']} -> {large['queries']} statements; most repeated: {large['repeated']}"
+    )
+
+
+def test_every_route_has_a_case(measured):
+    assert measured["large"]["uncovered"] == []
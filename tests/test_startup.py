@@ -0,0 +1,10 @@
+"""Heavy optional dependencies stay out of every entry point's imports (see check_startup_time.py)"""
+import pytest
+
+import check_startup_time
+
+
+@pytest.mark.parametrize("target", list(check_startup_time.TARGETS))
+def test_lazy_modules_are_not_imported_at_startup(target):
+    result = check_startup_time.run_target(target, runs=1)
+    assert result["loaded_lazy_modules"] == [], "import them where they are used"
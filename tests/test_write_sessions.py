@@ -0,0 +1,39 @@
+"""The write routes run on the sync Session (SQLite) and through AsyncSession.run_sync (asyncpg)"""
+import pytest
+
+import app.database
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def write_sessions(request, monkeypatch):
+    # asyncpg is not available here; aiosqlite exercises the same run_sync path
+    monkeypatch.setattr(app.database, "ASYNC_WRITE_SESSIONS", request.param)
+
+
+def test_create_update_and_reassign(write_sessions, client, auth, users, create_ticket):
+    ticket = create_ticket(summary="Laptop will not boot")
+    assert ticket["ticket_number"] and ticket["assignee_name"] == "Technician"
+
+    response = client.patch(
+        f"/api/tickets/{ticket['ticket_number']}", headers=auth("technician"),
+        json={"status": "Resolved", "update_text": "Replaced the charger"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["status"] == "Resolved"
+    assert response.json()["updates"][-1]["update_text"] == "Replaced the charger"
+
+    response = client.post(
+        f"/api/tickets/{ticket['id']}/reassign", headers=auth("helpdesk_officer"),
+        json={"new_assignee_id": users["technician2"], "reassign_reason": "Technician is on leave"}
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["old_assignee"] == "Technician"
+    assert response.json()["new_assignee"] == "Technician2"
+
+    detail = client.get(f"/api/tickets/{ticket['ticket_number']}", headers=auth("technician2")).json()
+    assert detail["assignee_id"] == users["technician2"]
+
+
+def test_errors_raised_in_the_session_reach_the_client(write_sessions, client, auth):
+    response = client.patch("/api/tickets/NDB-9999", headers=auth("technician"), json={"update_text": "Anyone?"})
+    assert response.status_code == 404